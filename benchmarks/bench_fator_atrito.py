@@ -0,0 +1,70 @@
+# benchmarks/bench_fator_atrito.py
+"""
+Benchmark do fator de atrito: Newton-Raphson escalar x vetorizado x tabela
+(o padrão dentro do domínio dela).
+
+Verifica também o limite de erro da tabela pré-calculada contra o
+Newton-Raphson em uma amostra aleatória densa do domínio (Re × diâmetros PVC).
+
+Uso (a partir da raiz do repositório):
+    python -m benchmarks.bench_fator_atrito
+"""
+
+import time
+
+import numpy as np
+
+from modules.calc_utils import (
+    calcular_fator_atrito,
+    calcular_fator_atrito_vetorizado,
+    obter_tabela_fator_atrito,
+)
+from modules.data import DIAMETROS_TUBULACAO
+
+
+def _cronometrar(func, repeticoes=5):
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        func()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+def main(n_amostras=200_000, semente=0):
+    inicio = time.perf_counter()
+    tabela = obter_tabela_fator_atrito()
+    t_construcao = time.perf_counter() - inicio
+
+    rng = np.random.default_rng(semente)
+    D_int = rng.choice(np.array(list(DIAMETROS_TUBULACAO.values())) / 1000.0, n_amostras)
+    Re = np.exp(rng.uniform(np.log(tabela.re_min), np.log(tabela.re_max), n_amostras))
+
+    f_newton = calcular_fator_atrito_vetorizado(Re, D_int, usar_tabela=False)
+    f_tabela = tabela.consultar_vetorizado(Re, D_int)
+    erro = np.max(np.abs(f_tabela / f_newton - 1.0))
+
+    n_escalar = 5_000
+    pares = list(zip(Re[:n_escalar].tolist(), D_int[:n_escalar].tolist()))
+    t_escalar = _cronometrar(lambda: [calcular_fator_atrito(r, d, usar_tabela=False)
+                                      for r, d in pares], 1)
+    t_escalar_tab = _cronometrar(lambda: [calcular_fator_atrito(r, d) for r, d in pares], 1)
+    t_vetor = _cronometrar(lambda: calcular_fator_atrito_vetorizado(Re, D_int, usar_tabela=False))
+    t_vetor_tab = _cronometrar(lambda: calcular_fator_atrito_vetorizado(Re, D_int))
+
+    print(f"Tabela: {tabela.diametros_mm.size} diâmetros × {tabela.n_nos} nós, "
+          f"construída em {t_construcao * 1e3:.1f} ms")
+    print(f"Erro relativo máximo: verificado na construção {tabela.erro_verificado:.2e} | "
+          f"amostra de {n_amostras} pontos {erro:.2e} | limite {tabela.erro_max:.0e}")
+    print(f"{'Método':<32}{'µs/ponto':>10}")
+    print(f"{'Newton escalar':<32}{t_escalar / n_escalar * 1e6:>10.3f}")
+    print(f"{'Tabela escalar':<32}{t_escalar_tab / n_escalar * 1e6:>10.3f}")
+    print(f"{'Newton vetorizado':<32}{t_vetor / n_amostras * 1e6:>10.3f}")
+    print(f"{'Tabela vetorizada':<32}{t_vetor_tab / n_amostras * 1e6:>10.3f}")
+
+    if erro > tabela.erro_max:
+        raise SystemExit(f"Erro da tabela ({erro:.2e}) acima do limite ({tabela.erro_max:.0e})")
+
+
+if __name__ == "__main__":
+    main()
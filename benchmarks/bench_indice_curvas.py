@@ -0,0 +1,59 @@
+# benchmarks/bench_indice_curvas.py
+"""
+Benchmark da busca por ponto de trabalho (catalogo_bombas.IndiceCurvasBombas).
+
+Compara o índice (decisão pela faixa [q_inf, q_sup] de cada intervalo, cúbico
+só nos pares ambíguos) com a avaliação de todas as curvas em todos os pontos
+(`CatalogoBombas.selecionar_por_curva`), e confere que os resultados são iguais.
+
+Uso (a partir da raiz do repositório):
+    python -m benchmarks.bench_indice_curvas
+"""
+
+import time
+
+import numpy as np
+
+from modules.catalogo_bombas import CATALOGO_BOMBAS, obter_indice_curvas
+
+
+def _cronometrar(func, repeticoes=50):
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        func()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+def main(semente=0):
+    inicio = time.perf_counter()
+    indice = obter_indice_curvas()
+    t_construcao = time.perf_counter() - inicio
+
+    rng = np.random.default_rng(semente)
+    print(f"Índice: {indice.ordem.size} bombas × {indice.q_inf.shape[1]} intervalos, "
+          f"construído em {t_construcao * 1e3:.1f} ms")
+    print(f"{'Pontos':>7}{'índice (ms)':>13}{'varredura (ms)':>16}{'ambíguos':>10}{'confere':>9}")
+    for n in (1, 12, 48, 500):
+        Q = rng.uniform(0.5, 40.0, n)
+        H = rng.uniform(2.0, 24.0, n)
+
+        t_indice = _cronometrar(lambda: indice.consultar(Q, H))
+        t_varredura = _cronometrar(lambda: CATALOGO_BOMBAS.selecionar_por_curva(Q, H))
+
+        obtido = indice.consultar(Q, H)
+        referencia = CATALOGO_BOMBAS.selecionar_por_curva(Q, H)
+        confere = all(np.array_equal(a, b) for a, b in zip(obtido, referencia))
+
+        # Fração dos pares (bomba, ponto) que exigiram avaliar o cúbico
+        j = np.clip(np.searchsorted(CATALOGO_BOMBAS.pressoes, H, side="right") - 1,
+                    0, indice.q_inf.shape[1] - 1)
+        ambiguos = np.mean((indice.q_sup[:, j] >= Q) & (indice.q_inf[:, j] < Q))
+
+        print(f"{n:>7}{t_indice * 1e3:>13.3f}{t_varredura * 1e3:>16.3f}"
+              f"{ambiguos:>10.1%}{'sim' if confere else 'NÃO':>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# benchmarks/bench_otimizador_diametros.py
+"""
+Benchmark do otimizador de diâmetros (perda_carga.otimizar_diametros).
+
+Mede o tempo da busca completa (8³ combinações de sucção/primário/secundário)
+para diferentes quantidades de retornos e confere o resultado contra a
+busca exaustiva com as funções escalares.
+
+Uso (a partir da raiz do repositório):
+    python -m benchmarks.bench_otimizador_diametros
+"""
+
+import itertools
+import time
+
+from modules.perda_carga import (
+    DIAMETROS,
+    LIMITE_VEL_RECALQUE,
+    LIMITE_VEL_SUCCAO,
+    calcular_linha,
+    calcular_recalque_multiplos,
+    otimizar_diametros,
+)
+
+CONEX_SUC = {"joelho 90º": 4, "registro esfera aberto": 2, "união": 2}
+CONEX_PRIM = {"joelho 90º": 3, "Tê de passagem direta": 1}
+CONEX_SEC = {"joelho 90º": 6, "curva 90º": 4}
+
+
+def _exaustiva(Q, num_retornos):
+    pontos = []
+    for ds, dp, dr in itertools.product(DIAMETROS, repeat=3):
+        suc = calcular_linha(Q, ds, 6.0, CONEX_SUC)
+        rec = calcular_recalque_multiplos(Q, dp, dr, 6.0, 30.0, num_retornos, CONEX_PRIM, CONEX_SEC)
+        if suc['V'] <= LIMITE_VEL_SUCCAO and rec['V_max'] <= LIMITE_VEL_RECALQUE:
+            custo = ds * 6.0 + dp * 6.0 + dr * 30.0
+            pontos.append((custo, suc['hf_total'] + rec['hf_total']))
+    return sorted(p for p in pontos
+                  if not any(o[0] <= p[0] and o[1] <= p[1] and o != p for o in pontos))
+
+
+def main(Q=12.0):
+    print(f"{'Retornos':>9}{'ms/busca':>10}{'Pareto':>8}{'confere':>9}")
+    for num_retornos in (1, 4, 20, 100, 300):
+        inicio = time.perf_counter()
+        n = 20
+        for _ in range(n):
+            frente = otimizar_diametros(Q, 6.0, CONEX_SUC, 6.0, CONEX_PRIM,
+                                        30.0, CONEX_SEC, num_retornos)
+        ms = (time.perf_counter() - inicio) / n * 1e3
+
+        referencia = _exaustiva(Q, num_retornos)
+        obtido = [(p['custo'], p['hf_total']) for p in frente]
+        confere = (len(obtido) == len(referencia)
+                   and all(abs(a[0] - b[0]) < 1e-9 and abs(a[1] - b[1]) < 1e-9
+                           for a, b in zip(obtido, referencia)))
+        print(f"{num_retornos:>9}{ms:>10.2f}{len(frente):>8}{'sim' if confere else 'NÃO':>9}")
+
+
+if __name__ == "__main__":
+    main()
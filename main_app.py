@@ -13,6 +13,7 @@ from modules import (
     aquecimento,
     dimensionamento_completo
 )
+from modules.curvas_bombas import aquecer_registro
 
 def main():
     # 1️⃣ Primeiro comando Streamlit: configuração da página
@@ -22,6 +23,9 @@ def main():
         initial_sidebar_state="expanded"
     )
 
+    # Curvas PCHIP das bombas compiladas uma vez por processo
+    aquecer_registro()
+
     # 2️⃣ Verificação de autenticação (agora após a configuração)
     if "authenticated" not in st.session_state or not st.session_state["authenticated"]:
         st.warning("🔒 Você precisa fazer login para acessar o aplicativo.")
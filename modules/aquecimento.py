@@ -3,22 +3,14 @@ Módulo de Dimensionamento de Aquecimento Sodramar
 Replica a lógica da Planilha de Dimensionamento Sodramar 2022 (Rev. Nov/2023)
 """
 
-import io
+from bisect import bisect_left, bisect_right
 from datetime import datetime
 
+import numpy as np
+import pandas as pd
 import streamlit as st
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
-from reportlab.lib.units import cm
-from reportlab.platypus import (
-    HRFlowable,
-    Paragraph,
-    SimpleDocTemplate,
-    Spacer,
-    Table,
-    TableStyle,
-)
+
+from modules.relatorio_pdf import botao_download_pdf, montar_relatorio
 
 # ─────────────────────────────────────────────────────────────────────────────
 # 1. TABELAS DE DADOS  (hardcoded conforme a planilha)
@@ -185,21 +177,67 @@ NOMINAL_CATALOGO = {
 # 2. FUNCOES AUXILIARES
 # ─────────────────────────────────────────────────────────────────────────────
 
-def _interpolar(tabela: dict, chave: float):
-    keys = sorted(tabela.keys())
-    if chave <= keys[0]:
-        return tabela[keys[0]]
-    if chave >= keys[-1]:
-        return tabela[keys[-1]]
-    for i in range(len(keys) - 1):
-        k0, k1 = keys[i], keys[i + 1]
-        if k0 <= chave <= k1:
-            t = (chave - k0) / (k1 - k0)
-            v0, v1 = tabela[k0], tabela[k1]
-            if isinstance(v0, tuple):
-                return tuple(v0[j] + t * (v1[j] - v0[j]) for j in range(len(v0)))
-            return v0 + t * (v1 - v0)
-    return tabela[keys[-1]]
+class _TabelaCompilada:
+    """
+    Tabela {chave: valor | tupla} compilada em arrays ordenados na importação.
+
+    `chaves` (n,) e `valores` (n, m) atendem consultas vetorizadas via
+    np.searchsorted; as mesmas linhas em tuplas Python atendem consultas
+    escalares via bisect (mesma busca, sem o custo fixo de uma chamada NumPy).
+    """
+
+    def __init__(self, tabela: dict):
+        chaves = sorted(tabela)
+        linhas = [tuple(map(float, tabela[k])) if isinstance(tabela[k], tuple)
+                  else (float(tabela[k]),) for k in chaves]
+        self.chaves = np.array(chaves, dtype=np.float64)
+        self.valores = np.array(linhas, dtype=np.float64)
+        self.chaves.setflags(write=False)
+        self.valores.setflags(write=False)
+        self._chaves = tuple(self.chaves.tolist())
+        self._linhas = tuple(linhas)
+
+    def interpolar(self, chave, col: int = 0):
+        """
+        Interpolação linear na coluna `col`, saturada nos extremos da tabela.
+        No caminho vetorizado `col` pode ser um array (uma coluna por elemento).
+        """
+        if not np.isscalar(chave):
+            x = np.asarray(chave, dtype=np.float64)
+            c, v = self.chaves, self.valores
+            i = np.clip(np.searchsorted(c, x, side="left"), 1, c.size - 1)
+            t = (x - c[i - 1]) / (c[i] - c[i - 1])
+            r = v[i - 1, col] + t * (v[i, col] - v[i - 1, col])
+            return np.where(x <= c[0], v[0, col], np.where(x >= c[-1], v[-1, col], r))
+
+        c = self._chaves
+        if chave <= c[0]:
+            return self._linhas[0][col]
+        if chave >= c[-1]:
+            return self._linhas[-1][col]
+        # Intervalo (c[i-1], c[i]]: numa chave exata vale t = 1, como no laço original
+        i = bisect_left(c, chave)
+        k0, k1 = c[i - 1], c[i]
+        t = (chave - k0) / (k1 - k0)
+        v0, v1 = self._linhas[i - 1][col], self._linhas[i][col]
+        return v0 + t * (v1 - v0)
+
+    def piso(self, chave, col: int = 0):
+        """Maior chave <= `chave` (HLOOKUP aproximado); abaixo da tabela, a primeira."""
+        if not np.isscalar(chave):
+            i = np.searchsorted(self.chaves, np.asarray(chave, dtype=np.float64), side="right") - 1
+            return self.valores[np.maximum(i, 0), col]
+        return self._linhas[max(bisect_right(self._chaves, chave) - 1, 0)][col]
+
+
+_TAB_PERDA_BASE = _TabelaCompilada(FATOR_PERDA_BASE)
+_TAB_VENTO = _TabelaCompilada(FATOR_VENTO)
+_TAB_COP = _TabelaCompilada(COP_TABLE)
+
+# FATOR_CAPA indexado diretamente pelas horas inteiras 0..16
+_FATOR_CAPA_HORAS = tuple(float(FATOR_CAPA.get(h, 1.002)) for h in range(17))
+_FATOR_CAPA_ARRAY = np.array(_FATOR_CAPA_HORAS)
+_FATOR_CAPA_ARRAY.setflags(write=False)
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -208,13 +246,19 @@ def _interpolar(tabela: dict, chave: float):
 
 def _fator_vento(velocidade_kmh: float, ambiente: str) -> float:
     """FATOR!E45 — fator multiplicador pela velocidade do vento."""
+    if not np.isscalar(ambiente):
+        return np.where(np.asarray(ambiente) == "F", FATOR_VENTO[0.1],
+                        _TAB_VENTO.interpolar(np.asarray(velocidade_kmh, dtype=np.float64)))
     if ambiente == "F":
         return FATOR_VENTO[0.1]
-    return _interpolar(FATOR_VENTO, velocidade_kmh)
+    return _TAB_VENTO.interpolar(velocidade_kmh)
 
 
 def _fator_solar(incidencia_pct: float, ambiente: str) -> float:
     """FATOR!J62 — formula atualizada 12/09/2018: 1.234 - incidencia/100 x 0.234."""
+    if not np.isscalar(ambiente):
+        incidencia = np.clip(np.asarray(incidencia_pct, dtype=np.float64), 0.0, 100.0)
+        return np.where(np.asarray(ambiente) == "F", 1.234, 1.234 - (incidencia / 100.0) * 0.234)
     if ambiente == "F":
         return 1.234
     return 1.234 - (max(0.0, min(100.0, incidencia_pct)) / 100.0) * 0.234
@@ -222,7 +266,9 @@ def _fator_solar(incidencia_pct: float, ambiente: str) -> float:
 
 def _fator_capa(horas: int) -> float:
     """FATOR!O57 — fator de reducao de perdas com uso de capa."""
-    return FATOR_CAPA.get(max(0, min(16, int(round(horas)))), 1.002)
+    if not np.isscalar(horas):
+        return _FATOR_CAPA_ARRAY[np.clip(np.rint(horas), 0, 16).astype(np.intp)]
+    return _FATOR_CAPA_HORAS[max(0, min(16, int(round(horas))))]
 
 
 def calcular_energia_dissipada(
@@ -243,8 +289,7 @@ def calcular_energia_dissipada(
         E37 (BTU/h)  = E34 x E35
     """
     idx = {1: 2, 2: 1, 3: 0}[regiao]   # quente=2, frio=1, medio=0
-    raw = _interpolar(FATOR_PERDA_BASE, temp_agua)
-    perda_base = raw[idx] if isinstance(raw, tuple) else raw
+    perda_base = _TAB_PERDA_BASE.interpolar(temp_agua, idx)
 
     fc = _fator_capa(horas_capa)
     fv = _fator_vento(velocidade_vento, ambiente)
@@ -268,6 +313,56 @@ def calcular_energia_dissipada(
 # 4. SELECAO DO MODELO  (replica aba MAQUINAS)
 # ─────────────────────────────────────────────────────────────────────────────
 
+# Capacidade (BTU/h) de cada modelo em ORDEM_MODELOS, uma linha por regiao (1, 2, 3)
+_CAP_REGIAO = np.array([[MODELOS_CATALOGO[nome][col] for nome in ORDEM_MODELOS]
+                        for col in (2, 0, 1)])
+
+# As colunas NAO sao monotonas em ORDEM_MODELOS (ex.: 3SD105 > SD130+SD160).
+# A busca binaria usa a envoltoria (maximo acumulado): o primeiro indice em que
+# a envoltoria atende e exatamente o primeiro modelo que atende na varredura.
+_ENVOLTORIA_REGIAO = np.maximum.accumulate(_CAP_REGIAO, axis=1)
+_ENVOLTORIA_REGIAO.setflags(write=False)
+_ENVOLTORIA_LISTAS = tuple(tuple(linha) for linha in _ENVOLTORIA_REGIAO.tolist())
+_NUM_MODELOS = len(ORDEM_MODELOS)
+
+
+def _verificar_capacidades() -> dict:
+    """
+    Verificacao na carga do catalogo: capacidades positivas e finitas (a
+    condicao de horas divide pela capacidade).
+
+    Returns:
+        dict: {regiao: modelos abaixo da envoltoria}, isto e, que a selecao
+            automatica nunca escolhe porque um modelo anterior tem capacidade maior.
+    """
+    if not (np.isfinite(_CAP_REGIAO).all() and (_CAP_REGIAO > 0).all()):
+        raise ValueError("MODELOS_CATALOGO: capacidades devem ser positivas e finitas")
+    nomes = np.array(ORDEM_MODELOS, dtype=object)
+    return {r: tuple(nomes[_CAP_REGIAO[r - 1] < _ENVOLTORIA_REGIAO[r - 1]]) for r in (1, 2, 3)}
+
+
+MODELOS_DOMINADOS = _verificar_capacidades()
+
+
+def _atende(cap, energia_btu_h):
+    """Condicoes (a) e (b) de `selecionar_modelo`, vetorizadas."""
+    return (cap >= energia_btu_h) & (energia_btu_h * 24.0 / cap <= 17.0)
+
+
+def _indice_modelo(energia_btu_h: float, regiao: int) -> int:
+    """Indice em ORDEM_MODELOS do modelo escolhido, ou -1 (busca binaria na envoltoria)."""
+    env = _ENVOLTORIA_LISTAS[regiao - 1]
+    # (b) equivale a capacidade >= energia x 24/17; o ajuste a seguir corrige
+    # o arredondamento do limiar contra a condicao exata
+    e = energia_btu_h
+    i = bisect_left(env, max(e, e * 24.0 / 17.0))
+    while i > 0 and env[i - 1] >= e and e * 24.0 / env[i - 1] <= 17.0:
+        i -= 1
+    while i < _NUM_MODELOS and not (env[i] >= e and e * 24.0 / env[i] <= 17.0):
+        i += 1
+    return i if i < _NUM_MODELOS else -1
+
+
 def selecionar_modelo(energia_btu_h: float, regiao: int) -> tuple:
     """
     Menor modelo tal que:
@@ -276,11 +371,11 @@ def selecionar_modelo(energia_btu_h: float, regiao: int) -> tuple:
     Returns: (nome, capacidade_btu_h, potencia_kw_nominal)
     """
     col = {1: 2, 2: 0, 3: 1}[regiao]
-    for nome in ORDEM_MODELOS:
-        cap = MODELOS_CATALOGO[nome][col]
-        if cap >= energia_btu_h and (energia_btu_h * 24.0 / cap) <= 17.0:
-            return (nome, cap, MODELOS_CATALOGO[nome][3])
-    return (None, 0.0, 0.0)
+    i = _indice_modelo(energia_btu_h, regiao)
+    if i < 0:
+        return (None, 0.0, 0.0)
+    nome = ORDEM_MODELOS[i]
+    return (nome, MODELOS_CATALOGO[nome][col], MODELOS_CATALOGO[nome][3])
 
 
 def _cop(temp_agua: float, regiao: int) -> float:
@@ -292,10 +387,7 @@ def _cop(temp_agua: float, regiao: int) -> float:
     Para T=30 o match exato e encontrado e retorna COP=4.7 corretamente.
     """
     col = {1: 0, 2: 1, 3: 2}[regiao]
-    keys = sorted(COP_TABLE.keys())
-    cop_key = next((k for k in reversed(keys) if k <= temp_agua), keys[0])
-    r = COP_TABLE[cop_key]
-    return r[col] if isinstance(r, tuple) else r
+    return _TAB_COP.piso(temp_agua, col)
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -467,57 +559,258 @@ def calcular_dimensionamento(inputs: dict) -> dict:
 
 
 # ─────────────────────────────────────────────────────────────────────────────
-# 6. GERACAO DE PDF
+# 6. DIMENSIONAMENTO EM LOTE  (vetorizado)
 # ─────────────────────────────────────────────────────────────────────────────
 
-def _gerar_pdf(res: dict, inputs: dict) -> bytes:
-    buf = io.BytesIO()
-    doc = SimpleDocTemplate(
-        buf, pagesize=A4,
-        leftMargin=2 * cm, rightMargin=2 * cm,
-        topMargin=2 * cm, bottomMargin=2 * cm,
-    )
-    styles = getSampleStyleSheet()
-
-    AZUL  = colors.HexColor("#1a4e8a")
-    CINZA = colors.HexColor("#f2f4f7")
-
-    s_titulo = ParagraphStyle("titulo",  parent=styles["Title"],
-                              textColor=AZUL, fontSize=15, spaceAfter=4)
-    s_sub    = ParagraphStyle("sub",     parent=styles["Heading2"],
-                              textColor=AZUL, fontSize=10, spaceBefore=10, spaceAfter=4)
-    s_normal = ParagraphStyle("normal",  parent=styles["Normal"], fontSize=9)
-    s_small  = ParagraphStyle("small",   parent=styles["Normal"], fontSize=8,
-                              textColor=colors.grey)
-
-    def _tabela(dados, col_widths=None):
-        t = Table(dados, colWidths=col_widths, hAlign="LEFT")
-        t.setStyle(TableStyle([
-            ("BACKGROUND",    (0, 0), (-1, 0),  AZUL),
-            ("TEXTCOLOR",     (0, 0), (-1, 0),  colors.white),
-            ("FONTNAME",      (0, 0), (-1, 0),  "Helvetica-Bold"),
-            ("FONTSIZE",      (0, 0), (-1, -1), 9),
-            ("ROWBACKGROUNDS",(0, 1), (-1, -1), [colors.white, CINZA]),
-            ("GRID",          (0, 0), (-1, -1), 0.4, colors.lightgrey),
-            ("LEFTPADDING",   (0, 0), (-1, -1), 6),
-            ("RIGHTPADDING",  (0, 0), (-1, -1), 6),
-            ("TOPPADDING",    (0, 0), (-1, -1), 4),
-            ("BOTTOMPADDING", (0, 0), (-1, -1), 4),
-        ]))
-        return t
-
-    story = []
-
-    # Cabecalho
-    story.append(Paragraph("Dimensionamento de Aquecimento - Sodramar", s_titulo))
-    story.append(Paragraph(
-        f"Gerado em: {datetime.now().strftime('%d/%m/%Y %H:%M')}   |   "
-        f"Modelo: <b>{res['modelo']}</b>",
-        s_small,
+# Entradas numericas/categoricas de calcular_dimensionamento, na ordem das colunas do lote
+ENTRADAS_LOTE = (
+    "largura", "comprimento", "profundidade", "temp_agua", "regiao", "ambiente",
+    "incidencia_solar", "velocidade_vento", "horas_capa", "custo_kwh", "custo_gn_m3",
+)
+
+_POT_MODELOS = np.array([MODELOS_CATALOGO[nome][3] for nome in ORDEM_MODELOS])
+_NOMINAL_MODELOS = np.array([NOMINAL_CATALOGO.get(nome, (np.nan, np.nan)) for nome in ORDEM_MODELOS],
+                            dtype=np.float64)
+_INDICE_MODELO = {nome: i for i, nome in enumerate(ORDEM_MODELOS)}
+_T_VERAO_REGIAO = np.array([REGIOES[r][4] for r in (1, 2, 3)])
+_T_INVERNO_REGIAO = np.array([REGIOES[r][3] for r in (1, 2, 3)])
+_NOME_REGIAO = np.array([REGIOES[r][0] for r in (1, 2, 3)], dtype=object)
+
+# Colunas que dependem do modelo (NaN nas linhas sem modelo, onde o escalar retorna "erro")
+_COLUNAS_MODELO = (
+    "capacidade_btu_h", "capacidade_kcal_h", "capacidade_kw", "potencia_nominal_kw", "cop",
+    "consumo_eletrico_kw", "horas_inverno", "horas_verao", "velocidade_aq_c_h", "tempo_1grau_h",
+    "tempo_aq_inicial_h", "potencia_1aq_kw", "custo_1aq", "custo_resistencia",
+    "custo_bomba_inverno", "custo_bomba_verao", "custo_medio_mensal", "economia_mensal",
+)
+
+
+def _selecionar_modelos_lote(energia_btu_h: np.ndarray, regiao: np.ndarray) -> np.ndarray:
+    """
+    Versao vetorizada de `_indice_modelo`: indice em ORDEM_MODELOS do menor
+    modelo que atende cada linha, ou -1.
+    """
+    e = energia_btu_h
+    linha = regiao - 1
+    limiar = np.maximum(e, e * 24.0 / 17.0)
+    i = np.empty(e.shape, dtype=np.intp)
+    for r in range(_ENVOLTORIA_REGIAO.shape[0]):
+        sel = linha == r
+        i[sel] = np.searchsorted(_ENVOLTORIA_REGIAO[r], limiar[sel], side="left")
+
+    # Ajuste do arredondamento do limiar (no maximo um ou dois passos)
+    while True:
+        desce = (i > 0) & _atende(_ENVOLTORIA_REGIAO[linha, np.maximum(i - 1, 0)], e)
+        if not desce.any():
+            break
+        i -= desce
+    while True:
+        sobe = (i < _NUM_MODELOS) & ~_atende(_ENVOLTORIA_REGIAO[linha, np.minimum(i, _NUM_MODELOS - 1)], e)
+        if not sobe.any():
+            break
+        i += sobe
+    return np.where(i < _NUM_MODELOS, i, -1)
+
+
+def calcular_dimensionamento_lote(
+    largura, comprimento, profundidade, temp_agua, regiao, ambiente,
+    incidencia_solar, velocidade_vento, horas_capa, custo_kwh, custo_gn_m3,
+    modelo_manual=None,
+) -> pd.DataFrame:
+    """
+    Executa `calcular_dimensionamento` para muitas piscinas de uma vez.
+
+    Cada argumento aceita escalar ou array (com broadcasting entre eles). Os
+    valores de cada linha sao identicos aos do calculo escalar com as mesmas
+    entradas, pois as formulas sao as mesmas na mesma ordem de operacoes.
+
+    Args:
+        modelo_manual (str | array-like, optional): Modelo por linha (modo "M"),
+            tambem com broadcasting. None na linha (ou no argumento) = selecao automatica.
+
+    Returns:
+        pd.DataFrame: Uma linha por piscina, com as colunas de ENTRADAS_LOTE
+            seguidas das chaves do resultado escalar. Linhas sem modelo trazem
+            "erro" preenchido, `modelo` None e NaN nas colunas do modelo.
+    """
+    entradas = tuple(np.asarray(a) for a in (
+        largura, comprimento, profundidade, temp_agua, regiao, ambiente,
+        incidencia_solar, velocidade_vento, horas_capa, custo_kwh, custo_gn_m3,
     ))
-    story.append(HRFlowable(width="100%", thickness=1.5, color=AZUL, spaceAfter=8))
+    # modelo_manual tambem participa do broadcasting (ex.: uma piscina x todos os modelos)
+    forma = np.broadcast_shapes(*(a.shape for a in entradas), np.shape(modelo_manual))
+    (larg, comp, prof, t_agu, reg, amb, sol, vent, capa, kwh, gn) = (
+        np.broadcast_to(a, forma).ravel() for a in entradas
+    )
+    larg, comp, prof, t_agu, sol, vent, capa, kwh, gn = (
+        np.asarray(a, dtype=np.float64) for a in (larg, comp, prof, t_agu, sol, vent, capa, kwh, gn)
+    )
+    reg = np.asarray(reg, dtype=np.intp)
+    if not np.isin(reg, (1, 2, 3)).all():
+        raise ValueError(f"Regiao invalida: {sorted(set(reg.tolist()) - {1, 2, 3})}")
+    n = reg.size
+
+    # Energia dissipada  (aba FATOR)
+    perda_base = _TAB_PERDA_BASE.interpolar(t_agu, np.array([2, 1, 0])[reg - 1])
+    fc = _fator_capa(capa)
+    fv = _fator_vento(vent, amb)
+    fs = _fator_solar(sol, amb)
+    area_m2 = larg * comp
+    e_h = perda_base * fc * fv * fs * area_m2
+    e_mes = e_h * 24 * 31
+    e_mes_kcal = e_mes / 3.97
+    volume_l = larg * comp * prof * 1000
+
+    # Selecao do modelo
+    i_mod = _selecionar_modelos_lote(e_h, reg)
+    if modelo_manual is not None:
+        manual = np.broadcast_to(np.asarray(modelo_manual, dtype=object), forma).ravel()
+        linhas = np.flatnonzero(manual != None)  # noqa: E711 (comparacao elemento a elemento)
+        i_mod[linhas] = [_INDICE_MODELO.get(manual[i], -1) for i in linhas]
+    valido = i_mod >= 0
+    i_seguro = np.where(valido, i_mod, 0)
+
+    cap_h = np.where(valido, _CAP_REGIAO[reg - 1, i_seguro], np.nan)
+    pot_nom = np.where(valido, _POT_MODELOS[i_seguro], np.nan)
+    nom_btu, nom_kw_nom = np.where(valido[:, None], _NOMINAL_MODELOS[i_seguro], np.nan).T
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cap_kcal_h = cap_h / 3.97
+        cap_kw = (cap_h / 3.97) / 860
+        cop = _TAB_COP.piso(t_agu, reg - 1)
+        cons_kw = cap_kw / cop
+
+        h_inv = e_mes / cap_h / 31
+        h_ver = h_inv * 0.4375
+
+        vel_aq = np.where(volume_l > 0, 0.43 * cap_kw * 1000 / volume_l, 0.0)
+        t_1c = np.where(vel_aq > 0, 1.0 / vel_aq, 0.0)
+
+        delta = t_agu - _T_VERAO_REGIAO[reg - 1]
+        t_ini = np.where(
+            cap_kw > 0,
+            np.where(capa == 0,
+                     2.33 * (volume_l / 1000) * delta / cap_kw,
+                     2.33 * 0.75 * (volume_l / 1000) * delta / cap_kw),
+            0.0,
+        )
+        pot_1aq = t_ini * cons_kw
+
+        custo_inv = cons_kw * h_inv * kwh * 31
+        custo_ver = cons_kw * h_ver * kwh * 31
+        custo_gn_mes = (e_mes_kcal / 9400) * 1.18 * gn
+        nom_kw_calc = nom_btu / 3412.0
+
+        resultado = {
+            "nome_regiao":         _NOME_REGIAO[reg - 1],
+            "t_inverno_c":         _T_INVERNO_REGIAO[reg - 1],
+            "t_verao_c":           _T_VERAO_REGIAO[reg - 1],
+            "volume_litros":       volume_l,
+            "area_m2":             area_m2,
+            "energia_btu_h":       e_h,
+            "energia_kcal_h":      e_h / 3.97,
+            "energia_kw":          e_h / 3412.0,
+            "energia_mes_btu":     e_mes,
+            "energia_mes_kcal":    e_mes_kcal,
+            "fator_capa":          np.broadcast_to(fc, (n,)),
+            "fator_vento":         np.broadcast_to(fv, (n,)),
+            "fator_solar":         np.broadcast_to(fs, (n,)),
+            "modelo":              np.where(valido, np.array(ORDEM_MODELOS, dtype=object)[i_seguro], None),
+            "capacidade_btu_h":    cap_h,
+            "capacidade_kcal_h":   cap_kcal_h,
+            "capacidade_kw":       cap_kw,
+            "potencia_nominal_kw": pot_nom,
+            "cop":                 cop,
+            "consumo_eletrico_kw": cons_kw,
+            "horas_inverno":       h_inv,
+            "horas_verao":         h_ver,
+            "equipamento_atende":  h_inv <= 17.0,
+            "velocidade_aq_c_h":   vel_aq,
+            "tempo_1grau_h":       t_1c,
+            "tempo_aq_inicial_h":  t_ini,
+            "potencia_1aq_kw":     pot_1aq,
+            "custo_1aq":           pot_1aq * kwh,
+            "custo_resistencia":   cap_kw * h_inv * 30 * kwh / 0.8,
+            "custo_bomba_inverno": custo_inv,
+            "custo_bomba_verao":   custo_ver,
+            "custo_medio_mensal":  (custo_inv + custo_ver) / 2,
+            "custo_gn_mes":        custo_gn_mes,
+            "consumo_gn_m3":       (e_mes_kcal / 10294) * 1.18,
+            "economia_mensal":     custo_gn_mes - custo_inv,
+            "nominal_btu_h":       nom_btu,
+            "nominal_kcal_h":      nom_btu / 3.97,
+            "nominal_kw_eletrico": nom_kw_nom,
+            "nominal_cop":         nom_kw_calc / nom_kw_nom,
+            "erro":                np.where(valido, None,
+                                            "Nenhum modelo do catalogo atende a demanda calculada. "
+                                            "Verifique os parametros de entrada."),
+        }
+
+    for chave in _COLUNAS_MODELO:
+        resultado[chave] = np.where(valido, resultado[chave], np.nan)
+
+    colunas = dict(zip(ENTRADAS_LOTE, (larg, comp, prof, t_agu, reg, amb, sol, vent, capa, kwh, gn)))
+    colunas.update(resultado)
+    return pd.DataFrame(colunas)
+
+
+def tabela_sensibilidade(piscinas, **eixos) -> pd.DataFrame:
+    """
+    Grade de sensibilidade: cada piscina combinada com todos os valores dos eixos.
+
+    Args:
+        piscinas (dict | list[dict]): Entradas base no formato de
+            `calcular_dimensionamento` (inclusive "modo"/"modelo_manual").
+        **eixos: Valores a varrer por entrada de ENTRADAS_LOTE, ex.:
+            temp_agua=range(25, 42), regiao=(1, 2, 3), horas_capa=range(17).
+
+    Returns:
+        pd.DataFrame: Coluna "piscina" (indice na lista de entrada) seguida das
+            colunas de `calcular_dimensionamento_lote`, uma linha por combinacao.
+    """
+    if isinstance(piscinas, dict):
+        piscinas = [piscinas]
+    desconhecidos = set(eixos) - set(ENTRADAS_LOTE)
+    if desconhecidos:
+        raise KeyError(f"Eixos desconhecidos: {sorted(desconhecidos)}")
+
+    valores = {nome: list(v) for nome, v in eixos.items()}
+    grade = np.indices((len(piscinas), *(len(v) for v in valores.values()))).reshape(len(valores) + 1, -1)
+    i_piscina = grade[0]
+
+    colunas = {}
+    for nome in ENTRADAS_LOTE:
+        if nome in valores:
+            k = list(valores).index(nome) + 1
+            colunas[nome] = np.asarray(valores[nome])[grade[k]]
+        else:
+            colunas[nome] = np.asarray([p[nome] for p in piscinas])[i_piscina]
+
+    # Modo manual sem modelo vira nome inexistente, como no escalar (linha com "erro")
+    manuais = [(p.get("modelo_manual") or "") if p.get("modo", "A") == "M" else None
+               for p in piscinas]
+    modelo_manual = np.asarray(manuais, dtype=object)[i_piscina] if any(m is not None for m in manuais) else None
 
-    # Status
+    df = calcular_dimensionamento_lote(**colunas, modelo_manual=modelo_manual)
+    df.insert(0, "piscina", i_piscina)
+    return df
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _sensibilidade_pagina(inputs: dict) -> tuple:
+    """Grade da tela (25-41 C x regioes x 0-16 h de capa) e seu CSV, por entradas."""
+    grade = tabela_sensibilidade(
+        inputs, temp_agua=range(25, 42), regiao=(1, 2, 3), horas_capa=range(17),
+    )
+    return grade, grade.to_csv(index=False).encode("utf-8")
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 7. GERACAO DE PDF
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _gerar_pdf(res: dict, inputs: dict, gerado_em: str) -> bytes:
+    """Relatorio PDF; `gerado_em` entra no texto e na chave do cache de PDFs."""
     if res["equipamento_atende"]:
         status = f"<font color='#1e7c3a'><b>Equipamento Dimensionado: {res['modelo']}</b></font>"
     else:
@@ -526,52 +819,36 @@ def _gerar_pdf(res: dict, inputs: dict) -> bytes:
             f"{res['horas_inverno']:.1f}h/dia no inverno (limite: 17h). "
             f"Considere um modelo maior.</b></font>"
         )
-    story.append(Paragraph(status, s_normal))
-    story.append(Spacer(1, 8))
-
-    # Dados de entrada
-    story.append(Paragraph("Dados de Entrada", s_sub))
-    story.append(_tabela(
-        [
-            ["Parametro", "Valor", "Unidade"],
-            ["Dimensoes",
-             f"{inputs['largura']:.1f} x {inputs['comprimento']:.1f} x {inputs['profundidade']:.1f}",
-             "m"],
-            ["Volume",                  f"{res['volume_litros']:,.0f}",      "L"],
-            ["Area",                    f"{res['area_m2']:,.1f}",             "m2"],
-            ["Temperatura desejada",    f"{inputs['temp_agua']}",             "graus C"],
-            ["Regiao",                  f"{inputs['regiao']} - {res['nome_regiao']}", ""],
-            ["Ambiente",                "Aberto" if inputs['ambiente']=="A" else "Fechado", ""],
-            ["Incidencia solar",        f"{inputs['incidencia_solar']}",      "%"],
-            ["Velocidade do vento",     f"{inputs['velocidade_vento']}",      "km/h"],
-            ["Horas com capa",          f"{inputs['horas_capa']}",            "h/dia"],
-            ["Custo kWh",               f"R$ {inputs['custo_kwh']:.4f}",      ""],
-            ["Custo Gas Natural",       f"R$ {inputs['custo_gn_m3']:.2f}",    "R$/m3"],
-        ],
-        col_widths=[8 * cm, 6 * cm, 3 * cm],
-    ))
-    story.append(Spacer(1, 6))
 
-    # Energia dissipada
-    story.append(Paragraph("Energia Dissipada pela Piscina", s_sub))
-    story.append(_tabela(
-        [
-            ["Parametro", "Valor"],
-            ["Energia dissipada",       f"{res['energia_btu_h']:,.0f} BTU/h"],
-            ["Energia dissipada",       f"{res['energia_kcal_h']:,.0f} kcal/h"],
-            ["Energia dissipada",       f"{res['energia_kw']:.2f} kW"],
-            ["Energia mensal (BTU)",    f"{res['energia_mes_btu']:,.0f} BTU"],
-            ["Energia mensal (kcal)",   f"{res['energia_mes_kcal']:,.0f} kcal"],
-            ["Fator de capa",           f"{res['fator_capa']:.4f}"],
-            ["Fator de vento",          f"{res['fator_vento']:.4f}"],
-            ["Fator solar",             f"{res['fator_solar']:.4f}"],
-        ],
-        col_widths=[9 * cm, 8 * cm],
-    ))
-    story.append(Spacer(1, 6))
+    entrada_rows = [
+        ["Parametro", "Valor", "Unidade"],
+        ["Dimensoes",
+         f"{inputs['largura']:.1f} x {inputs['comprimento']:.1f} x {inputs['profundidade']:.1f}",
+         "m"],
+        ["Volume",                  f"{res['volume_litros']:,.0f}",      "L"],
+        ["Area",                    f"{res['area_m2']:,.1f}",             "m2"],
+        ["Temperatura desejada",    f"{inputs['temp_agua']}",             "graus C"],
+        ["Regiao",                  f"{inputs['regiao']} - {res['nome_regiao']}", ""],
+        ["Ambiente",                "Aberto" if inputs['ambiente']=="A" else "Fechado", ""],
+        ["Incidencia solar",        f"{inputs['incidencia_solar']}",      "%"],
+        ["Velocidade do vento",     f"{inputs['velocidade_vento']}",      "km/h"],
+        ["Horas com capa",          f"{inputs['horas_capa']}",            "h/dia"],
+        ["Custo kWh",               f"R$ {inputs['custo_kwh']:.4f}",      ""],
+        ["Custo Gas Natural",       f"R$ {inputs['custo_gn_m3']:.2f}",    "R$/m3"],
+    ]
+
+    energia_rows = [
+        ["Parametro", "Valor"],
+        ["Energia dissipada",       f"{res['energia_btu_h']:,.0f} BTU/h"],
+        ["Energia dissipada",       f"{res['energia_kcal_h']:,.0f} kcal/h"],
+        ["Energia dissipada",       f"{res['energia_kw']:.2f} kW"],
+        ["Energia mensal (BTU)",    f"{res['energia_mes_btu']:,.0f} BTU"],
+        ["Energia mensal (kcal)",   f"{res['energia_mes_kcal']:,.0f} kcal"],
+        ["Fator de capa",           f"{res['fator_capa']:.4f}"],
+        ["Fator de vento",          f"{res['fator_vento']:.4f}"],
+        ["Fator solar",             f"{res['fator_solar']:.4f}"],
+    ]
 
-    # Equipamento
-    story.append(Paragraph("Equipamento Selecionado", s_sub))
     nom_btu_pdf = res.get("nominal_btu_h")
     nom_cop_pdf = res.get("nominal_cop")
     nom_kw_pdf  = res.get("nominal_kw_eletrico")
@@ -588,55 +865,48 @@ def _gerar_pdf(res: dict, inputs: dict) -> bytes:
     equip_rows.append(["Consumo eletrico real",      f"{res['consumo_eletrico_kw']:.2f} kW"])
     equip_rows.append(["Horas/dia - inverno",        f"{res['horas_inverno']:.1f} h"])
     equip_rows.append(["Horas/dia - verao",          f"{res['horas_verao']:.1f} h"])
-    story.append(_tabela(equip_rows, col_widths=[9 * cm, 8 * cm]))
-    story.append(Spacer(1, 6))
-
-    # Aquecimento
-    story.append(Paragraph("Tempos de Aquecimento", s_sub))
-    story.append(_tabela(
-        [
-            ["Parametro", "Valor"],
-            ["Velocidade de aquecimento",    f"{res['velocidade_aq_c_h']:.4f} graus C/h"],
-            ["Tempo para aquecer 1 grau C",  f"{res['tempo_1grau_h']:.2f} h"],
-            ["Tempo 1o aquecimento (verao)", f"{res['tempo_aq_inicial_h']:.1f} h"],
-            ["Potencia no 1o aquecimento",   f"{res['potencia_1aq_kw']:.2f} kW"],
-            ["Custo do 1o aquecimento",      f"R$ {res['custo_1aq']:,.2f}"],
-        ],
-        col_widths=[9 * cm, 8 * cm],
-    ))
-    story.append(Spacer(1, 6))
 
-    # Custos
-    story.append(Paragraph("Analise de Custos Mensais", s_sub))
-    story.append(_tabela(
+    aquecimento_rows = [
+        ["Parametro", "Valor"],
+        ["Velocidade de aquecimento",    f"{res['velocidade_aq_c_h']:.4f} graus C/h"],
+        ["Tempo para aquecer 1 grau C",  f"{res['tempo_1grau_h']:.2f} h"],
+        ["Tempo 1o aquecimento (verao)", f"{res['tempo_aq_inicial_h']:.1f} h"],
+        ["Potencia no 1o aquecimento",   f"{res['potencia_1aq_kw']:.2f} kW"],
+        ["Custo do 1o aquecimento",      f"R$ {res['custo_1aq']:,.2f}"],
+    ]
+
+    custos_rows = [
+        ["Referencia", "Custo Mensal"],
+        ["Bomba de calor (inverno)",     f"R$ {res['custo_bomba_inverno']:,.2f}"],
+        ["Bomba de calor (verao)",       f"R$ {res['custo_bomba_verao']:,.2f}"],
+        ["Media mensal (bomba)",         f"R$ {res['custo_medio_mensal']:,.2f}"],
+        ["Resistencia eletrica (80%)",   f"R$ {res['custo_resistencia']:,.2f}"],
+        ["Gas natural",                  f"R$ {res['custo_gn_mes']:,.2f}"],
+        ["Consumo gas natural",          f"{res['consumo_gn_m3']:.2f} m3/mes"],
+        ["Economia vs. gas natural",     f"R$ {res['economia_mensal']:,.2f}"],
+    ]
+
+    return montar_relatorio(
+        "Dimensionamento de Aquecimento - Sodramar",
+        f"Gerado em: {gerado_em}   |   "
+        f"Modelo: <b>{res['modelo']}</b>",
         [
-            ["Referencia", "Custo Mensal"],
-            ["Bomba de calor (inverno)",     f"R$ {res['custo_bomba_inverno']:,.2f}"],
-            ["Bomba de calor (verao)",       f"R$ {res['custo_bomba_verao']:,.2f}"],
-            ["Media mensal (bomba)",         f"R$ {res['custo_medio_mensal']:,.2f}"],
-            ["Resistencia eletrica (80%)",   f"R$ {res['custo_resistencia']:,.2f}"],
-            ["Gas natural",                  f"R$ {res['custo_gn_mes']:,.2f}"],
-            ["Consumo gas natural",          f"{res['consumo_gn_m3']:.2f} m3/mes"],
-            ["Economia vs. gas natural",     f"R$ {res['economia_mensal']:,.2f}"],
+            ("Dados de Entrada",                entrada_rows,     (8, 6, 3)),
+            ("Energia Dissipada pela Piscina",  energia_rows,     (9, 8)),
+            ("Equipamento Selecionado",         equip_rows,       (9, 8)),
+            ("Tempos de Aquecimento",           aquecimento_rows, (9, 8)),
+            ("Analise de Custos Mensais",       custos_rows,      (9, 8)),
         ],
-        col_widths=[9 * cm, 8 * cm],
-    ))
-
-    # Rodape
-    story.append(Spacer(1, 14))
-    story.append(HRFlowable(width="100%", thickness=0.5, color=colors.lightgrey))
-    story.append(Paragraph(
-        "Bombas de calor Sodramar: temperatura ambiente minima 7 graus C, "
-        "umidade relativa minima 30%, temperatura maxima da agua 40 graus C.",
-        s_small,
-    ))
-
-    doc.build(story)
-    return buf.getvalue()
+        status=status,
+        rodape=(
+            "Bombas de calor Sodramar: temperatura ambiente minima 7 graus C, "
+            "umidade relativa minima 30%, temperatura maxima da agua 40 graus C."
+        ),
+    )
 
 
 # ─────────────────────────────────────────────────────────────────────────────
-# 7. INTERFACE STREAMLIT
+# 8. INTERFACE STREAMLIT
 # ─────────────────────────────────────────────────────────────────────────────
 
 def run():
@@ -824,16 +1094,40 @@ def _exibir_resultados(res: dict, inputs: dict):
         delta_color="normal",
     )
 
+    # Simulacao anual e comparacao de modelos  (import local: esses modulos importam este)
+    from modules.simulacao_aquecimento import exibir_simulacao_anual
+    exibir_simulacao_anual(res, inputs)
+
+    from modules.otimizacao_aquecimento import exibir_otimizacao_modelos
+    exibir_otimizacao_modelos(res, inputs)
+
+    # Sensibilidade  (grade temperatura x regiao x horas de capa)
+    with st.expander("Tabela de sensibilidade (temperatura x regiao)"):
+        # Expander nao adia a execucao: grade e CSV ficam em cache por entradas
+        grade, csv = _sensibilidade_pagina(inputs)
+        atual = grade[grade["horas_capa"] == inputs["horas_capa"]]
+        tabela = atual.pivot(index="temp_agua", columns="regiao", values="custo_medio_mensal")
+        tabela.index = [f"{t:.0f} C" for t in tabela.index]
+        tabela.columns = [REGIOES[r][0] for r in tabela.columns]
+        st.caption(
+            f"Custo medio mensal da bomba de calor (R$) com {inputs['horas_capa']} h/dia de capa. "
+            "O CSV traz todas as combinacoes de temperatura, regiao e horas de capa."
+        )
+        st.dataframe(tabela.round(2), use_container_width=True)
+        st.download_button(
+            "Baixar grade completa (CSV)",
+            data=csv,
+            file_name="sensibilidade_aquecimento.csv",
+            mime="text/csv",
+        )
+
     # Exportar PDF
     st.divider()
     col_pdf, _ = st.columns([2, 5])
-    if col_pdf.button("Gerar relatorio PDF", use_container_width=True):
-        pdf_bytes = _gerar_pdf(res, inputs)
-        nome = f"Aquecimento_Sodramar_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-        col_pdf.download_button(
-            label="Baixar PDF",
-            data=pdf_bytes,
-            file_name=nome,
-            mime="application/pdf",
-            use_container_width=True,
-        )
\ No newline at end of file
+    # PDF gerado so no clique, com a data do clique, e reaproveitado enquanto
+    # resultado, entradas e minuto da geracao nao mudarem
+    botao_download_pdf(
+        "Baixar relatorio PDF", _gerar_pdf, res, inputs,
+        file_name=f"Aquecimento_Sodramar_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf",
+        container=col_pdf, formato_data='%d/%m/%Y %H:%M',
+    )
\ No newline at end of file
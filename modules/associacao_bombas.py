@@ -0,0 +1,343 @@
+# modules/associacao_bombas.py
+"""
+Associação de motobombas em paralelo e em série.
+
+Em paralelo as vazões se somam na mesma pressão; em série as pressões se
+somam na mesma vazão. As curvas de cada bomba vêm dos interpoladores já
+compilados (Q(H) do catálogo colunar, H(Q) do registro de curvas), e a busca
+no catálogo avalia todos os pares e trios de uma vez com NumPy. Como o
+repositório não tem tabela de preços, o custo de uma associação é
+representado pela potência total instalada.
+"""
+
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import combinations_with_replacement
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+from scipy.optimize import brentq
+
+from modules.catalogo_bombas import CATALOGO_BOMBAS
+from modules.curvas_bombas import obter_curva_bomba
+
+# ==========================================
+# CONSTANTES
+# ==========================================
+
+TIPOS_ASSOCIACAO = ("paralelo", "serie")
+NOMES_ASSOCIACAO = {"paralelo": "paralelo", "serie": "série"}
+
+
+# ==========================================
+# CURVAS INDIVIDUAIS
+# ==========================================
+
+@lru_cache(maxsize=None)
+def _curva_hq(i):
+    """Curva H(Q) compartilhada da bomba `i` do catálogo (None com menos de 2 pontos)."""
+    return obter_curva_bomba(CATALOGO_BOMBAS.registro(i))
+
+
+def pressoes_na_vazao(vazoes, indices):
+    """
+    Pressão fornecida por cada bomba em vazões quaisquer, pelas curvas H(Q).
+
+    Cada interpolador é avaliado uma única vez sobre todas as vazões (bombas
+    repetidas em `indices` compartilham a mesma avaliação).
+
+    Args:
+        vazoes (float | array-like): Vazões (m³/h), shape (k,).
+        indices (array-like): Bombas do catálogo.
+
+    Returns:
+        np.ndarray: Matriz (bomba × k) de pressões em mca; NaN fora da faixa
+        de vazões da curva.
+    """
+    Q = np.atleast_1d(np.asarray(vazoes, dtype=np.float64))
+    unicos, posicao = np.unique(np.asarray(indices, dtype=np.intp), return_inverse=True)
+    pressoes = np.full((unicos.size, Q.size), np.nan)
+    for k, i in enumerate(unicos):
+        curva = _curva_hq(int(i))
+        if curva is None:
+            continue
+        dentro = (Q >= curva.vazoes[0]) & (Q <= curva.vazoes[-1])
+        pressoes[k, dentro] = curva.pchip(Q[dentro])
+    return pressoes[posicao]
+
+
+@lru_cache(maxsize=None)
+def _combinacoes(n, k):
+    """Todas as combinações com repetição de k entre n bombas, como array (m, k)."""
+    return np.array(list(combinations_with_replacement(range(n), k)), dtype=np.intp).reshape(-1, k)
+
+
+# ==========================================
+# ASSOCIAÇÃO
+# ==========================================
+
+@dataclass(frozen=True)
+class AssociacaoBombas:
+    """
+    Conjunto de motobombas do catálogo associadas em paralelo ou em série.
+
+    Attributes:
+        indices (tuple): Índices das bombas no catálogo (repetidos para bombas iguais).
+        tipo (str): "paralelo" ou "serie".
+    """
+    indices: tuple
+    tipo: str = "paralelo"
+
+    def __post_init__(self):
+        if self.tipo not in TIPOS_ASSOCIACAO:
+            raise ValueError(f"Tipo de associação '{self.tipo}' inválido. Use {TIPOS_ASSOCIACAO}.")
+        if not self.indices:
+            raise ValueError("A associação precisa de ao menos uma bomba.")
+
+    @property
+    def modelos(self):
+        return [CATALOGO_BOMBAS.modelos[i] for i in self.indices]
+
+    @property
+    def potencia_total(self):
+        return float(CATALOGO_BOMBAS.potencias[list(self.indices)].sum())
+
+    @property
+    def descricao(self):
+        """Ex: '2× BMC-100 em paralelo' ou '2× BMC-50 + BMC-75 em série'."""
+        modelos = self.modelos
+        if len(modelos) == 1:
+            return modelos[0]
+        texto = " + ".join(f"{n}× {modelo}" if n > 1 else modelo
+                           for modelo, n in Counter(modelos).items())
+        return f"{texto} em {NOMES_ASSOCIACAO[self.tipo]}"
+
+    def faixa(self):
+        """
+        Faixa comum da variável livre da associação.
+
+        Returns:
+            tuple: (mín, máx) de pressão (mca) em paralelo ou de vazão (m³/h) em
+            série; None se as curvas não têm faixa em comum.
+        """
+        limites = []
+        for i in self.indices:
+            if self.tipo == "paralelo":
+                vazoes, pressoes = CATALOGO_BOMBAS.pontos(i)
+                limites.append((pressoes[0], pressoes[-1]) if pressoes.size >= 2 else (np.nan, np.nan))
+            else:
+                curva = _curva_hq(i)
+                limites.append((curva.vazoes[0], curva.vazoes[-1]) if curva else (np.nan, np.nan))
+        inicio = max(a for a, _ in limites)
+        fim = min(b for _, b in limites)
+        return (float(inicio), float(fim)) if inicio < fim else None
+
+    def vazao_em(self, pressao):
+        """Vazão total (m³/h) da associação em paralelo na(s) pressão(ões) dada(s)."""
+        vazoes = CATALOGO_BOMBAS.vazoes_na_pressao(pressao, list(self.indices))
+        return vazoes.sum(axis=0) if np.ndim(pressao) else float(vazoes.sum())
+
+    def pressao_em(self, vazao):
+        """Pressão total (mca) da associação em série na(s) vazão(ões) dada(s)."""
+        pressoes = pressoes_na_vazao(vazao, self.indices)
+        return pressoes.sum(axis=0) if np.ndim(vazao) else float(pressoes.sum())
+
+    def curva(self, num_pontos=100):
+        """
+        Curva composta da associação.
+
+        Returns:
+            tuple: (vazoes, pressoes) da curva H(Q) equivalente; arrays vazios se
+            as curvas não têm faixa em comum.
+        """
+        faixa = self.faixa()
+        if faixa is None:
+            return np.empty(0), np.empty(0)
+        livre = np.linspace(faixa[0], faixa[1], num_pontos)
+        if self.tipo == "paralelo":
+            return self.vazao_em(livre), livre
+        return livre, self.pressao_em(livre)
+
+    def ponto_operacao(self, curva_sistema, num_pontos=200):
+        """
+        Pontos de operação da associação contra a curva do sistema.
+
+        A curva composta é varrida para localizar trocas de sinal da diferença
+        associação - sistema, e cada raiz é refinada por Brent sobre a curva exata.
+
+        Args:
+            curva_sistema (CurvaSistema): Curva H = A·Q² + B·Q + C do sistema.
+            num_pontos (int): Pontos da varredura inicial.
+
+        Returns:
+            list[tuple]: Lista de tuplas (vazão, pressão) dos pontos de operação.
+        """
+        faixa = self.faixa()
+        if faixa is None:
+            return []
+
+        if self.tipo == "paralelo":
+            def diferenca(h):
+                return h - curva_sistema(self.vazao_em(h))
+        else:
+            def diferenca(q):
+                return self.pressao_em(q) - curva_sistema(q)
+
+        livre = np.linspace(faixa[0], faixa[1], num_pontos)
+        if self.tipo == "paralelo":
+            valores = livre - curva_sistema(self.vazao_em(livre))
+        else:
+            valores = self.pressao_em(livre) - curva_sistema(livre)
+
+        raizes = []
+        for k in np.flatnonzero(np.sign(valores[:-1]) * np.sign(valores[1:]) <= 0):
+            if valores[k + 1] == 0.0:
+                continue  # registrada no trecho seguinte (ou no fim da faixa)
+            raizes.append(livre[k] if valores[k] == 0.0
+                          else brentq(diferenca, livre[k], livre[k + 1], xtol=1e-10))
+        if valores[-1] == 0.0:
+            raizes.append(livre[-1])
+        return [self._ponto(raiz) for raiz in raizes]
+
+    def _ponto(self, livre):
+        """Ponto (vazão, pressão) da curva composta para um valor da variável livre."""
+        if self.tipo == "paralelo":
+            return self.vazao_em(float(livre)), float(livre)
+        return float(livre), self.pressao_em(float(livre))
+
+
+# ==========================================
+# BUSCA NO CATÁLOGO
+# ==========================================
+
+def buscar_associacoes(vazao_necessaria, pressao_necessaria, tipo="paralelo", max_bombas=3,
+                       mistas=True, indices=None, limite=10):
+    """
+    Busca as associações de menor potência total que atendem (Q, H).
+
+    Todas as combinações de 1 a `max_bombas` bombas (com repetição) são
+    avaliadas de uma vez: em paralelo, soma das vazões de cada bomba na
+    pressão H; em série, soma das pressões de cada bomba na vazão Q. Cada
+    bomba precisa contribuir (vazão/pressão positiva) e estar dentro da faixa
+    da própria curva.
+
+    Args:
+        vazao_necessaria (float): Vazão Q (m³/h).
+        pressao_necessaria (float): Pressão H (mca).
+        tipo (str): "paralelo" ou "serie".
+        max_bombas (int): Número máximo de bombas na associação.
+        mistas (bool): Se False, apenas associações de bombas iguais.
+        indices (array-like, optional): Bombas candidatas. Se None, todo o catálogo.
+        limite (int): Número máximo de associações retornadas.
+
+    Returns:
+        list[dict]: Associações ordenadas por potência total, nº de bombas e
+        folga (decrescente), com chaves 'associacao' (AssociacaoBombas),
+        'potencia_total', 'num_bombas', 'vazao' e 'pressao' (no ponto atendido).
+    """
+    if tipo not in TIPOS_ASSOCIACAO:
+        raise ValueError(f"Tipo de associação '{tipo}' inválido. Use {TIPOS_ASSOCIACAO}.")
+
+    indices = (np.arange(len(CATALOGO_BOMBAS)) if indices is None
+               else np.asarray(indices, dtype=np.intp))
+    if tipo == "paralelo":
+        contribuicao = CATALOGO_BOMBAS.vazoes_na_pressao(pressao_necessaria, indices)[:, 0]
+        necessario = vazao_necessaria
+    else:
+        contribuicao = pressoes_na_vazao(vazao_necessaria, indices)[:, 0]
+        necessario = pressao_necessaria
+
+    # Bombas sem contribuição não entram em nenhuma associação
+    util = np.flatnonzero(contribuicao > 0.0)
+    contribuicao = contribuicao[util]
+    potencias = CATALOGO_BOMBAS.potencias[indices[util]]
+
+    combinacoes, totais, potencias_totais, num_bombas = [], [], [], []
+    for k in range(1, max_bombas + 1):
+        comb = _combinacoes(util.size, k)
+        if not mistas and k > 1:
+            comb = comb[np.all(comb == comb[:, :1], axis=1)]
+        total = contribuicao[comb].sum(axis=1)
+        ok = total >= necessario
+        combinacoes.extend(comb[ok])
+        totais.append(total[ok])
+        potencias_totais.append(potencias[comb[ok]].sum(axis=1))
+        num_bombas.append(np.full(ok.sum(), k))
+
+    if not combinacoes:
+        return []
+    totais = np.concatenate(totais)
+    potencias_totais = np.concatenate(potencias_totais)
+    num_bombas = np.concatenate(num_bombas)
+    melhores = np.lexsort((-totais, num_bombas, potencias_totais))[:limite]
+
+    saida = []
+    for m in melhores:
+        associacao = AssociacaoBombas(tuple(int(i) for i in indices[util[combinacoes[m]]]), tipo)
+        saida.append({
+            "associacao": associacao,
+            "potencia_total": float(potencias_totais[m]),
+            "num_bombas": int(num_bombas[m]),
+            "vazao": float(totais[m]) if tipo == "paralelo" else float(vazao_necessaria),
+            "pressao": float(pressao_necessaria) if tipo == "paralelo" else float(totais[m]),
+        })
+    return saida
+
+
+# ==========================================
+# INTERFACE
+# ==========================================
+
+def exibir_sugestoes_associacao(vazao_necessaria, pressao_necessaria, indices=None):
+    """
+    Exibe as associações de menor potência que atendem (Q, H) e a curva
+    composta da melhor delas. Usa a curva do sistema salva no módulo Perda de
+    carga, se houver, para indicar o ponto de operação.
+    """
+    sugestoes = buscar_associacoes(vazao_necessaria, pressao_necessaria, "paralelo",
+                                   indices=indices, limite=5)
+    if not sugestoes:
+        sugestoes = buscar_associacoes(vazao_necessaria, pressao_necessaria, "serie",
+                                       indices=indices, limite=5)
+    if not sugestoes:
+        st.info("Nenhuma associação de até 3 motobombas do catálogo atende este ponto.")
+        return
+
+    st.write("**Associações que atendem (menor potência total):**")
+    st.dataframe(pd.DataFrame({
+        "Associação": [s["associacao"].descricao for s in sugestoes],
+        "Potência total (cv)": [s["potencia_total"] for s in sugestoes],
+        "Vazão (m³/h)": [round(s["vazao"], 2) for s in sugestoes],
+        "Pressão (mca)": [round(s["pressao"], 2) for s in sugestoes],
+    }), hide_index=True, use_container_width=True)
+
+    melhor = sugestoes[0]["associacao"]
+    vazoes, pressoes = melhor.curva()
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=vazoes, y=pressoes, mode='lines',
+                             name=melhor.descricao, line=dict(color='#1f77b4', width=3)))
+    fig.add_trace(go.Scatter(x=[vazao_necessaria], y=[pressao_necessaria], mode='markers',
+                             name='Ponto necessário', marker=dict(color='red', size=10)))
+
+    curva_sistema = st.session_state.get("curva_sistema")
+    if curva_sistema is not None and vazoes.size:
+        q_sis = np.linspace(0.0, vazoes.max(), 100)
+        fig.add_trace(go.Scatter(x=q_sis, y=curva_sistema(q_sis), mode='lines',
+                                 name='Curva da Instalação', line=dict(color='green', dash='dash')))
+        for q, h in melhor.ponto_operacao(curva_sistema):
+            fig.add_trace(go.Scatter(x=[q], y=[h], mode='markers', name='Ponto de Operação',
+                                     marker=dict(color='black', size=10, symbol='x')))
+            st.caption(f"Ponto de operação com a curva do módulo Perda de carga: "
+                       f"{q:.1f} m³/h @ {h:.1f} mca")
+
+    fig.update_layout(
+        title=f'Curva composta — {melhor.descricao}',
+        xaxis_title='Vazão (m³/h)',
+        yaxis_title='Pressão (m.c.a)',
+        template='plotly_white',
+        height=450
+    )
+    st.plotly_chart(fig, use_container_width=True)
@@ -0,0 +1,147 @@
+# modules/cache_conteudo.py
+"""
+Cache endereçado por conteúdo, compartilhado entre sessões.
+
+A chave é o SHA-256 do conteúdo que determina o resultado (bytes enviados,
+entradas normalizadas), então sessões diferentes com os mesmos dados
+reaproveitam o mesmo valor sem risco de mistura. O LRU é limitado em número de
+entradas e em memória (tamanho medido uma vez, na inserção) e protegido por
+lock, pois o Streamlit atende cada sessão numa thread.
+
+Os valores armazenados são compartilhados: quem os recebe não deve modificá-los.
+"""
+
+import hashlib
+import json
+import sys
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+_AUSENTE = object()
+
+
+# ==========================================
+# CHAVES E TAMANHOS
+# ==========================================
+
+def hash_conteudo(*objetos):
+    """
+    SHA-256 do conteúdo (JSON canônico; tipos não serializáveis via str).
+
+    Returns:
+        str: Hash hexadecimal.
+    """
+    dados = json.dumps(objetos, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(dados.encode("utf-8")).hexdigest()
+
+
+def tamanho_aproximado(obj):
+    """
+    Memória aproximada de um objeto e de tudo o que ele referencia
+    (dicts, listas, tuplas, conjuntos; DataFrame/Series pelo uso profundo).
+
+    Objetos referenciados mais de uma vez contam uma única vez.
+
+    Returns:
+        int: Tamanho em bytes.
+    """
+    total = 0
+    vistos = set()
+    pilha = [obj]
+    while pilha:
+        o = pilha.pop()
+        if id(o) in vistos:
+            continue
+        vistos.add(id(o))
+        if isinstance(o, pd.DataFrame):
+            total += int(o.memory_usage(deep=True, index=True).sum())
+            continue
+        if isinstance(o, pd.Series):
+            total += int(o.memory_usage(deep=True, index=True))
+            continue
+        total += sys.getsizeof(o)
+        if isinstance(o, dict):
+            pilha.extend(o.keys())
+            pilha.extend(o.values())
+        elif isinstance(o, (list, tuple, set, frozenset)):
+            pilha.extend(o)
+    return total
+
+
+# ==========================================
+# LRU
+# ==========================================
+
+class CacheLRU:
+    """
+    LRU limitado em itens e em tamanho total, protegido por lock.
+
+    Args:
+        max_itens (int): Número máximo de entradas.
+        max_bytes (int): Soma máxima do tamanho das entradas.
+        medir (callable): Tamanho em bytes de um valor (padrão: tamanho_aproximado).
+    """
+
+    def __init__(self, max_itens=64, max_bytes=32 * 2 ** 20, medir=tamanho_aproximado):
+        self.max_itens = max_itens
+        self.max_bytes = max_bytes
+        self.medir = medir
+        self._dados = OrderedDict()     # chave -> (valor, tamanho)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+
+    def obter(self, chave, gerar):
+        """
+        Devolve o valor da chave, chamando `gerar()` na primeira vez.
+
+        Args:
+            chave (str): Hash do conteúdo.
+            gerar (callable): Função sem argumentos que produz o valor
+                (None também é armazenado).
+
+        Returns:
+            Valor armazenado.
+        """
+        with self._lock:
+            item = self._dados.get(chave, _AUSENTE)
+            if item is not _AUSENTE:
+                self._dados.move_to_end(chave)
+                self.acertos += 1
+                return item[0]
+            self.falhas += 1
+
+        # Fora do lock: outras sessões não esperam pelo cálculo
+        valor = gerar()
+        tamanho = self.medir(valor)
+        if tamanho > self.max_bytes:
+            # Maior que o cache inteiro: não armazena nem despeja os demais
+            return valor
+        with self._lock:
+            if chave not in self._dados:
+                self._dados[chave] = (valor, tamanho)
+                self._bytes += tamanho
+            while self._dados and (len(self._dados) > self.max_itens or self._bytes > self.max_bytes):
+                _, (_, tamanho_antigo) = self._dados.popitem(last=False)
+                self._bytes -= tamanho_antigo
+        return valor
+
+    def estatisticas(self):
+        """
+        Returns:
+            dict: Acertos, falhas, número de entradas e bytes armazenados.
+        """
+        with self._lock:
+            return {"acertos": self.acertos, "falhas": self.falhas,
+                    "itens": len(self._dados), "bytes": self._bytes}
+
+    def limpar(self):
+        """Esvazia o cache e zera os contadores."""
+        with self._lock:
+            self._dados.clear()
+            self._bytes = 0
+            self.acertos = 0
+            self.falhas = 0
@@ -1,13 +1,16 @@
 # modules/calc_utils.py
 import math
+from dataclasses import dataclass
+from functools import lru_cache
 import numpy as np
 from scipy.interpolate import PchipInterpolator
+from modules.data import DIAMETROS_TUBULACAO, RUGOSIDADE_PVC
 
 # ==========================================
 # CÁLCULOS DE HIDRÁULICA (PERDA DE CARGA)
 # ==========================================
 
-def calcular_fator_atrito(Re, D_int, epsilon=0.0000015):
+def calcular_fator_atrito(Re, D_int, epsilon=0.0000015, usar_tabela=True):
     """
     Calcula o fator de atrito de Darcy-Weisbach.
     
@@ -15,6 +18,9 @@ def calcular_fator_atrito(Re, D_int, epsilon=0.0000015):
         Re (float): Número de Reynolds.
         D_int (float): Diâmetro interno da tubulação (m).
         epsilon (float): Rugosidade absoluta (m). Padrão para PVC: 1.5e-6 m.
+        usar_tabela (bool): Consulta primeiro a tabela pré-calculada
+            (`obter_tabela_fator_atrito`); fora do domínio dela, ou com False,
+            resolve por Newton-Raphson.
         
     Returns:
         float: Fator de atrito (f).
@@ -22,6 +28,13 @@ def calcular_fator_atrito(Re, D_int, epsilon=0.0000015):
     if Re < 2000:
         return 64 / Re if Re > 0 else 0
 
+    if usar_tabela:
+        tabela = obter_tabela_fator_atrito()
+        if epsilon == tabela.epsilon:
+            f_tabela = tabela.consultar(Re, D_int)
+            if f_tabela is not None:
+                return f_tabela
+
     # Constantes da equação de Colebrook-White
     a = epsilon / (3.7 * D_int)
     b = 2.51 / Re
@@ -53,10 +66,255 @@ def calcular_fator_atrito(Re, D_int, epsilon=0.0000015):
 
     return 1.0 / (x ** 2)
 
+
+def calcular_fator_atrito_vetorizado(Re, D_int, epsilon=0.0000015, usar_tabela=True):
+    """
+    Versão vetorizada de `calcular_fator_atrito` para arrays de Re e D_int.
+
+    Os elementos dentro do domínio da tabela pré-calculada são resolvidos por
+    ela; os demais, simultaneamente, pelo mesmo Newton-Raphson da versão escalar
+    (mesmo chute inicial, tolerância e critérios de parada). Cada elemento deixa
+    de ser atualizado assim que convergiria na versão escalar, de modo que os
+    resultados coincidem com ela elemento a elemento.
+
+    Args:
+        Re (array-like): Números de Reynolds.
+        D_int (array-like): Diâmetros internos (m), com broadcast contra Re.
+        epsilon (float): Rugosidade absoluta (m). Padrão para PVC: 1.5e-6 m.
+        usar_tabela (bool): Resolve pela tabela pré-calculada os elementos dentro
+            do domínio dela; os demais (ou todos, com False) seguem pelo
+            Newton-Raphson.
+
+    Returns:
+        np.ndarray: Fatores de atrito (f), no formato resultante do broadcast.
+    """
+    Re, D_int = np.broadcast_arrays(np.asarray(Re, dtype=float),
+                                    np.asarray(D_int, dtype=float))
+    f = np.zeros(Re.shape)
+
+    # Regime laminar (Re < 2000)
+    laminar = Re < 2000
+    positivo = laminar & (Re > 0)
+    f[positivo] = 64 / Re[positivo]
+
+    turbulento = np.array(~laminar)  # array também com entradas 0-d (~ devolveria um escalar)
+    if usar_tabela and turbulento.any():
+        tabela = obter_tabela_fator_atrito()
+        if epsilon == tabela.epsilon:
+            f_tabela = tabela.consultar_vetorizado(Re[turbulento], D_int[turbulento])
+            resolvido = ~np.isnan(f_tabela)
+            # Índices planos: Re e D_int podem ter qualquer número de dimensões
+            idx = np.flatnonzero(turbulento)
+            f.flat[idx[resolvido]] = f_tabela[resolvido]
+            turbulento.flat[idx[resolvido]] = False
+    if not turbulento.any():
+        return f
+
+    # Constantes da equação de Colebrook-White (apenas elementos turbulentos)
+    a = epsilon / (3.7 * D_int[turbulento])
+    b = 2.51 / Re[turbulento]
+
+    x = np.full(a.shape, 7.071)
+    ativo = np.ones(a.shape, dtype=bool)
+    tol = 1e-8
+    max_iter = 100
+    ln10 = math.log(10)
+
+    for _ in range(max_iter):
+        idx = np.flatnonzero(ativo)
+        if idx.size == 0:
+            break
+
+        xa, aa, ba = x[idx], a[idx], b[idx]
+        termo = aa + ba * xa
+
+        # Prevenção contra log(0): elemento para sem atualizar x
+        valido = termo > 1e-12
+        termo_seguro = np.where(valido, termo, 1.0)
+
+        f_x = xa + 2 * np.log10(termo_seguro)
+        df_x = 1 + (2 * ba) / (termo_seguro * ln10 * (xa ** 2))
+
+        # Evitar divisão por zero na derivada
+        valido &= np.abs(df_x) >= 1e-10
+        x_novo = xa - f_x / np.where(valido, df_x, 1.0)
+
+        x[idx[valido]] = x_novo[valido]
+        convergiu = np.abs(x_novo - xa) < tol
+        ativo[idx[~valido | convergiu]] = False
+
+    f[turbulento] = 1.0 / (x ** 2)
+    return f
+
+
+class TabelaFatorAtrito:
+    """
+    Tabela pré-calculada do fator de atrito sobre ln(Re) × diâmetro interno.
+
+    Para cada diâmetro guarda x = 1/sqrt(f) (solução de Colebrook-White) e a
+    derivada dx/d(ln Re) em uma malha uniforme de ln(Re), e interpola por
+    Hermite cúbico entre os nós. A malha é refinada na construção até que o erro
+    relativo de f, medido contra o Newton-Raphson em 7 pontos internos de cada
+    intervalo, fique abaixo de `erro_max`. O erro medido fica em
+    `erro_verificado`; é uma verificação por amostragem (x(ln Re) é suave, e o
+    benchmark a confirma numa amostra densa), não um limite demonstrado.
+
+    É o caminho padrão de `calcular_fator_atrito` e da versão vetorizada dentro
+    do domínio (Re de `re_min` a `re_max` e diâmetros tabelados).
+
+    Args:
+        diametros_int_mm (iterable): Diâmetros internos tabelados (mm).
+        epsilon (float): Rugosidade absoluta (m).
+        re_min (float): Menor Reynolds da tabela (início do regime turbulento).
+        re_max (float): Maior Reynolds da tabela.
+        erro_max (float): Erro relativo máximo admitido em f.
+    """
+
+    # Frações de cada intervalo onde o erro de interpolação é verificado
+    _FRACOES_VERIFICACAO = np.array([0.125, 0.25, 0.375, 0.5, 0.625, 0.75, 0.875])
+
+    def __init__(self, diametros_int_mm, epsilon=RUGOSIDADE_PVC,
+                 re_min=2000.0, re_max=1.0e7, erro_max=1.0e-6):
+        self.epsilon = epsilon
+        self.re_min = re_min
+        self.re_max = re_max
+        self.erro_max = erro_max
+        self.diametros_mm = np.array(sorted(diametros_int_mm), dtype=float)
+        self._indice_diametro = {round(d, 3): i for i, d in enumerate(self.diametros_mm)}
+        self._u_min = math.log(re_min)
+        self._u_max = math.log(re_max)
+
+        n_nos = 17
+        while True:
+            self._construir(n_nos)
+            self.erro_verificado = self._medir_erro()
+            if self.erro_verificado <= erro_max:
+                break
+            n_nos = 2 * n_nos - 1  # mantém os nós anteriores
+
+    def _construir(self, n_nos):
+        self.n_nos = n_nos
+        self._du = (self._u_max - self._u_min) / (n_nos - 1)
+        u = np.linspace(self._u_min, self._u_max, n_nos)
+        Re = np.clip(np.exp(u), self.re_min, self.re_max)  # exp(ln(2000)) < 2000
+        D = self.diametros_mm[:, None] / 1000.0
+        f = calcular_fator_atrito_vetorizado(Re[None, :], D, self.epsilon, usar_tabela=False)
+
+        # x = 1/sqrt(f) e dx/du (u = ln Re) por derivação implícita de
+        # x + 2*log10(a + b*x) = 0, com b = 2.51/Re  =>  db/du = -b
+        x = 1.0 / np.sqrt(f)
+        a = self.epsilon / (3.7 * D)
+        b = 2.51 / Re[None, :]
+        c = 2.0 / ((a + b * x) * math.log(10))
+        dx_du = (c * b * x) / (1.0 + c * b)
+
+        self._x = x                    # shape (n_diametros, n_nos)
+        self._dx = dx_du * self._du    # derivada escalada pelo passo da malha
+        # Cópias em listas para a consulta escalar (evita indexação NumPy elemento a elemento)
+        self._x_lista = x.tolist()
+        self._dx_lista = self._dx.tolist()
+
+    def _medir_erro(self):
+        u = (self._u_min + self._du * np.arange(self.n_nos - 1)[:, None]
+             + self._du * self._FRACOES_VERIFICACAO[None, :]).ravel()
+        Re = np.clip(np.exp(u), self.re_min, self.re_max)
+        D = self.diametros_mm[:, None] / 1000.0
+        f_ref = calcular_fator_atrito_vetorizado(Re[None, :], D, self.epsilon, usar_tabela=False)
+        i_diam = np.broadcast_to(np.arange(self.diametros_mm.size)[:, None], f_ref.shape)
+        f_tab = self._interpolar(i_diam, np.broadcast_to(np.log(Re)[None, :], f_ref.shape))
+        return float(np.max(np.abs(f_tab / f_ref - 1.0)))
+
+    def _interpolar(self, i_diam, u):
+        s = (u - self._u_min) / self._du
+        k = np.clip(s.astype(int), 0, self.n_nos - 2)
+        t = s - k
+        x0, x1 = self._x[i_diam, k], self._x[i_diam, k + 1]
+        m0, m1 = self._dx[i_diam, k], self._dx[i_diam, k + 1]
+        t2 = t * t
+        t3 = t2 * t
+        x = ((2 * t3 - 3 * t2 + 1) * x0 + (t3 - 2 * t2 + t) * m0
+             + (3 * t2 - 2 * t3) * x1 + (t3 - t2) * m1)
+        return 1.0 / (x * x)
+
+    def consultar(self, Re, D_int):
+        """
+        Fator de atrito tabelado para um par (Re, D_int em m).
+        Retorna None se o par estiver fora do domínio da tabela.
+        """
+        i_diam = self._indice_diametro.get(round(D_int * 1000.0, 3))
+        if i_diam is None or not (self.re_min <= Re <= self.re_max):
+            return None
+        s = (math.log(Re) - self._u_min) / self._du
+        k = min(int(s), self.n_nos - 2)
+        t = s - k
+        x_d, dx_d = self._x_lista[i_diam], self._dx_lista[i_diam]
+        x0, x1 = x_d[k], x_d[k + 1]
+        m0, m1 = dx_d[k], dx_d[k + 1]
+        t2 = t * t
+        t3 = t2 * t
+        x = ((2 * t3 - 3 * t2 + 1) * x0 + (t3 - 2 * t2 + t) * m0
+             + (3 * t2 - 2 * t3) * x1 + (t3 - t2) * m1)
+        return 1.0 / (x * x)
+
+    def consultar_vetorizado(self, Re, D_int):
+        """
+        Fatores de atrito tabelados para arrays de Re e D_int (m).
+        Elementos fora do domínio da tabela retornam NaN.
+        """
+        Re, D_int = np.broadcast_arrays(np.asarray(Re, dtype=float),
+                                        np.asarray(D_int, dtype=float))
+        D_mm = np.round(D_int * 1000.0, 3)
+        pos = np.clip(np.searchsorted(self.diametros_mm, D_mm), 0, self.diametros_mm.size - 1)
+        dentro = ((self.diametros_mm[pos] == D_mm)
+                  & (Re >= self.re_min) & (Re <= self.re_max))
+
+        f = np.full(Re.shape, np.nan)
+        if dentro.any():
+            f[dentro] = self._interpolar(pos[dentro], np.log(Re[dentro]))
+        return f
+
+
+@lru_cache(maxsize=None)
+def obter_tabela_fator_atrito():
+    """
+    Tabela de fator de atrito dos diâmetros de `DIAMETROS_TUBULACAO` (PVC),
+    construída uma única vez por processo.
+    """
+    return TabelaFatorAtrito(DIAMETROS_TUBULACAO.values(), epsilon=RUGOSIDADE_PVC)
+
 # ==========================================
 # CÁLCULOS DE CURVAS (BOMBAS E SISTEMAS)
 # ==========================================
 
+@dataclass(frozen=True)
+class CurvaSistema:
+    """
+    Curva do sistema H(Q) = A·Q² + B·Q + C, com Q em m³/h e H em mca.
+
+    Imutável e hashable: pode ser guardada em `st.session_state`, usada como
+    chave de cache e avaliada diretamente sobre arrays NumPy.
+    """
+    A: float
+    B: float = 0.0
+    C: float = 0.0
+    descricao: str = ""
+
+    @classmethod
+    def de_perda_carga(cls, perda_total_mca, Q_m3h, altura_estatica=0.0, descricao=""):
+        """
+        Curva H = K·Q² + altura estática a partir de uma perda de carga
+        calculada na vazão de projeto (K = perda / Q²).
+        """
+        K = perda_total_mca / (Q_m3h ** 2) if Q_m3h != 0 else 0.0
+        return cls(A=float(K), B=0.0, C=float(altura_estatica), descricao=descricao)
+
+    def __call__(self, Q):
+        """Avalia H(Q) para um escalar ou array de vazões (m³/h)."""
+        Q = np.asarray(Q, dtype=float)
+        H = (self.A * Q + self.B) * Q + self.C
+        return float(H) if H.ndim == 0 else H
+
+
 def ajustar_curva_pchip(x_dados, y_dados, num_pontos=100):
     """
     Gera uma curva suavizada usando interpolação PCHIP.
@@ -91,6 +349,7 @@ def encontrar_interseccao_curvas(x_range, y_curva1, func_curva2):
         x_range (array-like): Valores de X onde as curvas estão definidas.
         y_curva1 (array-like): Valores Y da primeira curva (ex: Bomba).
         func_curva2 (callable): Função que gera Y para a segunda curva (ex: Sistema) dado X.
+            Uma `CurvaSistema` é avaliada de uma vez sobre todo o array.
         
     Returns:
         list[tuple]: Lista de tuplas (x, y) dos pontos de interseção.
@@ -99,7 +358,10 @@ def encontrar_interseccao_curvas(x_range, y_curva1, func_curva2):
     
     # Gerar Y para a segunda curva
     try:
-        y_curva2 = np.array([func_curva2(x) for x in x_range])
+        if isinstance(func_curva2, CurvaSistema):
+            y_curva2 = func_curva2(x_range)
+        else:
+            y_curva2 = np.array([func_curva2(x) for x in x_range])
     except Exception:
         return []
 
@@ -126,3 +388,178 @@ def encontrar_interseccao_curvas(x_range, y_curva1, func_curva2):
             pontos_interseccao.append((raiz, y_ponto))
             
     return pontos_interseccao
+
+
+@dataclass(frozen=True, eq=False)
+class TrechosPchip:
+    """
+    Trechos cúbicos de uma ou mais curvas PCHIP empilhados em arrays contíguos,
+    para cruzá-los com curvas do sistema sem laço por trecho nem por curva.
+
+    Monte uma vez (`de_curvas`) e reutilize para várias curvas do sistema.
+
+    Attributes:
+        curva (np.ndarray): Índice da curva de cada trecho.
+        x0 (np.ndarray): Início de cada trecho.
+        h (np.ndarray): Largura de cada trecho.
+        coef (np.ndarray): Coeficientes cúbicos locais, shape (4, n_trechos).
+        tol_x (np.ndarray): Distância abaixo da qual duas raízes de uma curva são a mesma.
+        n_curvas (int): Número de curvas.
+    """
+    curva: np.ndarray
+    x0: np.ndarray
+    h: np.ndarray
+    coef: np.ndarray
+    tol_x: np.ndarray
+    n_curvas: int
+
+    @classmethod
+    def de_curvas(cls, pchips):
+        """
+        Args:
+            pchips (sequence): Curvas Y(X) (PchipInterpolator), ex: H(Q) das bombas.
+        """
+        if not len(pchips):
+            return cls(np.empty(0, dtype=np.intp), np.empty(0), np.empty(0),
+                       np.empty((4, 0)), np.empty(0), 0)
+        nos = np.array([p.x.size for p in pchips])
+        x = np.concatenate([p.x for p in pchips])
+        # Cada curva contribui com (nós - 1) trechos; o último nó de cada uma não inicia trecho
+        ultimos = np.cumsum(nos) - 1
+        inicia = np.ones(x.size, dtype=bool)
+        inicia[ultimos] = False
+        return cls(
+            curva=np.repeat(np.arange(nos.size, dtype=np.intp), nos - 1),
+            x0=x[inicia],
+            h=np.diff(x)[inicia[:-1]],
+            coef=np.concatenate([p.c for p in pchips], axis=1),
+            tol_x=1e-9 * np.maximum(1.0, x[ultimos] - x[ultimos - nos + 1]),
+            n_curvas=nos.size,
+        )
+
+
+def _raizes_trechos(trechos, A, B, C, tol, max_iter):
+    """
+    Raízes de (cúbico do trecho) - (A·X² + B·X + C) em todos os trechos de uma vez.
+
+    Returns:
+        tuple: (trecho, t, chave) — índice do trecho, coordenada local e chave
+        de ordenação dentro do trecho de cada raiz (uma raiz sobre um nó pode
+        aparecer mais de uma vez).
+    """
+    x0, h = trechos.x0, trechos.h
+    # Cúbico da diferença em coordenadas locais: a·t³ + b·t² + c·t + d, com a
+    # quadrática do sistema reescrita como A·t² + (2·A·x0 + B)·t + (A·x0² + B·x0 + C)
+    a = trechos.coef[0]
+    b = trechos.coef[1] - A
+    c = trechos.coef[2] - (2.0 * A * x0 + B)
+    d = trechos.coef[3] - ((A * x0 + B) * x0 + C)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Pontos críticos (3a·t² + 2b·t + c = 0; -c/2b se o trecho é quadrático)
+        # e ponto de inflexão (-b/3a) cortam cada trecho em até quatro partes
+        # monótonas e sem inflexão; os que caem fora do interior viram a
+        # extremidade direita (parte vazia)
+        r = np.sqrt(b * b - 3.0 * a * c)
+        criticos = np.where(a == 0.0, -c / (2.0 * b), np.stack((-b - r, -b + r, -b)) / (3.0 * a))
+        criticos = np.where((criticos > 0.0) & (criticos < h), criticos, h)
+        criticos.sort(axis=0)
+        cortes = np.vstack((np.zeros_like(h), criticos, h))
+        f = ((a * cortes + b) * cortes + c) * cortes + d
+
+        # Raízes exatas sobre os cortes
+        j_exato, trecho_exato = np.nonzero(f == 0.0)
+
+        # Cada parte com troca de sinal tem exatamente uma raiz. Sem inflexão na
+        # parte, Newton a partir da extremidade onde f·f'' > 0 (condição de
+        # Fourier: a de maior |f'|) converge monotonamente, sem sair da parte
+        j, k = np.nonzero(f[:-1] * f[1:] < 0.0)
+        lo, hi = cortes[j, k], cortes[j + 1, k]
+        a, b, c, d = a[k], b[k], c[k], d[k]
+        curvatura = 3.0 * a * (lo + hi) + 2.0 * b
+        t = np.where(f[j, k] * curvatura >= 0.0, lo, hi)
+        a3, b2 = 3.0 * a, 2.0 * b
+        passo_min = tol * np.maximum(h[k], 1.0)
+        ativo = np.ones(k.size, dtype=bool)
+        for _ in range(max_iter if k.size else 0):
+            passo = (((a * t + b) * t + c) * t + d) / ((a3 * t + b2) * t + c)
+            # Raízes já convergidas ficam fixas: o resultado não depende do lote
+            ativo &= np.abs(passo) > passo_min
+            t = t - np.where(ativo, passo, 0.0)
+            if not ativo.any():
+                break
+        t = np.clip(t, lo, hi)
+
+    return (np.concatenate((trecho_exato, k)),
+            np.concatenate((cortes[j_exato, trecho_exato], t)),
+            np.concatenate((2 * j_exato, 2 * j + 1)))
+
+
+def encontrar_interseccoes_pchip(trechos, curva_sistema, tol=1e-12, max_iter=50):
+    """
+    Interseções exatas de uma ou mais curvas PCHIP com a curva do sistema.
+
+    Usa diretamente os coeficientes cúbicos por trecho dos interpoladores: em
+    cada trecho [x_k, x_k+1] a diferença bomba - sistema é um polinômio cúbico
+    em t = x - x_k. Os pontos críticos desse cúbico (raízes da derivada, uma
+    quadrática) e o ponto de inflexão dividem o trecho em até quatro partes
+    monótonas e de concavidade constante; cada parte com troca de sinal contém
+    exatamente uma raiz, obtida por Newton a partir da extremidade que garante
+    convergência monótona. Todos os trechos de todas as curvas são resolvidos
+    juntos, com NumPy, e não há amostragem.
+
+    O custo é quase todo fixo por chamada: cruzar todo o catálogo numa única
+    chamada sai mais barato por bomba que a varredura amostrada de
+    `encontrar_interseccao_curvas`; para uma só curva a varredura é mais rápida
+    (ver `benchmarks/bench_ponto_operacao.py`).
+
+    Args:
+        trechos (TrechosPchip | sequence): Trechos já empilhados, ou as curvas
+            Y(X) (PchipInterpolator) das bombas.
+        curva_sistema (CurvaSistema): Curva A·X² + B·X + C do sistema.
+        tol (float): Tolerância relativa no passo de Newton.
+        max_iter (int): Número máximo de iterações de Newton.
+
+    Returns:
+        list[list[tuple]]: Para cada curva, as tuplas (x, y) das interseções em
+        ordem crescente de x.
+    """
+    if not isinstance(trechos, TrechosPchip):
+        trechos = TrechosPchip.de_curvas(trechos)
+    A, B, C = float(curva_sistema.A), float(curva_sistema.B), float(curva_sistema.C)
+    trecho, t, chave = _raizes_trechos(trechos, A, B, C, tol, max_iter)
+
+    # Trechos estão em ordem de curva e de x, e as partes em ordem dentro do trecho
+    ordem = np.argsort(trecho * 8 + chave, kind="stable")
+    trecho, t = trecho[ordem], t[ordem]
+    x = trechos.x0[trecho] + t
+    # Y pelo cúbico da bomba no próprio trecho (exato sobre a curva)
+    coef = trechos.coef[:, trecho]
+    y = ((coef[0] * t + coef[1]) * t + coef[2]) * t + coef[3]
+    curva = trechos.curva[trecho]
+
+    # Descarta a mesma raiz vista por dois trechos (sobre um nó) ou por cortes vazios
+    nova = np.ones(x.size, dtype=bool)
+    nova[1:] = (curva[1:] != curva[:-1]) | (x[1:] - x[:-1] > trechos.tol_x[curva[1:]])
+    x, y, curva = x[nova].tolist(), y[nova].tolist(), curva[nova]
+
+    limites = np.searchsorted(curva, np.arange(trechos.n_curvas + 1)).tolist()
+    return [list(zip(x[i:j], y[i:j])) for i, j in zip(limites[:-1], limites[1:])]
+
+
+def encontrar_interseccao_pchip(pchip, curva_sistema, tol=1e-12, max_iter=50):
+    """
+    Interseções exatas entre uma curva PCHIP e a curva do sistema (ver
+    `encontrar_interseccoes_pchip`).
+
+    Args:
+        pchip (PchipInterpolator): Curva Y(X) da bomba (ex: H(Q)), como a
+            retornada por `ajustar_curva_pchip`.
+        curva_sistema (CurvaSistema): Curva A·X² + B·X + C do sistema.
+        tol (float): Tolerância relativa no passo de Newton.
+        max_iter (int): Número máximo de iterações de Newton.
+
+    Returns:
+        list[tuple]: Lista de tuplas (x, y) dos pontos de interseção, em ordem crescente de x.
+    """
+    return encontrar_interseccoes_pchip([pchip], curva_sistema, tol, max_iter)[0]
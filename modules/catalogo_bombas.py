@@ -0,0 +1,536 @@
+# modules/catalogo_bombas.py
+"""
+Catálogo colunar das motobombas.
+
+Consolida as listas de dicionários de `modules/data.py` (fonte dos dados) em
+arrays contíguos: índice de modelos, matriz de vazões float64 (bomba × pressão)
+com NaN nos pontos ausentes, e vetores de potência e de linha. Seleção,
+gráficos e exportação leem dessas colunas; um registro no formato de
+dicionário é reconstruído sob demanda (`CatalogoBombas.registro`).
+"""
+
+import hashlib
+import os
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+from scipy.interpolate import PchipInterpolator
+
+from modules import data as _fonte_dados
+
+# ==========================================
+# LINHAS DE PRODUTO
+# ==========================================
+
+# (nome da linha, lista correspondente em modules/data.py)
+FONTES_LINHAS = (
+    ("Sodramar - Linha BMC", "BANCO_BOMBAS_BMC"),
+    ("Sodramar - Linha BMGC", "BANCO_BOMBAS_BMGC"),
+    ("Sodramar - Linha BM", "BANCO_BOMBAS_BM"),
+    ("Sodramar - Linha BMU", "BANCO_BOMBAS_BMU"),
+    ("Syllent - Linha piscinas com pré-filtro", "BANCO_BOMBAS_SYLLENT"),
+    ("Jacuzzi - Linha recirculação piscina", "BANCO_BOMBAS_JACUZZI"),
+)
+
+LINHAS_BOMBAS = tuple((nome, getattr(_fonte_dados, variavel)) for nome, variavel in FONTES_LINHAS)
+
+# Linhas equivalentes a BANCO_BOMBAS (seleção de transbordo e hidromassagem)
+LINHAS_SELECAO = ("Sodramar - Linha BMC", "Sodramar - Linha BMU")
+
+
+def _chave_vazao(pressao):
+    """Nome da chave de vazão no formato de `modules/data.py` (ex: 'vazao_8_mca')."""
+    return f"vazao_{pressao:g}_mca"
+
+
+def _pressao_da_chave(chave):
+    """Pressão (mca) de uma chave 'vazao_N_mca', ou None se não for chave de vazão."""
+    if chave.startswith("vazao_") and chave.endswith("_mca"):
+        return float(chave[6:-4])
+    return None
+
+
+# ==========================================
+# CATÁLOGO
+# ==========================================
+
+class CatalogoBombas:
+    """
+    Armazenamento colunar das motobombas.
+
+    Attributes:
+        modelos (np.ndarray): Nomes dos modelos (object), na ordem das linhas.
+        potencias (np.ndarray): Potência (cv) de cada bomba, float64.
+        linhas (np.ndarray): Índice da linha de produto de cada bomba (int).
+        nomes_linhas (tuple): Nomes das linhas de produto.
+        pressoes (np.ndarray): Pressões (mca) das colunas, crescentes.
+        vazoes (np.ndarray): Matriz (bomba × pressão) de vazões em m³/h; NaN = sem ponto.
+        presente (np.ndarray): Máscara das chaves existentes no registro original
+            (distingue `None` de chave ausente na reconstrução dos dicionários).
+
+    Args:
+        linhas (iterable): Pares (nome da linha, lista de dicionários).
+    """
+
+    def __init__(self, linhas=LINHAS_BOMBAS):
+        linhas = tuple(linhas)
+        registros = [(i_linha, bomba) for i_linha, (_, dados) in enumerate(linhas) for bomba in dados]
+
+        pressoes = sorted({p for _, bomba in registros for p in map(_pressao_da_chave, bomba)
+                           if p is not None})
+        coluna = {p: j for j, p in enumerate(pressoes)}
+
+        n, m = len(registros), len(pressoes)
+        vazoes = np.full((n, m), np.nan)
+        presente = np.zeros((n, m), dtype=bool)
+        for i, (_, bomba) in enumerate(registros):
+            for chave, valor in bomba.items():
+                p = _pressao_da_chave(chave)
+                if p is None:
+                    continue
+                presente[i, coluna[p]] = True
+                if valor is not None:
+                    vazoes[i, coluna[p]] = valor
+
+        self.nomes_linhas = tuple(nome for nome, _ in linhas)
+        self.modelos = np.array([bomba["modelo"] for _, bomba in registros], dtype=object)
+        self.potencias = np.array([bomba["potencia_cv"] for _, bomba in registros], dtype=np.float64)
+        self.linhas = np.array([i_linha for i_linha, _ in registros], dtype=np.intp)
+        self.pressoes = np.array(pressoes, dtype=np.float64)
+        self.vazoes = vazoes
+        self.presente = presente
+        self.chaves_vazao = tuple(_chave_vazao(p) for p in pressoes)
+
+        self._coluna = coluna
+        self._selecao = {}
+        self._curvas = None
+        # Primeira ocorrência de cada modelo (como nas buscas lineares originais)
+        self._indice = {}
+        for i, modelo in enumerate(self.modelos):
+            self._indice.setdefault(modelo, i)
+
+        for arr in (self.modelos, self.potencias, self.linhas, self.pressoes,
+                    self.vazoes, self.presente):
+            arr.setflags(write=False)
+
+    def __len__(self):
+        return self.modelos.size
+
+    def indice(self, modelo):
+        """
+        Posição de um modelo no catálogo.
+
+        Raises:
+            KeyError: Se o modelo não existir.
+        """
+        try:
+            return self._indice[modelo]
+        except KeyError:
+            raise KeyError(f"Modelo '{modelo}' não encontrado no catálogo de bombas.") from None
+
+    def coluna(self, pressao):
+        """
+        Coluna da matriz de vazões correspondente a uma pressão (mca).
+
+        Raises:
+            KeyError: Se a pressão não tiver coluna no catálogo.
+        """
+        try:
+            return self._coluna[float(pressao)]
+        except KeyError:
+            raise KeyError(f"Pressão {pressao} mca não encontrada no catálogo de bombas.") from None
+
+    def vazoes_em(self, pressao):
+        """Vazões (m³/h) de todas as bombas na pressão dada (visão da coluna; NaN = sem ponto)."""
+        return self.vazoes[:, self.coluna(pressao)]
+
+    def indices_linhas(self, nomes):
+        """
+        Índices das bombas pertencentes às linhas informadas, na ordem do catálogo.
+
+        Args:
+            nomes (iterable): Nomes das linhas de produto.
+
+        Returns:
+            np.ndarray: Índices das bombas.
+        """
+        codigos = [self.nomes_linhas.index(nome) for nome in nomes]
+        return np.flatnonzero(np.isin(self.linhas, codigos))
+
+    def pontos(self, i):
+        """
+        Pontos válidos da curva de uma bomba.
+
+        Returns:
+            tuple: (vazoes, pressoes) da bomba `i`, na ordem crescente de pressão.
+        """
+        validos = ~np.isnan(self.vazoes[i])
+        return self.vazoes[i, validos], self.pressoes[validos]
+
+    def registro(self, i):
+        """
+        Reconstrói o dicionário da bomba `i` no formato de `modules/data.py`.
+
+        Returns:
+            dict: {'modelo', 'potencia_cv', 'vazao_N_mca', ...}; pontos ausentes valem None.
+        """
+        i = int(i)
+        bomba = {"modelo": self.modelos[i], "potencia_cv": float(self.potencias[i])}
+        for j in np.flatnonzero(self.presente[i]):
+            valor = self.vazoes[i, j]
+            bomba[self.chaves_vazao[j]] = None if np.isnan(valor) else float(valor)
+        return bomba
+
+    def _dados_selecao(self, indices):
+        """Bombas do subconjunto ordenadas por potência (estável) e a matriz de vazões nessa ordem."""
+        chave = indices.tobytes()
+        dados = self._selecao.get(chave)
+        if dados is None:
+            ordem = indices[np.argsort(self.potencias[indices], kind="stable")]
+            dados = (ordem, np.ascontiguousarray(self.vazoes[ordem]))
+            self._selecao[chave] = dados
+        return dados
+
+    def selecionar(self, vazoes_necessarias, pressoes, indices=None):
+        """
+        Seleciona, para cada consulta (Q, H), a bomba de menor potência que
+        fornece vazão ≥ Q na pressão H.
+
+        Empates de potência são resolvidos pela ordem do catálogo. Vazão nula
+        ou ausente no catálogo não atende. Consultas em pressões sem coluna no
+        catálogo não têm resposta.
+
+        Args:
+            vazoes_necessarias (float | array-like): Vazão necessária Q (m³/h).
+            pressoes (float | array-like): Pressão de seleção H (mca).
+            indices (array-like, optional): Bombas candidatas. Se None, todas.
+
+        Returns:
+            int | np.ndarray: Índice da bomba no catálogo para cada consulta,
+            ou -1 quando nenhuma bomba atende.
+        """
+        escalar = np.ndim(vazoes_necessarias) == 0 and np.ndim(pressoes) == 0
+        Q, H = np.broadcast_arrays(np.asarray(vazoes_necessarias, dtype=np.float64),
+                                   np.asarray(pressoes, dtype=np.float64))
+        Q, H = Q.ravel(), H.ravel()
+
+        indices = (np.arange(len(self)) if indices is None
+                   else np.asarray(indices, dtype=np.intp))
+        ordem, vazoes = self._dados_selecao(indices)
+
+        # Coluna de cada pressão consultada (-1 = pressão fora do catálogo)
+        j = np.searchsorted(self.pressoes, H)
+        j_valido = np.minimum(j, self.pressoes.size - 1)
+        tem_coluna = (j < self.pressoes.size) & (self.pressoes[j_valido] == H)
+
+        # Máscara (bomba × consulta) e primeira bomba que atende na ordem de potência
+        disponivel = vazoes[:, j_valido]
+        atende = (disponivel >= Q) & (disponivel > 0.0) & tem_coluna
+        if ordem.size:
+            primeira = np.argmax(atende, axis=0)
+            resultado = np.where(atende[primeira, np.arange(Q.size)], ordem[primeira], -1)
+        else:
+            resultado = np.full(Q.size, -1, dtype=np.intp)
+
+        if escalar:
+            return int(resultado[0])
+        return resultado.reshape(np.broadcast(np.asarray(vazoes_necessarias),
+                                              np.asarray(pressoes)).shape)
+
+    def _coeficientes_curvas(self):
+        """
+        Curvas Q(H) de todas as bombas como cúbicos de Hermite na grade comum de pressões.
+
+        Cada bomba recebe um PCHIP de vazão em função da pressão sobre seus
+        pontos válidos (preserva a monotonicidade dos dados). Como os nós de
+        cada bomba são um subconjunto da grade `pressoes`, o PCHIP é
+        reescrito exatamente em cada intervalo da grade a partir dos valores e
+        derivadas nos nós. Fora do domínio de cada bomba os coeficientes são NaN.
+
+        Returns:
+            tuple: (coef (n, m-1, 4) com [a, b, c, d] de a·t³ + b·t² + c·t + d,
+            valores nos nós (n, m)).
+        """
+        if self._curvas is not None:
+            return self._curvas
+
+        grade = self.pressoes
+        delta = np.diff(grade)
+        n, m = self.vazoes.shape
+        valores = np.full((n, m), np.nan)
+        derivadas = np.full((n, m), np.nan)
+        for i in range(n):
+            vazoes, pressoes = self.pontos(i)
+            if vazoes.size < 2:
+                continue
+            pchip = PchipInterpolator(pressoes, vazoes, extrapolate=False)
+            dentro = (grade >= pressoes[0]) & (grade <= pressoes[-1])
+            valores[i, dentro] = pchip(grade[dentro])
+            # Nos nós com dado de catálogo, o valor exato (sem arredondamento)
+            valores[i, ~np.isnan(self.vazoes[i])] = vazoes
+            # PCHIP é C¹: a derivada em cada nó é única
+            derivadas[i, dentro] = pchip.derivative()(grade[dentro])
+
+        y0, y1 = valores[:, :-1], valores[:, 1:]
+        d0, d1 = derivadas[:, :-1], derivadas[:, 1:]
+        inclinacao = (y1 - y0) / delta
+        coef = np.stack([
+            (d0 + d1 - 2.0 * inclinacao) / delta ** 2,
+            (3.0 * inclinacao - 2.0 * d0 - d1) / delta,
+            d0,
+            y0,
+        ], axis=-1)
+
+        self._curvas = (coef, valores)
+        return self._curvas
+
+    def vazoes_na_pressao(self, pressoes, indices=None):
+        """
+        Vazão de todas as bombas em pressões quaisquer, pelas curvas Q(H).
+
+        Args:
+            pressoes (float | array-like): Pressões (mca), shape (k,).
+            indices (array-like, optional): Bombas avaliadas. Se None, todas.
+
+        Returns:
+            np.ndarray: Matriz (bomba × k) de vazões em m³/h; NaN onde a pressão
+            está fora da faixa de dados da bomba.
+        """
+        coef, valores = self._coeficientes_curvas()
+        if indices is not None:
+            coef, valores = coef[indices], valores[indices]
+        H = np.atleast_1d(np.asarray(pressoes, dtype=np.float64))
+        grade = self.pressoes
+
+        no = np.clip(np.searchsorted(grade, H, side="right") - 1, 0, grade.size - 1)
+        j = np.minimum(no, grade.size - 2)
+        t = H - grade[j]
+        a, b, c, d = np.moveaxis(coef[:, j, :], -1, 0)
+        vazoes = ((a * t + b) * t + c) * t + d
+
+        # Sobre um nó da grade vale o valor do nó (inclui o fim do domínio de
+        # cada bomba, onde o intervalo seguinte é NaN); fora da grade: sem dados
+        sobre_no = H == grade[no]
+        vazoes[:, sobre_no] = valores[:, no[sobre_no]]
+        vazoes[:, (H < grade[0]) | (H > grade[-1]) | np.isnan(H)] = np.nan
+        return vazoes
+
+    def selecionar_por_curva(self, vazoes_necessarias, pressoes, indices=None):
+        """
+        Todas as bombas cuja curva Q(H) fornece vazão ≥ Q na pressão H.
+
+        Diferente de `selecionar`, aceita qualquer pressão real dentro da faixa
+        de dados de cada bomba e não depende do valor tabelado naquela coluna.
+        Todas as bombas são avaliadas em uma única operação vetorizada.
+
+        Args:
+            vazoes_necessarias (float | array-like): Vazão necessária Q (m³/h).
+            pressoes (float | array-like): Pressão de seleção H (mca).
+            indices (array-like, optional): Bombas candidatas. Se None, todas.
+
+        Returns:
+            np.ndarray | list: Índices das bombas que atendem, em ordem crescente
+            de potência (empates pela ordem do catálogo); para consultas
+            vetoriais, uma lista com um array por consulta.
+        """
+        escalar = np.ndim(vazoes_necessarias) == 0 and np.ndim(pressoes) == 0
+        Q, H = np.broadcast_arrays(np.asarray(vazoes_necessarias, dtype=np.float64),
+                                   np.asarray(pressoes, dtype=np.float64))
+        Q, H = Q.ravel(), H.ravel()
+
+        indices = (np.arange(len(self)) if indices is None
+                   else np.asarray(indices, dtype=np.intp))
+        ordem, _ = self._dados_selecao(indices)
+
+        disponivel = self.vazoes_na_pressao(H)[ordem]
+        atende = (disponivel >= Q) & (disponivel > 0.0)
+        resultado = [ordem[atende[:, k]] for k in range(Q.size)]
+        return resultado[0] if escalar else resultado
+
+    def para_dataframe(self):
+        """
+        Tabela larga do catálogo para exibição e exportação.
+
+        Mesmo conteúdo do antigo melt/pivot de `carregar_dados_bombas`, mas com
+        as colunas de pressão já em ordem numérica crescente.
+
+        Returns:
+            pd.DataFrame: Colunas 'Modelo', 'Potência (cv)', 'Linha' e 'N mca'
+            (apenas pressões com algum dado); linhas ordenadas por modelo,
+            potência e linha; bombas sem nenhum ponto são omitidas.
+        """
+        com_dados = ~np.isnan(self.vazoes)
+        colunas = np.flatnonzero(com_dados.any(axis=0))
+        nomes_linhas = [self.nomes_linhas[k] for k in self.linhas]
+        ordem = sorted(np.flatnonzero(com_dados.any(axis=1)),
+                       key=lambda i: (self.modelos[i], self.potencias[i], nomes_linhas[i]))
+
+        df = pd.DataFrame(self.vazoes[np.ix_(ordem, colunas)],
+                          columns=[f"{p:g} mca" for p in self.pressoes[colunas]])
+        df.insert(0, "Modelo", [self.modelos[i] for i in ordem])
+        df.insert(1, "Potência (cv)", self.potencias[ordem])
+        df.insert(2, "Linha", [nomes_linhas[i] for i in ordem])
+        return df
+
+
+CATALOGO_BOMBAS = CatalogoBombas()
+_hash_fonte = {}
+
+
+def hash_fonte_catalogo():
+    """
+    SHA-256 do conteúdo atual de `modules/data.py`, fonte do catálogo.
+
+    O arquivo só é relido quando muda a data de modificação ou o tamanho.
+
+    Returns:
+        str: Hash hexadecimal.
+    """
+    caminho = _fonte_dados.__file__
+    info = os.stat(caminho)
+    assinatura = (info.st_mtime_ns, info.st_size)
+    if _hash_fonte.get("assinatura") != assinatura:
+        with open(caminho, "rb") as arquivo:
+            _hash_fonte["hash"] = hashlib.sha256(arquivo.read()).hexdigest()
+        _hash_fonte["assinatura"] = assinatura
+    return _hash_fonte["hash"]
+
+
+INDICES_SELECAO = CATALOGO_BOMBAS.indices_linhas(LINHAS_SELECAO)
+
+
+def selecionar_bombas(vazoes_necessarias, pressoes, indices=INDICES_SELECAO):
+    """
+    Seleção vetorizada no catálogo global (ver `CatalogoBombas.selecionar`).
+
+    Por padrão considera as linhas de `LINHAS_SELECAO` (equivalente a BANCO_BOMBAS).
+    """
+    return CATALOGO_BOMBAS.selecionar(vazoes_necessarias, pressoes, indices)
+
+
+def selecionar_bomba(vazao_necessaria, pressao, indices=INDICES_SELECAO):
+    """
+    Bomba de menor potência que fornece `vazao_necessaria` (m³/h) em `pressao` (mca).
+
+    Returns:
+        dict | None: Registro da bomba no formato de `modules/data.py`, ou None.
+    """
+    i = selecionar_bombas(vazao_necessaria, pressao, indices)
+    return CATALOGO_BOMBAS.registro(i) if i >= 0 else None
+
+
+def selecionar_bombas_curva(vazao_necessaria, pressao, indices=None):
+    """
+    Seleção pela curva no catálogo global (ver `CatalogoBombas.selecionar_por_curva`).
+
+    Por padrão considera o catálogo completo (equivalente a BANCO_BOMBAS_TT).
+    """
+    return CATALOGO_BOMBAS.selecionar_por_curva(vazao_necessaria, pressao, indices)
+
+
+# ==========================================
+# ÍNDICE DE CURVAS (BUSCA POR PONTO DE TRABALHO)
+# ==========================================
+
+class IndiceCurvasBombas:
+    """
+    Índice das curvas Q(H) para consultas "quais bombas passam acima de (Q, H)".
+
+    Em cada intervalo da grade de pressões o PCHIP de cada bomba é monótono,
+    logo a curva fica entre os valores dos dois nós: cada bomba tem, por
+    intervalo, uma faixa [q_inf, q_sup] de vazões. Para um lote de pontos, a
+    faixa decide de uma vez os pares (bomba, ponto) que certamente atendem
+    (q_inf ≥ Q) ou não (q_sup < Q); o cúbico só é avaliado nos pares
+    ambíguos. O envelope (maior q_sup do intervalo) descarta pontos acima de
+    todas as curvas.
+
+    O resultado é idêntico a `CatalogoBombas.selecionar_por_curva`.
+
+    Args:
+        catalogo (CatalogoBombas): Catálogo indexado.
+        indices (array-like, optional): Bombas indexadas. Se None, todas.
+    """
+
+    # Folga relativa nas decisões pela faixa (protege contra arredondamento)
+    _TOL = 1e-9
+
+    def __init__(self, catalogo, indices=None):
+        indices = (np.arange(len(catalogo)) if indices is None
+                   else np.asarray(indices, dtype=np.intp))
+        self.catalogo = catalogo
+        # Bombas na ordem de potência
+        self.ordem, _ = catalogo._dados_selecao(indices)
+
+        coef, valores = catalogo._coeficientes_curvas()
+        self._coef = coef[self.ordem]
+        self.valores_nos = valores[self.ordem]
+        # Intervalos fora do domínio da bomba (NaN) nunca atendem
+        q_inf = np.minimum(self.valores_nos[:, :-1], self.valores_nos[:, 1:])
+        q_sup = np.maximum(self.valores_nos[:, :-1], self.valores_nos[:, 1:])
+        self.q_inf = np.where(np.isnan(q_inf), -np.inf, q_inf)
+        self.q_sup = np.where(np.isnan(q_sup), -np.inf, q_sup)
+        self.envelope = self.q_sup.max(axis=0, initial=-np.inf)
+
+    def atende(self, vazoes_necessarias, pressoes):
+        """
+        Matriz (bomba × ponto) indicando se a curva fornece vazão ≥ Q em H.
+
+        Args:
+            vazoes_necessarias (array-like): Vazão Q (m³/h) de cada ponto.
+            pressoes (array-like): Pressão H (mca) de cada ponto.
+
+        Returns:
+            np.ndarray: Máscara booleana; linhas na ordem de `self.ordem` (potência).
+        """
+        Q, H = np.broadcast_arrays(np.asarray(vazoes_necessarias, dtype=np.float64),
+                                   np.asarray(pressoes, dtype=np.float64))
+        Q, H = Q.ravel(), H.ravel()
+        grade = self.catalogo.pressoes
+
+        # Vazão nula nunca atende (como em `CatalogoBombas.selecionar`)
+        Q = np.maximum(Q, np.nextafter(0.0, 1.0))
+        folga = self._TOL * np.maximum(1.0, Q)
+        valido = (H >= grade[0]) & (H <= grade[-1])
+        no = np.clip(np.searchsorted(grade, H, side="right") - 1, 0, grade.size - 1)
+        j = np.minimum(no, grade.size - 2)
+        t = H - grade[j]
+
+        # Decisão pela faixa do intervalo; pontos acima do envelope saem direto
+        resultado = self.q_inf[:, j] >= Q + folga
+        ambiguo = ((self.q_sup[:, j] >= Q - folga) & ~resultado
+                   & (self.envelope[j] >= Q - folga))
+        linhas, pontos = np.nonzero(ambiguo)
+        if linhas.size:
+            a, b, c, d = self._coef[linhas, j[pontos]].T
+            tp = t[pontos]
+            resultado[linhas, pontos] = (((a * tp + b) * tp + c) * tp + d) >= Q[pontos]
+
+        # Sobre um nó da grade vale o valor do nó (como em `vazoes_na_pressao`)
+        sobre_no = valido & (H == grade[no])
+        resultado[:, sobre_no] = self.valores_nos[:, no[sobre_no]] >= Q[sobre_no]
+        resultado[:, ~valido] = False
+        return resultado
+
+    def consultar(self, vazoes_necessarias, pressoes):
+        """
+        Bombas cuja curva fornece vazão ≥ Q na pressão H, para um ou vários pontos.
+
+        Args:
+            vazoes_necessarias (float | array-like): Vazão Q (m³/h) de cada ponto.
+            pressoes (float | array-like): Pressão H (mca) de cada ponto.
+
+        Returns:
+            np.ndarray | list: Índices das bombas no catálogo, em ordem crescente
+            de potência; para consultas vetoriais, uma lista com um array por ponto.
+        """
+        escalar = np.ndim(vazoes_necessarias) == 0 and np.ndim(pressoes) == 0
+        resultado = self.atende(vazoes_necessarias, pressoes)
+        listas = [self.ordem[resultado[:, k]] for k in range(resultado.shape[1])]
+        return listas[0] if escalar else listas
+
+
+@lru_cache(maxsize=None)
+def obter_indice_curvas():
+    """Índice de curvas do catálogo completo, construído uma vez por processo."""
+    return IndiceCurvasBombas(CATALOGO_BOMBAS)
@@ -0,0 +1,208 @@
+# modules/curvas_bombas.py
+"""
+Registro compartilhado das curvas PCHIP das motobombas.
+
+Cada curva H(Q) é construída uma única vez por processo e reaproveitada por
+todas as sessões do Streamlit (banco de equipamentos, transbordo,
+hidromassagem). A chave é o modelo mais um hash do conteúdo dos pontos, de
+modo que uma alteração nos dados do catálogo gera uma nova entrada em vez de
+devolver uma curva desatualizada.
+"""
+
+import hashlib
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+
+from modules.calc_utils import ajustar_curva_pchip
+from modules.data import BANCO_BOMBAS_TT
+
+# ==========================================
+# CONSTANTES
+# ==========================================
+
+# Faixa de pressões usada nas curvas de seleção (transbordo e hidromassagem)
+PRESSOES_CURVA_SELECAO = tuple(range(2, 19, 2))
+
+
+# ==========================================
+# EXTRAÇÃO DE PONTOS
+# ==========================================
+
+def pontos_da_bomba(bomba, pressoes=None):
+    """
+    Extrai os pontos (vazão, pressão) de uma bomba do catálogo.
+
+    Args:
+        bomba (dict): Registro da bomba (chaves `vazao_{N}_mca`).
+        pressoes (iterable, optional): Pressões (mca) consideradas. Se None,
+            usa todas as chaves `vazao_{N}_mca` presentes.
+
+    Returns:
+        tuple: (vazoes, pressoes) como arrays float64 ordenados por vazão.
+    """
+    if pressoes is None:
+        pontos = [(float(v), float(k[6:-4])) for k, v in bomba.items()
+                  if k.startswith("vazao_") and k.endswith("_mca") and v is not None]
+    else:
+        pontos = [(float(bomba[f"vazao_{p}_mca"]), float(p)) for p in pressoes
+                  if bomba.get(f"vazao_{p}_mca") is not None]
+
+    pontos.sort()
+    if not pontos:
+        return np.empty(0), np.empty(0)
+    vazoes, pressoes_arr = np.array(pontos, dtype=np.float64).T
+    return vazoes, pressoes_arr
+
+
+def _hash_pontos(vazoes, pressoes):
+    """Hash do conteúdo dos pontos (independente do tipo numérico de origem)."""
+    dados = np.stack([np.asarray(vazoes, dtype=np.float64),
+                      np.asarray(pressoes, dtype=np.float64)])
+    return hashlib.sha1(np.ascontiguousarray(dados).tobytes()).hexdigest()
+
+
+# ==========================================
+# REGISTRO
+# ==========================================
+
+@dataclass(frozen=True)
+class CurvaBomba:
+    """
+    Curva H(Q) pré-compilada de uma motobomba.
+
+    Os arrays são somente leitura: o mesmo objeto é compartilhado entre sessões.
+    """
+    modelo: str
+    vazoes: np.ndarray
+    pressoes: np.ndarray
+    x_interp: np.ndarray
+    y_interp: np.ndarray
+    pchip: object
+
+
+class RegistroCurvasBombas:
+    """
+    Cache de processo das curvas PCHIP, protegido por lock.
+
+    Args:
+        num_pontos (int): Número de pontos da curva suavizada (para gráficos).
+    """
+
+    def __init__(self, num_pontos=100):
+        self.num_pontos = num_pontos
+        self._curvas = {}
+        self._lock = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+
+    def obter(self, modelo, vazoes, pressoes):
+        """
+        Devolve a curva compartilhada para os pontos informados, construindo-a
+        na primeira solicitação.
+
+        Args:
+            modelo (str): Nome do modelo da bomba.
+            vazoes (array-like): Vazões (m³/h) dos pontos de catálogo.
+            pressoes (array-like): Pressões (mca) correspondentes.
+
+        Returns:
+            CurvaBomba: Curva pré-compilada.
+        """
+        vazoes = np.asarray(vazoes, dtype=np.float64)
+        pressoes = np.asarray(pressoes, dtype=np.float64)
+        idx = np.argsort(vazoes, kind="stable")
+        vazoes, pressoes = vazoes[idx], pressoes[idx]
+
+        chave = (modelo, _hash_pontos(vazoes, pressoes))
+        with self._lock:
+            curva = self._curvas.get(chave)
+            if curva is not None:
+                self.acertos += 1
+                return curva
+            self.falhas += 1
+
+        # Construção fora do lock; em caso de corrida, prevalece a primeira inserida
+        x_interp, y_interp, pchip = ajustar_curva_pchip(vazoes, pressoes, self.num_pontos)
+        for arr in (vazoes, pressoes, x_interp, y_interp):
+            arr.setflags(write=False)
+        nova = CurvaBomba(modelo, vazoes, pressoes, x_interp, y_interp, pchip)
+
+        with self._lock:
+            return self._curvas.setdefault(chave, nova)
+
+    def obter_da_bomba(self, bomba, pressoes=None):
+        """
+        Atalho de `obter` a partir de um registro do catálogo.
+
+        Args:
+            bomba (dict): Registro da bomba.
+            pressoes (iterable, optional): Pressões consideradas (ver `pontos_da_bomba`).
+
+        Returns:
+            CurvaBomba | None: Curva pré-compilada, ou None com menos de 2 pontos.
+        """
+        vazoes, pressoes_arr = pontos_da_bomba(bomba, pressoes)
+        if vazoes.size < 2:
+            return None
+        return self.obter(bomba["modelo"], vazoes, pressoes_arr)
+
+    def aquecer(self, bombas=None, conjuntos_pressoes=(None, PRESSOES_CURVA_SELECAO)):
+        """
+        Pré-constrói as curvas de todas as bombas do catálogo.
+
+        Args:
+            bombas (list, optional): Registros a compilar. Padrão: BANCO_BOMBAS_TT.
+            conjuntos_pressoes (tuple): Faixas de pressão a compilar por bomba
+                (None = todos os pontos, como no banco de equipamentos).
+
+        Returns:
+            int: Número de curvas no registro após o aquecimento.
+        """
+        for bomba in (BANCO_BOMBAS_TT if bombas is None else bombas):
+            for pressoes in conjuntos_pressoes:
+                try:
+                    self.obter_da_bomba(bomba, pressoes)
+                except ValueError:
+                    # Pontos inválidos para PCHIP (ex: vazões repetidas)
+                    continue
+        return len(self._curvas)
+
+    def estatisticas(self):
+        """
+        Returns:
+            dict: Contadores de acertos, falhas e número de curvas armazenadas.
+        """
+        with self._lock:
+            return {"acertos": self.acertos, "falhas": self.falhas, "curvas": len(self._curvas)}
+
+    def limpar(self):
+        """Esvazia o registro e zera os contadores."""
+        with self._lock:
+            self._curvas.clear()
+            self.acertos = 0
+            self.falhas = 0
+
+
+REGISTRO_CURVAS = RegistroCurvasBombas()
+_aquecido = False
+
+
+def obter_curva_bomba(bomba, pressoes=None):
+    """Curva compartilhada de uma bomba do catálogo (ver `RegistroCurvasBombas.obter_da_bomba`)."""
+    return REGISTRO_CURVAS.obter_da_bomba(bomba, pressoes)
+
+
+def aquecer_registro():
+    """
+    Aquece o registro global uma única vez por processo.
+
+    Returns:
+        dict: Estatísticas do registro.
+    """
+    global _aquecido
+    if not _aquecido:
+        REGISTRO_CURVAS.aquecer()
+        _aquecido = True
+    return REGISTRO_CURVAS.estatisticas()
@@ -3,19 +3,12 @@ import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
 import numpy as np
-import re
-from typing import List, Tuple, Optional, Callable
+from typing import Optional
 from tracking import track_access
-from modules.data import (
-    BANCO_FILTROS,
-    BANCO_BOMBAS_BMC,
-    BANCO_BOMBAS_BMGC,
-    BANCO_BOMBAS_BM,
-    BANCO_BOMBAS_BMU,
-    BANCO_BOMBAS_SYLLENT,
-    BANCO_BOMBAS_JACUZZI
-)
-from modules.calc_utils import ajustar_curva_pchip, encontrar_interseccao_curvas
+from modules.data import BANCO_FILTROS
+from modules.catalogo_bombas import CATALOGO_BOMBAS, hash_fonte_catalogo, obter_indice_curvas
+from modules.calc_utils import TrechosPchip, encontrar_interseccao_pchip, encontrar_interseccoes_pchip, CurvaSistema
+from modules.curvas_bombas import REGISTRO_CURVAS, obter_curva_bomba
 
 
 def formatar_tabela_filtros() -> pd.DataFrame:
@@ -38,69 +31,21 @@ def formatar_tabela_filtros() -> pd.DataFrame:
     return df
 
 
-@st.cache_data(show_spinner=False)
 def carregar_dados_bombas() -> pd.DataFrame:
     """
-    Carrega e consolida os dados de todos os bancos de bombas,
-    adicionando a coluna 'Linha'. O resultado é cacheado para performance.
-    """
-    bancos = [
-        ("Sodramar - Linha BMC", BANCO_BOMBAS_BMC),
-        ("Sodramar - Linha BMGC", BANCO_BOMBAS_BMGC),
-        ("Sodramar - Linha BM", BANCO_BOMBAS_BM),
-        ("Sodramar - Linha BMU", BANCO_BOMBAS_BMU),
-        ("Syllent - Linha piscinas com pré-filtro", BANCO_BOMBAS_SYLLENT),
-        ("Jacuzzi - Linha recirculação piscina", BANCO_BOMBAS_JACUZZI),
-    ]
-
-    dfs = []
-    for linha, dados in bancos:
-        df = pd.DataFrame(dados)
-        df["Linha"] = linha
-        dfs.append(df)
-
-    df_consolidado = pd.concat(dfs, ignore_index=True)
-
-    # Transformar para formato longo (melt)
-    df_long = df_consolidado.melt(
-        id_vars=["modelo", "potencia_cv", "Linha"],
-        var_name="Carga",
-        value_name="Vazão (m³/h)"
-    )
-
-    # Limpeza segura dos nomes das colunas de carga (sem interpretar regex)
-    df_long["Carga"] = (df_long["Carga"]
-                        .str.replace("vazao_", "", regex=False)
-                        .str.replace("_mca", " mca", regex=False))
-
-    # Pivot para formato wide (cada carga vira uma coluna)
-    df_wide = df_long.pivot_table(
-        index=["modelo", "potencia_cv", "Linha"],
-        columns="Carga",
-        values="Vazão (m³/h)"
-    ).reset_index()
-
-    # Renomear colunas para exibição
-    df_wide = df_wide.rename(columns={
-        "modelo": "Modelo",
-        "potencia_cv": "Potência (cv)"
-    })
-
-    return df_wide
-
-
-def ordenar_colunas_pressao(colunas):
-    """
-    Função auxiliar para ordenar colunas de pressão de forma robusta.
-    Extrai o número inicial do nome (ex: '2 mca' -> 2.0) e usa como chave.
-    Colunas que não começam com número vão para o final.
+    Carrega os dados consolidados de todos os bancos de bombas (com a coluna
+    'Linha'), a partir do catálogo colunar. Colunas de pressão já vêm em ordem
+    numérica. Tabela, seleção, índice de curvas e ponto de operação leem o
+    mesmo CATALOGO_BOMBAS. O cache é indexado pelo hash de `modules/data.py`:
+    quando o arquivo muda, o Streamlit reimporta os módulos alterados (e com
+    eles o catálogo) e a tabela em cache não sobrevive ao catálogo antigo.
     """
+    return _carregar_dados_bombas(hash_fonte_catalogo())
 
-    def extrair_numero(col):
-        match = re.search(r"^(\d+(?:\.\d+)?)", str(col))
-        return float(match.group(1)) if match else float('inf')
 
-    return sorted(colunas, key=extrair_numero)
+@st.cache_data(show_spinner=False)
+def _carregar_dados_bombas(hash_dados: str) -> pd.DataFrame:
+    return CATALOGO_BOMBAS.para_dataframe()
 
 
 @track_access("database_equipamentos")
@@ -178,29 +123,41 @@ def run() -> None:
 
             # ===== VERIFICAÇÃO DO PONTO DE FUNCIONAMENTO =====
             verificar_ponto = st.checkbox("Verificação do ponto de funcionamento da MB")
-            curva_instalacao: Optional[Callable[[float], float]] = None
+            curva_instalacao: Optional[CurvaSistema] = None
 
             if verificar_ponto:
-                st.markdown("**Insira os coeficientes da Curva do Sistema**")
-                st.markdown("Equação: $H = A \\cdot Q^2 + B \\cdot Q + C$")
+                curva_salva: Optional[CurvaSistema] = st.session_state.get("curva_sistema")
+                usar_salva = False
+                if curva_salva is not None:
+                    usar_salva = st.checkbox(
+                        "Usar curva do módulo Perda de carga",
+                        value=True,
+                        help=curva_salva.descricao or None
+                    )
+
+                if usar_salva:
+                    curva_instalacao = curva_salva
+                    st.markdown(f"$H = {curva_salva.A:.6f} \\cdot Q^2 + {curva_salva.B:.4f} \\cdot Q + {curva_salva.C:.4f}$")
+                else:
+                    st.markdown("**Insira os coeficientes da Curva do Sistema**")
+                    st.markdown("Equação: $H = A \\cdot Q^2 + B \\cdot Q + C$")
 
-                col_coef1, col_coef2, col_coef3 = st.columns(3)
-                with col_coef1:
-                    coef_a = st.number_input("Coeficiente A", value=0.0023, format="%.6f", step=0.0001)
-                with col_coef2:
-                    coef_b = st.number_input("Coeficiente B", value=0.0, format="%.4f")
-                with col_coef3:
-                    coef_c = st.number_input("Coeficiente C", value=0.0, format="%.4f")
+                    col_coef1, col_coef2, col_coef3 = st.columns(3)
+                    with col_coef1:
+                        coef_a = st.number_input("Coeficiente A", value=0.0023, format="%.6f", step=0.0001)
+                    with col_coef2:
+                        coef_b = st.number_input("Coeficiente B", value=0.0, format="%.4f")
+                    with col_coef3:
+                        coef_c = st.number_input("Coeficiente C", value=0.0, format="%.4f")
 
-                curva_instalacao = lambda Q: coef_a * (Q ** 2) + coef_b * Q + coef_c
+                    curva_instalacao = CurvaSistema(coef_a, coef_b, coef_c)
 
         with cols[1]:
             # Dados do modelo selecionado
             df_filtrado = df_bombas_filtrado[df_bombas_filtrado["Modelo"] == modelo_selecionado]
 
-            # Identificar todas as colunas de pressão (usadas no gráfico)
-            colunas_pressao = df_filtrado.columns[3:]  # Ignora Modelo, Potência, Linha
-            colunas_ordenadas = ordenar_colunas_pressao(colunas_pressao)
+            # Colunas de pressão (já em ordem numérica; ignora Modelo, Potência, Linha)
+            colunas_ordenadas = list(df_filtrado.columns[3:])
 
             # --- Filtrar colunas para exibição na tabela conforme regra ---
             def coluna_deve_ser_exibida(nome_coluna, linha):
@@ -208,14 +165,14 @@ def run() -> None:
                 # Se for "Todas as Linhas" ou linha Jacuzzi, exibe todas
                 if linha == "Todas as Linhas" or "Jacuzzi" in linha:
                     return True
-                # Extrair o número da coluna
-                match = re.search(r"^(\d+(?:\.\d+)?)", nome_coluna)
-                if match:
-                    valor = float(match.group(1))
-                    # Verificar se é múltiplo de 2 (considerando inteiros)
-                    # Usamos uma tolerância para evitar problemas de ponto flutuante
-                    return abs(valor % 2) < 1e-9
-                return False  # se não conseguir extrair, não exibe
+                # Extrair o número da coluna ('N mca')
+                try:
+                    valor = float(nome_coluna.split()[0])
+                except (IndexError, ValueError):
+                    return False  # se não conseguir extrair, não exibe
+                # Verificar se é múltiplo de 2 (considerando inteiros)
+                # Usamos uma tolerância para evitar problemas de ponto flutuante
+                return abs(valor % 2) < 1e-9
 
             # Aplicar filtro
             colunas_exibir = [col for col in colunas_ordenadas
@@ -234,39 +191,31 @@ def run() -> None:
                 }
             )
 
-            # Extrair pontos (vazão, pressão) para o gráfico (usando TODAS as colunas)
-            pontos: List[Tuple[float, float]] = []
-            for coluna in colunas_pressao:  # usa todas, não apenas as exibidas
-                valor = df_filtrado[coluna].iloc[0]
-                if pd.notna(valor):
-                    try:
-                        pressao = float(coluna.split()[0])
-                        vazao = float(valor)
-                        pontos.append((vazao, pressao))
-                    except (ValueError, IndexError):
-                        continue
-
-            if len(pontos) >= 2:
+            # Pontos (vazão, pressão) para o gráfico, lidos do catálogo colunar (todas as pressões).
+            # O catálogo os devolve por pressão crescente; o gráfico e np.interp precisam da vazão crescente
+            vazoes, pressoes = CATALOGO_BOMBAS.pontos(CATALOGO_BOMBAS.indice(modelo_selecionado))
+            ordem = np.argsort(vazoes, kind="stable")
+            vazoes, pressoes = vazoes[ordem], pressoes[ordem]
+
+            if vazoes.size >= 2:
                 q_point: Optional[float] = None
                 h_point: Optional[float] = None
-                pontos_ordenados = sorted(pontos, key=lambda x: x[0])
-                vazoes = np.array([p[0] for p in pontos_ordenados])
-                pressoes = np.array([p[1] for p in pontos_ordenados])
 
                 try:
-                    # Ajuste com PCHIP
-                    vazoes_interp, pressoes_interp, _ = ajustar_curva_pchip(vazoes, pressoes)
+                    # Curva PCHIP pré-compilada (compartilhada entre sessões)
+                    curva_bomba = REGISTRO_CURVAS.obter(modelo_selecionado, vazoes, pressoes)
+                    vazoes_interp, pressoes_interp, pchip = (curva_bomba.x_interp,
+                                                             curva_bomba.y_interp,
+                                                             curva_bomba.pchip)
 
                     pressoes_sistema = []
                     anotacoes = []
                     shapes = []
 
-                    if verificar_ponto and curva_instalacao:
+                    if verificar_ponto and curva_instalacao is not None:
                         try:
-                            pressoes_sistema = [curva_instalacao(q) for q in vazoes_interp]
-                            pontos_interseccao = encontrar_interseccao_curvas(
-                                vazoes_interp, pressoes_interp, curva_instalacao
-                            )
+                            pressoes_sistema = curva_instalacao(vazoes_interp)
+                            pontos_interseccao = encontrar_interseccao_pchip(pchip, curva_instalacao)
 
                             for q, h in pontos_interseccao:
                                 q_point = q
@@ -294,7 +243,7 @@ def run() -> None:
                     # Criar gráfico
                     fig = go.Figure()
 
-                    if verificar_ponto and pressoes_sistema:
+                    if verificar_ponto and len(pressoes_sistema):
                         fig.add_trace(go.Scatter(
                             x=vazoes_interp,
                             y=pressoes_sistema,
@@ -376,6 +325,106 @@ def run() -> None:
         - 'None' indica valor não especificado pelo fabricante
         """)
 
+    # ========== BUSCA POR PONTO DE TRABALHO ==========
+    with st.expander("Busca por ponto de trabalho", expanded=False):
+        exibir_busca_ponto_trabalho()
+
+
+def exibir_busca_ponto_trabalho() -> None:
+    """
+    Lista, para cada ponto de trabalho (Q, H) informado, todas as motobombas do
+    catálogo cuja curva passa acima dele, e sobrepõe as curvas candidatas.
+    """
+    st.subheader("Motobombas que atendem os pontos de trabalho")
+    st.caption("Informe um ou mais pontos (vazão, pressão). A busca usa as curvas de todas "
+               "as motobombas do catálogo, em qualquer pressão dentro da faixa de cada curva.")
+
+    df_pontos = st.data_editor(
+        pd.DataFrame({"Vazão (m³/h)": [10.0], "Pressão (mca)": [8.0]}),
+        num_rows="dynamic",
+        use_container_width=True,
+        key="pontos_trabalho"
+    ).dropna()
+
+    if df_pontos.empty:
+        st.info("Adicione ao menos um ponto de trabalho.")
+        return
+
+    Q = df_pontos["Vazão (m³/h)"].to_numpy(dtype=float)
+    H = df_pontos["Pressão (mca)"].to_numpy(dtype=float)
+    candidatos = obter_indice_curvas().consultar(Q, H)
+
+    rotulos = [f"P{k + 1}: {q:g} m³/h @ {h:g} mca" for k, (q, h) in enumerate(zip(Q, H))]
+    st.dataframe(pd.DataFrame({
+        "Ponto": rotulos,
+        "Motobombas que atendem": [c.size for c in candidatos],
+        "Menor potência": [f"{CATALOGO_BOMBAS.modelos[c[0]]} ({CATALOGO_BOMBAS.potencias[c[0]]:g} cv)"
+                           if c.size else "—" for c in candidatos],
+    }), hide_index=True, use_container_width=True)
+
+    k = rotulos.index(st.selectbox("Curvas candidatas do ponto:", options=rotulos))
+    if not candidatos[k].size:
+        st.warning("Nenhuma motobomba do catálogo atende este ponto.")
+        return
+
+    fig = go.Figure()
+    curvas = []
+    for i in candidatos[k]:
+        curva = obter_curva_bomba(CATALOGO_BOMBAS.registro(i))
+        if curva is None:
+            continue
+        curvas.append((i, curva))
+        fig.add_trace(go.Scatter(
+            x=curva.x_interp,
+            y=curva.y_interp,
+            mode='lines',
+            name=f"{CATALOGO_BOMBAS.modelos[i]} ({CATALOGO_BOMBAS.potencias[i]:g} cv)",
+            line=dict(width=1.5)
+        ))
+
+    # Pontos de operação de todas as candidatas com a curva do módulo Perda de
+    # carga, numa única chamada sobre os trechos de todas as curvas
+    curva_sistema: Optional[CurvaSistema] = st.session_state.get("curva_sistema")
+    if curva_sistema is not None and curvas:
+        q_max = max(curva.x_interp[-1] for _, curva in curvas)
+        q_sis = np.linspace(0.0, q_max, 100)
+        fig.add_trace(go.Scatter(
+            x=q_sis,
+            y=curva_sistema(q_sis),
+            mode='lines',
+            name='Curva da Instalação',
+            line=dict(color='green', width=2, dash='dash')
+        ))
+        trechos = TrechosPchip.de_curvas([curva.pchip for _, curva in curvas])
+        operacao = [(i, q, h) for (i, _), pontos in zip(curvas, encontrar_interseccoes_pchip(trechos, curva_sistema))
+                    for q, h in pontos]
+        if operacao:
+            fig.add_trace(go.Scatter(
+                x=[q for _, q, _ in operacao],
+                y=[h for _, _, h in operacao],
+                mode='markers',
+                name='Pontos de operação',
+                text=[CATALOGO_BOMBAS.modelos[i] for i, _, _ in operacao],
+                marker=dict(color='black', size=9, symbol='circle-open')
+            ))
+    fig.add_trace(go.Scatter(
+        x=Q,
+        y=H,
+        mode='markers+text',
+        name='Pontos de trabalho',
+        text=[f"P{n + 1}" for n in range(Q.size)],
+        textposition='top center',
+        marker=dict(color=['red' if n == k else 'gray' for n in range(Q.size)], size=11, symbol='x')
+    ))
+    fig.update_layout(
+        title=f'Curvas que atendem {rotulos[k]}',
+        xaxis_title='Vazão (m³/h)',
+        yaxis_title='Pressão (m.c.a.)',
+        showlegend=True,
+        template='plotly_white'
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
 
 if __name__ == "__main__":
     run()
\ No newline at end of file
@@ -9,65 +9,220 @@ hidromassagem e aquecimento, exibindo resultados consolidados.
 NÃO modifica os módulos existentes — atua como adaptador.
 """
 
+import hashlib
+import io
 import json
 import math
 import streamlit as st
 import pandas as pd
 from typing import Optional, Dict, Any, List, Tuple
 from tracking import track_access
-from modules.data import BANCO_FILTROS, BANCO_BOMBAS
+from modules.data import BANCO_FILTROS
+from modules.catalogo_bombas import selecionar_bomba
 from modules.aquecimento import calcular_dimensionamento as calc_aquecimento
+from modules.cache_conteudo import CacheLRU
+from modules.grafo_calculo import GrafoCalculo
+from modules.esquema_exportacao import validar_raiz, validar_tanque
+
+try:
+    import ijson  # leitura incremental de exportações grandes (opcional)
+    _ERROS_JSON = (json.JSONDecodeError, ijson.JSONError)
+except ImportError:
+    ijson = None
+    _ERROS_JSON = (json.JSONDecodeError,)
 
 
 # ─────────────────────────────────────────────────────────────────────────────
 # 1. VALIDAÇÃO E PARSING DO JSON
 # ─────────────────────────────────────────────────────────────────────────────
 
-def parse_json(raw_data: bytes) -> Tuple[Optional[dict], List[str]]:
+# Erros listados por arquivo (os demais são resumidos numa linha)
+MAX_ERROS = 50
+
+# Chaves que o dimensionamento não usa e que dominam o tamanho das exportações
+# (malhas detalhadas chegam a dezenas de MB)
+CHAVES_DESCARTADAS = frozenset({"vertices"})
+
+
+def _numero(valor) -> float:
+    return valor if isinstance(valor, (int, float)) else 0.0
+
+
+def _validar_tanque(i: int, tank: Any, errors: List[str]) -> None:
+    """
+    Valida um tanque pelo esquema da exportação e completa os totais ausentes
+    com a soma das regiões.
+    """
+    validar_tanque(tank, f"$.tanks[{i}]", errors)
+    if not isinstance(tank, dict) or not isinstance(tank.get("regions"), list):
+        return
+
+    area = volume = 0.0
+    for region in tank["regions"]:
+        if isinstance(region, dict):
+            area += _numero(region.get("area_m2"))
+            volume += _numero(region.get("volume_m3"))
+
+    tank.setdefault("total_area_m2", round(area, 2))
+    tank.setdefault("total_volume_m3", round(volume, 2))
+
+
+def _montar_documento(eventos, ao_fechar_tanque, descartar) -> Any:
+    """
+    Monta o documento a partir dos eventos do ijson (prefixo, evento, valor).
+
+    Valores das chaves em `descartar` são consumidos sem serem materializados e
+    `ao_fechar_tanque(i, tanque)` é chamado assim que cada item de "tanks" termina.
+    """
+    raiz = None
+    pilha = []            # [container, chave pendente] dos objetos/listas abertos
+    pular_valor = False   # próximo valor pertence a uma chave descartada
+
+    eventos = iter(eventos)
+    for prefixo, evento, valor in eventos:
+        if evento == "map_key":
+            pilha[-1][1] = valor
+            pular_valor = valor in descartar
+            continue
+        if pular_valor:
+            pular_valor = False
+            if evento in ("start_map", "start_array"):
+                # Consome o valor descartado inteiro no laço interno
+                profundidade = 1
+                for _, evento, _ in eventos:
+                    if evento in ("start_map", "start_array"):
+                        profundidade += 1
+                    elif evento in ("end_map", "end_array"):
+                        profundidade -= 1
+                        if not profundidade:
+                            break
+            continue
+
+        if evento in ("end_map", "end_array"):
+            valor = pilha.pop()[0]
+        else:
+            if evento in ("start_map", "start_array"):
+                valor = {} if evento == "start_map" else []
+            if not pilha:
+                raiz = valor
+            elif isinstance(pilha[-1][0], list):
+                pilha[-1][0].append(valor)
+            else:
+                pilha[-1][0][pilha[-1][1]] = valor
+            if evento in ("start_map", "start_array"):
+                pilha.append([valor, None])
+                continue
+
+        if prefixo == "tanks.item" and len(pilha) == 2 and isinstance(pilha[1][0], list):
+            ao_fechar_tanque(len(pilha[1][0]) - 1, valor)
+
+    return raiz
+
+
+def _carregar_json(raw_data, descartar, errors_tanques: List[str]) -> Any:
+    """
+    Lê o JSON sem materializar as chaves em `descartar`. Com ijson, a leitura é
+    incremental e cada tanque é validado ao terminar; sem ijson, o documento é
+    decodificado de uma vez e os vértices são descartados objeto a objeto.
+    """
+    def ao_fechar_tanque(i, tank):
+        _validar_tanque(i, tank, errors_tanques)
+
+    if ijson is not None:
+        fonte = io.BytesIO(raw_data) if isinstance(raw_data, (bytes, bytearray)) else raw_data
+        return _montar_documento(ijson.parse(fonte, use_float=True), ao_fechar_tanque, descartar)
+
+    def sem_descartadas(obj):
+        for chave in descartar & obj.keys():
+            del obj[chave]
+        return obj
+
+    hook = sem_descartadas if descartar else None
+    if isinstance(raw_data, (bytes, bytearray, str)):
+        data = json.loads(raw_data, object_hook=hook)
+    else:
+        data = json.load(raw_data, object_hook=hook)
+    if isinstance(data, dict) and isinstance(data.get("tanks"), list):
+        for i, tank in enumerate(data["tanks"]):
+            ao_fechar_tanque(i, tank)
+    return data
+
+
+def parse_json(raw_data, incluir_vertices: bool = False) -> Tuple[Optional[dict], List[str]]:
     """
     Valida e parseia o JSON exportado pelo SketchUp.
 
+    Args:
+        raw_data: Conteúdo (bytes) ou arquivo binário aberto (ex.: upload do Streamlit).
+        incluir_vertices: Mantém as listas de vértices das regiões (não usadas
+            no dimensionamento; descartadas por padrão).
+
+    Tanques sem 'total_area_m2'/'total_volume_m3' recebem a soma das regiões.
+
     Returns:
         (parsed_dict, errors) — se errors não estiver vazio, parsed_dict é None
     """
     errors = []
+    errors_tanques = []
+    descartar = frozenset() if incluir_vertices else CHAVES_DESCARTADAS
 
     try:
-        data = json.loads(raw_data)
-    except json.JSONDecodeError as e:
-        return None, [f"JSON inválido: {e}"]
-
-    # Validar estrutura mínima
-    if "meta" not in data:
-        errors.append("Campo 'meta' ausente no JSON.")
-    if "tanks" not in data:
-        errors.append("Campo 'tanks' ausente no JSON.")
-    elif not isinstance(data["tanks"], list) or len(data["tanks"]) == 0:
-        errors.append("'tanks' deve ser uma lista com pelo menos 1 tanque.")
+        data = _carregar_json(raw_data, descartar, errors_tanques)
+    except _ERROS_JSON as e:
+        # Mensagens do ijson trazem um trecho do texto nas linhas seguintes
+        mensagem = str(e).partition("\n")[0]
+        return None, [f"JSON inválido: {mensagem}"]
 
-    if errors:
-        return None, errors
-
-    # Validar cada tanque
-    for i, tank in enumerate(data["tanks"]):
-        tank_id = tank.get("id", f"tanque_{i}")
-        if "regions" not in tank:
-            errors.append(f"Tanque '{tank_id}': campo 'regions' ausente.")
-            continue
-        for j, region in enumerate(tank.get("regions", [])):
-            if "label" not in region:
-                errors.append(f"Tanque '{tank_id}', região {j}: campo 'label' ausente.")
-            if "area_m2" not in region:
-                errors.append(f"Tanque '{tank_id}', região {j}: campo 'area_m2' ausente.")
+    # Raiz pelo esquema (os tanques já foram validados durante a leitura)
+    validar_raiz(data, "$", errors)
+    errors += errors_tanques
 
     if errors:
+        if len(errors) > MAX_ERROS:
+            errors = errors[:MAX_ERROS] + [f"... e mais {len(errors) - MAX_ERROS} erro(s)."]
         return None, errors
 
     return data, []
 
 
 # ─────────────────────────────────────────────────────────────────────────────
-# 2. DIMENSIONAMENTO — FILTRAGEM
+# 2. AGREGAÇÕES DO PROJETO
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _totais_tanques(parsed: dict) -> dict:
+    """Área e volume somados de todos os tanques."""
+    return {
+        "area_total_m2": sum(t.get("total_area_m2", 0.0) for t in parsed["tanks"]),
+        "volume_total_m3": sum(t.get("total_volume_m3", 0.0) for t in parsed["tanks"]),
+    }
+
+
+def _agregar_arestas(parsed: dict) -> dict:
+    """Comprimento total das arestas de borda infinita de todos os tanques."""
+    comprimentos = [
+        edge.get("length_m", 0.0)
+        for tank in parsed["tanks"]
+        for edge in tank.get("edges", [])
+        if edge.get("label") == "borda_infinita"
+    ]
+    return {
+        "tem_borda_infinita": bool(comprimentos),
+        "comprimento_borda_m": sum(comprimentos),
+    }
+
+
+def _has_spa(parsed: dict) -> bool:
+    """Verifica se existem regiões de spa (banco/piso_spa) no JSON."""
+    for tank in parsed.get("tanks", []):
+        for region in tank.get("regions", []):
+            label = region.get("label", "")
+            if label.startswith("banco") or label.startswith("piso_spa"):
+                return True
+    return False
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 3. DIMENSIONAMENTO — FILTRAGEM
 # ─────────────────────────────────────────────────────────────────────────────
 
 def _dimensionar_filtragem(parsed: dict) -> dict:
@@ -75,10 +230,11 @@ def _dimensionar_filtragem(parsed: dict) -> dict:
     Soma total_volume_m3 de todos os tanques e seleciona filtro.
     Replica lógica de filtragem.py (linhas 42-46).
     """
-    volume_total = sum(
-        tank.get("total_volume_m3", 0.0) for tank in parsed["tanks"]
-    )
+    return _filtragem_por_volume(_totais_tanques(parsed)["volume_total_m3"])
 
+
+def _filtragem_por_volume(volume_total: float) -> dict:
+    """Seleciona o menor filtro FM que atende ao volume total (m³)."""
     filtro_selecionado = None
     for filtro in sorted(BANCO_FILTROS, key=lambda x: x["volume_6h"]):
         if filtro["volume_6h"] >= volume_total:
@@ -95,7 +251,7 @@ def _dimensionar_filtragem(parsed: dict) -> dict:
 
 
 # ─────────────────────────────────────────────────────────────────────────────
-# 3. DIMENSIONAMENTO — TRANSBORDO
+# 4. DIMENSIONAMENTO — TRANSBORDO
 # ─────────────────────────────────────────────────────────────────────────────
 
 def _dimensionar_transbordo(
@@ -105,23 +261,25 @@ def _dimensionar_transbordo(
 ) -> Optional[dict]:
     """
     Busca edges com label 'borda_infinita' e calcula vazão necessária.
-    Replica lógica de transbordo.py (linhas 74-85).
+    Replica lógica de transbordo.py (seleção via `selecionar_bomba`).
     """
-    # Coletar borda infinita de todos os tanques
-    comprimento_total = 0.0
-    area_piscina_total = 0.0
-    tem_borda = False
+    arestas = _agregar_arestas(parsed)
+    if not arestas["tem_borda_infinita"]:
+        return None  # Sem borda infinita, não dimensionar transbordo
 
-    for tank in parsed["tanks"]:
-        for edge in tank.get("edges", []):
-            if edge.get("label") == "borda_infinita":
-                comprimento_total += edge.get("length_m", 0.0)
-                tem_borda = True
-        area_piscina_total += tank.get("total_area_m2", 0.0)
+    return _transbordo_por_borda(
+        arestas["comprimento_borda_m"], _totais_tanques(parsed)["area_total_m2"],
+        altura_lamina_mm, pressao_mca,
+    )
 
-    if not tem_borda:
-        return None  # Sem borda infinita, não dimensionar transbordo
 
+def _transbordo_por_borda(
+    comprimento_total: float,
+    area_piscina_total: float,
+    altura_lamina_mm: float,
+    pressao_mca: int
+) -> dict:
+    """Vazão de transbordo, volume do cocho e bomba para a borda informada."""
     # Fórmula de transbordo (replicada de transbordo.py)
     h = altura_lamina_mm / 1000.0
     vazao_necessaria = 1608 * h * comprimento_total * math.sqrt(2 * 9.81 * h)
@@ -129,13 +287,7 @@ def _dimensionar_transbordo(
     area_lamina_m2 = h * comprimento_total
 
     # Seleção de bomba
-    bomba_selecionada = None
-    for bomba in BANCO_BOMBAS:
-        key = f"vazao_{pressao_mca}_mca"
-        vazao_pump = bomba.get(key)
-        if vazao_pump is not None and vazao_pump >= vazao_necessaria:
-            bomba_selecionada = bomba
-            break
+    bomba_selecionada = selecionar_bomba(vazao_necessaria, pressao_mca)
 
     return {
         "comprimento_borda_m": round(comprimento_total, 2),
@@ -151,7 +303,7 @@ def _dimensionar_transbordo(
 
 
 # ─────────────────────────────────────────────────────────────────────────────
-# 4. DIMENSIONAMENTO — HIDROMASSAGEM
+# 5. DIMENSIONAMENTO — HIDROMASSAGEM
 # ─────────────────────────────────────────────────────────────────────────────
 
 def _dimensionar_hidromassagem(
@@ -162,34 +314,26 @@ def _dimensionar_hidromassagem(
 ) -> Optional[dict]:
     """
     Identifica tanques com regiões 'banco' ou 'piso_spa' e dimensiona
-    hidromassagem. Replica lógica de hidromassagem.py (linhas 95-106).
+    hidromassagem. Replica lógica de hidromassagem.py (seleção via `selecionar_bomba`).
     """
-    # Verificar se há regiões de spa
-    tem_spa = False
-    for tank in parsed["tanks"]:
-        for region in tank.get("regions", []):
-            label_base = region.get("label", "").split("_")[0] if "_" in region.get("label", "") else region.get("label", "")
-            if label_base in ("banco", "piso_spa") or region.get("label", "").startswith("banco") or region.get("label", "").startswith("piso_spa"):
-                tem_spa = True
-                break
-        if tem_spa:
-            break
-
-    if not tem_spa:
+    if not _has_spa(parsed):
         return None  # Sem spa, não dimensionar hidromassagem
 
+    return _hidromassagem_por_dispositivos(tipo_dispositivo, quantidade, pressao_mca)
+
+
+def _hidromassagem_por_dispositivos(
+    tipo_dispositivo: str,
+    quantidade: int,
+    pressao_mca: int
+) -> dict:
+    """Vazão dos dispositivos de hidromassagem e bomba."""
     # Cálculo (replicado de hidromassagem.py)
     vazao_por_dispositivo = 4.5 if tipo_dispositivo == "SODRAMAR" else 3.3
     vazao_necessaria = quantidade * vazao_por_dispositivo
 
     # Seleção de bomba
-    bomba_selecionada = None
-    for bomba in sorted(BANCO_BOMBAS, key=lambda x: x['potencia_cv']):
-        chave_vazao = f'vazao_{pressao_mca}_mca'
-        vazao_bomba = bomba.get(chave_vazao)
-        if vazao_bomba and vazao_bomba >= vazao_necessaria:
-            bomba_selecionada = bomba
-            break
+    bomba_selecionada = selecionar_bomba(vazao_necessaria, pressao_mca)
 
     return {
         "tipo_dispositivo": tipo_dispositivo,
@@ -203,7 +347,7 @@ def _dimensionar_hidromassagem(
 
 
 # ─────────────────────────────────────────────────────────────────────────────
-# 5. DIMENSIONAMENTO — AQUECIMENTO
+# 6. DIMENSIONAMENTO — AQUECIMENTO
 # ─────────────────────────────────────────────────────────────────────────────
 
 def _dimensionar_aquecimento(parsed: dict, inputs_manual: dict) -> dict:
@@ -211,9 +355,12 @@ def _dimensionar_aquecimento(parsed: dict, inputs_manual: dict) -> dict:
     Calcula dimensões a partir do JSON e passa para
     aquecimento.calcular_dimensionamento() com os inputs manuais.
     """
-    # Calcular área e volume totais (todos os tanques)
-    area_total = sum(t.get("total_area_m2", 0.0) for t in parsed["tanks"])
-    volume_total = sum(t.get("total_volume_m3", 0.0) for t in parsed["tanks"])
+    totais = _totais_tanques(parsed)
+    return _aquecimento_por_totais(totais["area_total_m2"], totais["volume_total_m3"], inputs_manual)
+
+
+def _aquecimento_por_totais(area_total: float, volume_total: float, inputs_manual: dict) -> dict:
+    """Aquecimento da piscina equivalente à área e ao volume totais."""
 
     # Estimar largura e comprimento a partir da área (quadrado equivalente)
     # A função de aquecimento espera largura × comprimento
@@ -246,7 +393,7 @@ def _dimensionar_aquecimento(parsed: dict, inputs_manual: dict) -> dict:
 
 
 # ─────────────────────────────────────────────────────────────────────────────
-# 6. TABELA RESUMO
+# 7. TABELA RESUMO
 # ─────────────────────────────────────────────────────────────────────────────
 
 def _build_summary_table(parsed: dict) -> pd.DataFrame:
@@ -277,7 +424,75 @@ def _build_summary_table(parsed: dict) -> pd.DataFrame:
 
 
 # ─────────────────────────────────────────────────────────────────────────────
-# 7. RENDERIZAÇÃO DE RESULTADOS
+# 8. GRAFO DE CÁLCULO (recomputação incremental)
+# ─────────────────────────────────────────────────────────────────────────────
+
+# Valores dos nós, por assinatura (hash do upload + entradas de cada nó).
+# Compartilhado entre sessões.
+CACHE_PROJETOS = CacheLRU(max_itens=512, max_bytes=64 * 2 ** 20)
+
+
+def hash_arquivo(arquivo) -> str:
+    """
+    SHA-256 do conteúdo enviado (bytes ou arquivo em memória, sem copiá-lo).
+    """
+    if isinstance(arquivo, (bytes, bytearray)):
+        return hashlib.sha256(arquivo).hexdigest()
+    with arquivo.getbuffer() as dados:
+        return hashlib.sha256(dados).hexdigest()
+
+
+def _ler_arquivo(arquivo) -> Tuple[Optional[dict], List[str]]:
+    arquivo.seek(0)
+    return parse_json(arquivo)
+
+
+def _montar_grafo() -> GrafoCalculo:
+    """
+    Nós do dimensionamento completo. Entradas externas: arquivo, altura_lamina_mm,
+    pressao_transbordo, tipo_dispositivo, qtd_dispositivos, pressao_hidro e
+    inputs_aquecimento. Mudar só a pressão do spa reexecuta só a hidromassagem;
+    um arquivo novo com os mesmos totais reaproveita filtragem e aquecimento.
+    """
+    g = GrafoCalculo(CACHE_PROJETOS, nome="dimensionamento_completo")
+    g.no("leitura", _ler_arquivo, ("arquivo",))
+    g.no("projeto", lambda leitura: leitura[0], ("leitura",), armazenar=False)
+    g.no("resumo", _build_summary_table, ("projeto",))
+    g.no("totais", _totais_tanques, ("projeto",), por_valor=True)
+    g.no("arestas", _agregar_arestas, ("projeto",), por_valor=True)
+    g.no("spa", _has_spa, ("projeto",), por_valor=True)
+    g.no("filtragem", lambda totais: _filtragem_por_volume(totais["volume_total_m3"]), ("totais",))
+    g.no(
+        "transbordo",
+        lambda arestas, totais, altura, pressao: _transbordo_por_borda(
+            arestas["comprimento_borda_m"], totais["area_total_m2"], altura, pressao
+        ) if arestas["tem_borda_infinita"] else None,
+        ("arestas", "totais", "altura_lamina_mm", "pressao_transbordo"),
+    )
+    g.no(
+        "hidromassagem",
+        lambda spa, tipo, quantidade, pressao: _hidromassagem_por_dispositivos(
+            tipo, quantidade, pressao
+        ) if spa else None,
+        ("spa", "tipo_dispositivo", "qtd_dispositivos", "pressao_hidro"),
+    )
+    g.no(
+        "aquecimento",
+        lambda totais, inputs: _aquecimento_por_totais(
+            totais["area_total_m2"], totais["volume_total_m3"], inputs
+        ),
+        ("totais", "inputs_aquecimento"),
+    )
+    return g
+
+
+GRAFO_DIMENSIONAMENTO = _montar_grafo()
+
+SUBSISTEMAS = ("filtragem", "transbordo", "hidromassagem", "aquecimento")
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 9. RENDERIZAÇÃO DE RESULTADOS
 # ─────────────────────────────────────────────────────────────────────────────
 
 def _render_filtragem(result: dict):
@@ -405,28 +620,31 @@ def _render_aquecimento(result: dict):
         g2.metric("Economia vs gás", f"R$ {result['economia_mensal']:,.2f}")
 
 
-# ─────────────────────────────────────────────────────────────────────────────
-# 8. INTERFACE PRINCIPAL
-# ─────────────────────────────────────────────────────────────────────────────
-
-def _has_borda_infinita(parsed: dict) -> bool:
-    """Verifica se existe borda infinita no JSON."""
-    for tank in parsed.get("tanks", []):
-        for edge in tank.get("edges", []):
-            if edge.get("label") == "borda_infinita":
-                return True
-    return False
+def _render_desempenho(grafo: GrafoCalculo, registros: List[dict]):
+    """Tempos e acertos de cache dos nós avaliados nesta execução da página."""
+    with st.expander("⏱️ Desempenho do cálculo"):
+        if registros:
+            df = pd.DataFrame(registros)
+            st.dataframe(
+                pd.DataFrame({
+                    "Nó": df["no"],
+                    "Origem": df["acerto"].map({True: "cache", False: "calculado"}),
+                    "Tempo (ms)": df["tempo_ms"].round(2),
+                }),
+                use_container_width=True, hide_index=True,
+            )
+        st.caption("Acumulado desde o início do servidor")
+        st.dataframe(grafo.estatisticas().round(2), use_container_width=True, hide_index=True)
+        cache = grafo.cache.estatisticas()
+        st.caption(
+            f"Cache: {cache['itens']} itens, {cache['bytes'] / 2 ** 20:.1f} MiB, "
+            f"{cache['acertos']} acertos / {cache['falhas']} falhas."
+        )
 
 
-def _has_spa(parsed: dict) -> bool:
-    """Verifica se existem regiões de spa (banco/piso_spa) no JSON."""
-    for tank in parsed.get("tanks", []):
-        for region in tank.get("regions", []):
-            label = region.get("label", "")
-            if label.startswith("banco") or label.startswith("piso_spa"):
-                return True
-    return False
-
+# ─────────────────────────────────────────────────────────────────────────────
+# 10. INTERFACE PRINCIPAL
+# ─────────────────────────────────────────────────────────────────────────────
 
 @track_access("dimensionamento_completo")
 def run() -> None:
@@ -454,7 +672,15 @@ def run() -> None:
         return
 
     # ─── Parsing e validação ────────────────────────────────────────────────
-    parsed, errors = parse_json(uploaded.read())
+    # Só os nós cujas entradas mudaram são executados; os demais vêm do cache
+    grafo = GRAFO_DIMENSIONAMENTO
+    externas = {"arquivo": uploaded}
+    assinaturas = {"arquivo": hash_arquivo(uploaded)}
+    registros = []
+
+    valores, reg = grafo.avaliar(["leitura"], externas, assinaturas)
+    registros += reg
+    parsed, errors = valores["leitura"]
 
     if errors:
         st.error("❌ Erros de validação no JSON:")
@@ -462,6 +688,10 @@ def run() -> None:
             st.write(f"- {err}")
         return
 
+    valores, reg = grafo.avaliar(["resumo", "arestas", "spa"], externas, assinaturas)
+    registros += reg
+    tem_borda, tem_spa = valores["arestas"]["tem_borda_infinita"], valores["spa"]
+
     # ─── Preview / Tabela resumo ────────────────────────────────────────────
     meta = parsed.get("meta", {})
     st.success(
@@ -470,7 +700,7 @@ def run() -> None:
     )
 
     with st.expander("📊 Tabela Resumo — Regiões e Volumes", expanded=True):
-        df = _build_summary_table(parsed)
+        df = valores["resumo"]
         st.dataframe(df, use_container_width=True, hide_index=True)
 
     st.markdown("---")
@@ -479,8 +709,8 @@ def run() -> None:
     st.subheader("⚙️ Parâmetros complementares")
     st.caption("Dados que não vêm do modelo 3D e precisam ser informados manualmente.")
 
-    with st.expander("Transbordo", expanded=_has_borda_infinita(parsed)):
-        if _has_borda_infinita(parsed):
+    with st.expander("Transbordo", expanded=tem_borda):
+        if tem_borda:
             col_t1, col_t2 = st.columns(2)
             with col_t1:
                 altura_lamina_mm = st.number_input(
@@ -499,8 +729,8 @@ def run() -> None:
             altura_lamina_mm = 3.0
             pressao_transbordo = 6
 
-    with st.expander("Hidromassagem", expanded=_has_spa(parsed)):
-        if _has_spa(parsed):
+    with st.expander("Hidromassagem", expanded=tem_spa):
+        if tem_spa:
             col_h1, col_h2, col_h3 = st.columns(3)
             with col_h1:
                 tipo_dispositivo = st.selectbox(
@@ -580,40 +810,29 @@ def run() -> None:
     # ─── Botão calcular ─────────────────────────────────────────────────────
     if st.button("🚀 Calcular Dimensionamento Completo", type="primary", use_container_width=True):
         with st.spinner("Calculando todos os sistemas..."):
-
-            # Filtragem
-            res_filtragem = _dimensionar_filtragem(parsed)
-
-            # Transbordo
-            res_transbordo = _dimensionar_transbordo(
-                parsed, altura_lamina_mm, pressao_transbordo
-            )
-
-            # Hidromassagem
-            res_hidromassagem = _dimensionar_hidromassagem(
-                parsed, tipo_dispositivo, qtd_dispositivos, pressao_hidro
-            )
-
-            # Aquecimento
-            inputs_aq = {
-                "temp_agua": temp_agua,
-                "regiao": regiao_climatica,
-                "ambiente": ambiente,
-                "incidencia_solar": incidencia_solar,
-                "velocidade_vento": velocidade_vento,
-                "horas_capa": horas_capa,
-                "custo_kwh": custo_kwh,
-                "custo_gn_m3": custo_gn,
-            }
-            res_aquecimento = _dimensionar_aquecimento(parsed, inputs_aq)
+            # Subsistemas cujas entradas não mudaram vêm do cache
+            externas.update({
+                "altura_lamina_mm": altura_lamina_mm,
+                "pressao_transbordo": pressao_transbordo,
+                "tipo_dispositivo": tipo_dispositivo,
+                "qtd_dispositivos": qtd_dispositivos,
+                "pressao_hidro": pressao_hidro,
+                "inputs_aquecimento": {
+                    "temp_agua": temp_agua,
+                    "regiao": regiao_climatica,
+                    "ambiente": ambiente,
+                    "incidencia_solar": incidencia_solar,
+                    "velocidade_vento": velocidade_vento,
+                    "horas_capa": horas_capa,
+                    "custo_kwh": custo_kwh,
+                    "custo_gn_m3": custo_gn,
+                },
+            })
+            valores, reg = grafo.avaliar(SUBSISTEMAS, externas, assinaturas)
+            registros += reg
 
             # Armazenar no session_state
-            st.session_state["dc_resultados"] = {
-                "filtragem": res_filtragem,
-                "transbordo": res_transbordo,
-                "hidromassagem": res_hidromassagem,
-                "aquecimento": res_aquecimento,
-            }
+            st.session_state["dc_resultados"] = {nome: valores[nome] for nome in SUBSISTEMAS}
 
     # ─── Exibir resultados ──────────────────────────────────────────────────
     if "dc_resultados" in st.session_state:
@@ -635,6 +854,8 @@ def run() -> None:
 
         _render_aquecimento(results["aquecimento"])
 
+    _render_desempenho(grafo, registros)
+
 
 # Para compatibilidade com main_app.py
 if __name__ == "__main__":
@@ -0,0 +1,249 @@
+# modules/dimensionamento_lote.py
+"""
+Dimensionamento em lote, sem interface, de pastas de exportações do HidroAnnotator.
+
+Para cada JSON executa `parse_json` e os dimensionamentos de filtragem,
+transbordo, hidromassagem e aquecimento de `dimensionamento_completo`, em
+paralelo (um processo por núcleo), e grava uma tabela consolidada com uma
+linha por arquivo.
+
+Uso (a partir da raiz do repositório):
+    python -m modules.dimensionamento_lote projetos/ -o resultados.csv
+    python -m modules.dimensionamento_lote "arquivo/**/*.json" -o resultados.parquet --regiao 2
+"""
+
+import argparse
+import glob
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from modules.dimensionamento_completo import (
+    _dimensionar_aquecimento,
+    _dimensionar_filtragem,
+    _dimensionar_hidromassagem,
+    _dimensionar_transbordo,
+    parse_json,
+)
+
+# ==========================================
+# PARÂMETROS PADRÃO (mesmos da página)
+# ==========================================
+
+PARAMETROS_PADRAO = {
+    "altura_lamina_mm":   3.0,
+    "pressao_transbordo": 6,
+    "tipo_dispositivo":   "SODRAMAR",
+    "qtd_dispositivos":   4,
+    "pressao_hidro":      8,
+    "temp_agua":          30,
+    "regiao":             3,
+    "ambiente":           "A",
+    "incidencia_solar":   100,
+    "velocidade_vento":   1.5,
+    "horas_capa":         0,
+    "custo_kwh":          1.0,
+    "custo_gn_m3":        1.0,
+}
+
+_CHAVES_AQUECIMENTO = ("temp_agua", "regiao", "ambiente", "incidencia_solar",
+                       "velocidade_vento", "horas_capa", "custo_kwh", "custo_gn_m3")
+
+
+# ==========================================
+# DIMENSIONAMENTO DE UM ARQUIVO
+# ==========================================
+
+def _bomba(resultado, prefixo):
+    """Colunas de um resultado de transbordo/hidromassagem (None = sistema ausente)."""
+    if resultado is None:
+        return {}
+    bomba = resultado["bomba"] or {}
+    return {
+        f"{prefixo}_vazao_m3h":   resultado["vazao_necessaria_m3h"],
+        f"{prefixo}_pressao_mca": resultado["pressao_mca"],
+        f"{prefixo}_bomba":       bomba.get("modelo"),
+        f"{prefixo}_potencia_cv": bomba.get("potencia_cv"),
+        f"{prefixo}_erro":        resultado["erro"],
+    }
+
+
+def dimensionar_arquivo(caminho, parametros=None):
+    """
+    Dimensiona todos os sistemas de uma exportação.
+
+    Args:
+        caminho (str): Arquivo JSON do HidroAnnotator.
+        parametros (dict, optional): Entradas manuais (ver PARAMETROS_PADRAO).
+
+    Returns:
+        dict: Linha da tabela consolidada. Falhas de leitura/validação ou
+            exceções ficam na coluna "erro", sem interromper o lote.
+    """
+    p = {**PARAMETROS_PADRAO, **(parametros or {})}
+    linha = {"arquivo": caminho}
+    try:
+        with open(caminho, "rb") as f:
+            parsed, erros = parse_json(f)
+        if erros:
+            linha["erro"] = "; ".join(erros)
+            return linha
+
+        meta = parsed.get("meta", {})
+        filtragem = _dimensionar_filtragem(parsed)
+        transbordo = _dimensionar_transbordo(parsed, p["altura_lamina_mm"], p["pressao_transbordo"])
+        hidromassagem = _dimensionar_hidromassagem(
+            parsed, p["tipo_dispositivo"], p["qtd_dispositivos"], p["pressao_hidro"])
+        aquecimento = _dimensionar_aquecimento(parsed, {k: p[k] for k in _CHAVES_AQUECIMENTO})
+    except Exception as e:  # noqa: BLE001 — um arquivo ruim não derruba o lote
+        linha["erro"] = f"{type(e).__name__}: {e}"
+        return linha
+
+    filtro = filtragem["filtro"] or {}
+    linha.update({
+        "projeto":            meta.get("model_name"),
+        "data_exportacao":    meta.get("export_date"),
+        "erro":               None,
+        "num_tanques":        len(parsed["tanks"]),
+        "volume_total_m3":    filtragem["volume_total_m3"],
+        "filtro_modelo":      filtro.get("modelo"),
+        "filtro_motobomba":   filtro.get("modelo_motobomba"),
+        "filtragem_erro":     filtragem["erro"],
+    })
+    if transbordo is not None:
+        linha["transbordo_comprimento_borda_m"] = transbordo["comprimento_borda_m"]
+        linha["transbordo_volume_cocho_l"] = transbordo["volume_cocho_litros"]
+    linha.update(_bomba(transbordo, "transbordo"))
+    linha.update(_bomba(hidromassagem, "hidro"))
+    linha.update({
+        "aquecimento_area_m2":          aquecimento.get("area_total_m2"),
+        "aquecimento_energia_btu_h":    aquecimento.get("energia_btu_h"),
+        "aquecimento_modelo":           aquecimento.get("modelo"),
+        "aquecimento_capacidade_btu_h": aquecimento.get("capacidade_btu_h"),
+        "aquecimento_horas_inverno":    aquecimento.get("horas_inverno"),
+        "aquecimento_custo_mensal":     aquecimento.get("custo_medio_mensal"),
+        "aquecimento_economia_mensal":  aquecimento.get("economia_mensal"),
+        "aquecimento_erro":             aquecimento.get("erro"),
+    })
+    return linha
+
+
+def _dimensionar_tarefa(tarefa):
+    """Ponto de entrada dos processos do pool (precisa ser importável)."""
+    caminho, parametros = tarefa
+    return dimensionar_arquivo(caminho, parametros)
+
+
+# ==========================================
+# LOTE
+# ==========================================
+
+def listar_arquivos(entradas):
+    """
+    Expande pastas (recursivo, *.json) e padrões glob, sem repetições.
+
+    Args:
+        entradas (iterable): Pastas, arquivos ou padrões glob.
+
+    Returns:
+        list: Caminhos em ordem estável.
+    """
+    arquivos = []
+    for entrada in entradas:
+        if os.path.isdir(entrada):
+            arquivos += sorted(glob.glob(os.path.join(entrada, "**", "*.json"), recursive=True))
+        else:
+            arquivos += sorted(glob.glob(entrada, recursive=True))
+    return list(dict.fromkeys(arquivos))
+
+
+def dimensionar_lote(arquivos, parametros=None, processos=None):
+    """
+    Dimensiona uma lista de arquivos em paralelo.
+
+    Args:
+        arquivos (list): Caminhos dos JSON.
+        parametros (dict, optional): Entradas manuais comuns a todos os arquivos.
+        processos (int, optional): Tamanho do pool (None = núcleos da máquina;
+            1 = sequencial, no próprio processo).
+
+    Returns:
+        pd.DataFrame: Uma linha por arquivo, na ordem de entrada.
+    """
+    tarefas = [(caminho, parametros) for caminho in arquivos]
+    if processos == 1 or len(tarefas) <= 1:
+        linhas = [_dimensionar_tarefa(t) for t in tarefas]
+    else:
+        # Blocos de tarefas por envio reduzem a troca de mensagens entre processos
+        tamanho_bloco = max(1, len(tarefas) // (4 * (processos or os.cpu_count() or 1)))
+        with ProcessPoolExecutor(max_workers=processos) as pool:
+            linhas = list(pool.map(_dimensionar_tarefa, tarefas, chunksize=tamanho_bloco))
+    return pd.DataFrame(linhas)
+
+
+def salvar_tabela(df, saida):
+    """Grava CSV ou Parquet conforme a extensão de `saida`."""
+    if saida.lower().endswith(".parquet"):
+        df.to_parquet(saida, index=False)
+    else:
+        df.to_csv(saida, index=False)
+
+
+# ==========================================
+# LINHA DE COMANDO
+# ==========================================
+
+def _argumentos():
+    parser = argparse.ArgumentParser(
+        prog="python -m modules.dimensionamento_lote",
+        description="Dimensiona em lote exportações JSON do HidroAnnotator (SketchUp).",
+    )
+    parser.add_argument("entradas", nargs="+", help="Pastas, arquivos ou padrões glob (ex.: 'obras/**/*.json')")
+    parser.add_argument("-o", "--saida", default="dimensionamento_lote.csv",
+                        help="Arquivo de saída .csv ou .parquet (padrão: %(default)s)")
+    parser.add_argument("-j", "--processos", type=int, default=None,
+                        help="Processos em paralelo (padrão: núcleos da máquina; 1 = sequencial)")
+
+    g = parser.add_argument_group("transbordo e hidromassagem")
+    g.add_argument("--lamina-mm", dest="altura_lamina_mm", type=float, default=PARAMETROS_PADRAO["altura_lamina_mm"])
+    g.add_argument("--pressao-transbordo", type=int, default=PARAMETROS_PADRAO["pressao_transbordo"])
+    g.add_argument("--tipo-dispositivo", choices=["SODRAMAR", "ALBACETE"], default=PARAMETROS_PADRAO["tipo_dispositivo"])
+    g.add_argument("--qtd-dispositivos", type=int, default=PARAMETROS_PADRAO["qtd_dispositivos"])
+    g.add_argument("--pressao-hidro", type=int, default=PARAMETROS_PADRAO["pressao_hidro"])
+
+    g = parser.add_argument_group("aquecimento")
+    g.add_argument("--temp-agua", type=float, default=PARAMETROS_PADRAO["temp_agua"])
+    g.add_argument("--regiao", type=int, choices=[1, 2, 3], default=PARAMETROS_PADRAO["regiao"])
+    g.add_argument("--ambiente", choices=["A", "F"], default=PARAMETROS_PADRAO["ambiente"])
+    g.add_argument("--incidencia-solar", type=float, default=PARAMETROS_PADRAO["incidencia_solar"])
+    g.add_argument("--vento", dest="velocidade_vento", type=float, default=PARAMETROS_PADRAO["velocidade_vento"])
+    g.add_argument("--horas-capa", type=int, default=PARAMETROS_PADRAO["horas_capa"])
+    g.add_argument("--custo-kwh", type=float, default=PARAMETROS_PADRAO["custo_kwh"])
+    g.add_argument("--custo-gn", dest="custo_gn_m3", type=float, default=PARAMETROS_PADRAO["custo_gn_m3"])
+    return parser
+
+
+def main(argv=None):
+    parser = _argumentos()
+    args = parser.parse_args(argv)
+
+    arquivos = listar_arquivos(args.entradas)
+    if not arquivos:
+        parser.error("nenhum arquivo JSON encontrado nas entradas informadas")
+
+    parametros = {k: getattr(args, k) for k in PARAMETROS_PADRAO}
+    df = dimensionar_lote(arquivos, parametros, args.processos)
+    try:
+        salvar_tabela(df, args.saida)
+    except ImportError as e:
+        parser.error(f"não foi possível gravar Parquet ({e}); instale pyarrow ou use .csv")
+
+    com_erro = int(df["erro"].notna().sum())
+    print(f"{len(df)} arquivo(s) dimensionado(s), {com_erro} com erro → {args.saida}")
+    return 1 if com_erro else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
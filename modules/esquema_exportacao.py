@@ -0,0 +1,270 @@
+# modules/esquema_exportacao.py
+"""
+Esquema do JSON exportado pela extensão HidroAnnotator (SketchUp).
+
+O vocabulário de labels espelha `sketchup_extension/hidro_annotator/core/vocabulary.rb`
+e a estrutura espelha `exporter.rb`. O esquema é declarativo (dicionários) e é
+compilado uma vez, na importação, em funções de validação aninhadas: cada nó
+verifica tipo, faixa e vocabulário e delega aos filhos já compilados, numa única
+passada, acumulando todos os erros com o caminho JSON ($.tanks[0].regions[2].area_m2).
+
+Campos desconhecidos são aceitos (compatibilidade com versões futuras da extensão).
+"""
+
+import math
+import re
+
+# ==========================================
+# VOCABULÁRIO (vocabulary.rb)
+# ==========================================
+
+FACE_LABELS = ("fundo", "prainha", "escada", "banco", "piso_spa", "cocho")
+
+NUMERAVEIS = ("fundo", "prainha", "escada", "banco", "piso_spa")
+
+DEPTH_LABELS = tuple(f"prof_{label}" for label in FACE_LABELS)
+
+LINEAR_LABELS = ("borda_infinita", "borda_prainha")
+
+WALLLINE_LABELS = (
+    "wallline_refletores",
+    "wallline_retorno_filtragem",
+    "wallline_retorno_aquecimento",
+    "wallline_retorno_transbordo",
+    "wallline_retorno_hidromassagem",
+)
+
+EDGE_LABELS = DEPTH_LABELS + LINEAR_LABELS + WALLLINE_LABELS
+
+_FACE_LABELS = frozenset(FACE_LABELS)
+_SUFIXO_NUMERICO = re.compile(r"_\d+\Z")
+
+
+def label_base(label):
+    """Remove o sufixo numérico: prainha_2 → prainha."""
+    return _SUFIXO_NUMERICO.sub("", label)
+
+
+def label_face_valido(label):
+    """Label de face válido, incluindo os numerados (Vocabulary.valid_face_label?)."""
+    return label in _FACE_LABELS or label_base(label) in _FACE_LABELS
+
+
+# ==========================================
+# ESQUEMA
+# ==========================================
+# Nó: {"tipo": ..., demais chaves conforme o tipo}
+#   "objeto": "campos" {nome: nó}, "obrigatorios" (tuple)
+#   "lista":  "itens" (nó, opcional), "min_itens"
+#   "numero": "minimo"      (finito; bool não conta como número)
+#   "texto":  "valores" (tuple) ou "vocabulario" (função label → bool) + "esperado" (texto)
+#   "booleano"
+#   "id":     texto ou inteiro
+
+_NUMERO_NAO_NEGATIVO = {"tipo": "numero", "minimo": 0.0}
+_ID = {"tipo": "id"}
+
+ESQUEMA_REGIAO = {
+    "tipo": "objeto",
+    "obrigatorios": ("label", "area_m2"),
+    "campos": {
+        "label":              {"tipo": "texto", "vocabulario": label_face_valido,
+                               "esperado": ", ".join(FACE_LABELS) + ", com sufixo _N opcional"},
+        "area_m2":            _NUMERO_NAO_NEGATIVO,
+        "depth_m":            _NUMERO_NAO_NEGATIVO,
+        "volume_m3":          _NUMERO_NAO_NEGATIVO,
+        "face_persistent_id": _ID,
+        "vertices":           {"tipo": "lista"},
+        "area_source_faces":  {"tipo": "lista", "itens": _ID},
+        "depth_source_edges": {"tipo": "lista", "itens": _ID},
+        "stair_masonry":      {"tipo": "booleano"},
+    },
+}
+
+ESQUEMA_ARESTA = {
+    "tipo": "objeto",
+    "obrigatorios": ("label",),
+    "campos": {
+        "label":         {"tipo": "texto", "valores": EDGE_LABELS},
+        "length_m":      _NUMERO_NAO_NEGATIVO,
+        "persistent_id": _ID,
+    },
+}
+
+ESQUEMA_TANQUE = {
+    "tipo": "objeto",
+    "obrigatorios": ("regions",),
+    "campos": {
+        "id":              {"tipo": "texto"},
+        "regions":         {"tipo": "lista", "itens": ESQUEMA_REGIAO},
+        "total_area_m2":   _NUMERO_NAO_NEGATIVO,
+        "total_volume_m3": _NUMERO_NAO_NEGATIVO,
+        "edges":           {"tipo": "lista", "itens": ESQUEMA_ARESTA},
+    },
+}
+
+ESQUEMA_WALLLINE = {
+    "tipo": "objeto",
+    "obrigatorios": ("label",),
+    "campos": {
+        "tank_id":       {"tipo": "texto"},
+        "label":         {"tipo": "texto", "valores": WALLLINE_LABELS},
+        "length_m":      _NUMERO_NAO_NEGATIVO,
+        "persistent_id": _ID,
+    },
+}
+
+ESQUEMA_DOCUMENTO = {
+    "tipo": "objeto",
+    "obrigatorios": ("meta", "tanks"),
+    "campos": {
+        "meta": {
+            "tipo": "objeto",
+            "campos": {
+                "model_name":  {"tipo": "texto"},
+                "export_date": {"tipo": "texto"},
+                "units":       {"tipo": "texto", "valores": ("meters",)},
+            },
+        },
+        "tanks":             {"tipo": "lista", "min_itens": 1, "itens": ESQUEMA_TANQUE},
+        "walllines":         {"tipo": "lista", "itens": ESQUEMA_WALLLINE},
+        "device_placements": {"tipo": "lista"},
+    },
+}
+
+
+# ==========================================
+# COMPILAÇÃO
+# ==========================================
+
+_NOMES_TIPOS = {
+    dict: "objeto", list: "lista", str: "texto", int: "número",
+    float: "número", bool: "booleano", type(None): "null",
+}
+
+
+def _recebido(valor):
+    return _NOMES_TIPOS.get(type(valor), type(valor).__name__)
+
+
+def _compilar_objeto(no):
+    obrigatorios = tuple(no.get("obrigatorios", ()))
+    # (chave, sufixo do caminho, validador) com o sufixo montado uma única vez
+    campos = tuple((chave, f".{chave}", compilar(filho)) for chave, filho in no.get("campos", {}).items())
+
+    def validar(valor, caminho, erros):
+        if type(valor) is not dict:
+            erros.append(f"{caminho}: esperado objeto, recebido {_recebido(valor)}.")
+            return
+        for chave in obrigatorios:
+            if chave not in valor:
+                erros.append(f"{caminho}: campo obrigatório '{chave}' ausente.")
+        for chave, sufixo, validar_campo in campos:
+            if chave in valor:
+                validar_campo(valor[chave], caminho + sufixo, erros)
+    return validar
+
+
+def _compilar_lista(no):
+    min_itens = no.get("min_itens", 0)
+    validar_item = compilar(no["itens"]) if "itens" in no else None
+
+    def validar(valor, caminho, erros):
+        if type(valor) is not list:
+            erros.append(f"{caminho}: esperado lista, recebido {_recebido(valor)}.")
+            return
+        if len(valor) < min_itens:
+            erros.append(f"{caminho}: esperado ao menos {min_itens} item(ns), recebido {len(valor)}.")
+        if validar_item is not None:
+            for i, item in enumerate(valor):
+                validar_item(item, f"{caminho}[{i}]", erros)
+    return validar
+
+
+def _compilar_numero(no):
+    minimo = no.get("minimo", -math.inf)
+
+    def validar(valor, caminho, erros):
+        if type(valor) is not float and type(valor) is not int:
+            erros.append(f"{caminho}: esperado número, recebido {_recebido(valor)}.")
+        elif not math.isfinite(valor):
+            erros.append(f"{caminho}: número não finito ({valor}).")
+        elif valor < minimo:
+            erros.append(f"{caminho}: valor {valor} abaixo do mínimo {minimo:g}.")
+    return validar
+
+
+def _compilar_texto(no):
+    if "valores" in no:
+        vocabulario = frozenset(no["valores"]).__contains__
+        esperado = ", ".join(no["valores"])
+    else:
+        vocabulario = no.get("vocabulario")
+        esperado = no.get("esperado", "")
+
+    def validar(valor, caminho, erros):
+        if type(valor) is not str:
+            erros.append(f"{caminho}: esperado texto, recebido {_recebido(valor)}.")
+        elif vocabulario is not None and not vocabulario(valor):
+            erros.append(f"{caminho}: '{valor}' fora do vocabulário (esperado: {esperado}).")
+    return validar
+
+
+def _compilar_booleano(no):
+    def validar(valor, caminho, erros):
+        if type(valor) is not bool:
+            erros.append(f"{caminho}: esperado booleano, recebido {_recebido(valor)}.")
+    return validar
+
+
+def _compilar_id(no):
+    def validar(valor, caminho, erros):
+        if type(valor) is not str and type(valor) is not int:
+            erros.append(f"{caminho}: esperado identificador (texto ou inteiro), recebido {_recebido(valor)}.")
+    return validar
+
+
+_COMPILADORES = {
+    "objeto":   _compilar_objeto,
+    "lista":    _compilar_lista,
+    "numero":   _compilar_numero,
+    "texto":    _compilar_texto,
+    "booleano": _compilar_booleano,
+    "id":       _compilar_id,
+}
+
+
+def compilar(no):
+    """
+    Compila um nó do esquema numa função validar(valor, caminho, erros).
+
+    Raises:
+        KeyError: Tipo de nó desconhecido.
+    """
+    return _COMPILADORES[no["tipo"]](no)
+
+
+# Validadores prontos (compilados na importação)
+validar_tanque = compilar(ESQUEMA_TANQUE)
+validar_documento = compilar(ESQUEMA_DOCUMENTO)
+
+# Raiz sem descer nos tanques: usado quando cada tanque já foi validado ao ser lido
+validar_raiz = compilar({
+    **ESQUEMA_DOCUMENTO,
+    "campos": {
+        **ESQUEMA_DOCUMENTO["campos"],
+        "tanks": {k: v for k, v in ESQUEMA_DOCUMENTO["campos"]["tanks"].items() if k != "itens"},
+    },
+})
+
+
+def validar(documento):
+    """
+    Valida um documento já carregado.
+
+    Returns:
+        list: Mensagens de erro com o caminho JSON; vazia se válido.
+    """
+    erros = []
+    validar_documento(documento, "$", erros)
+    return erros
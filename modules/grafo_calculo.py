@@ -0,0 +1,171 @@
+# modules/grafo_calculo.py
+"""
+Motor de fluxo de dados com recomputação incremental.
+
+Cada nó declara as entradas (outros nós ou entradas externas) e a função que o
+calcula. A assinatura de um nó é o hash do seu nome com as assinaturas das
+entradas (árvore de Merkle); o valor fica num CacheLRU sob essa assinatura, de
+modo que um nó só é executado quando alguma entrada mudou ("sujo"). Entradas
+externas assinam pelo conteúdo normalizado (ou por uma assinatura informada,
+ex.: o SHA-256 de um arquivo).
+
+Nós com `por_valor=True` assinam pelo hash do próprio resultado: se um
+arquivo novo produz os mesmos totais, os nós abaixo deles não são
+recalculados (corte antecipado). Use para resultados pequenos.
+
+O grafo é imutável depois de montado e pode ser compartilhado entre sessões;
+as estatísticas acumuladas são protegidas por lock.
+"""
+
+import threading
+import time
+
+import pandas as pd
+
+from modules.cache_conteudo import CacheLRU, hash_conteudo
+
+
+# ==========================================
+# ASSINATURAS
+# ==========================================
+
+def normalizar(valor):
+    """Números como float (3 e 3.0 geram a mesma assinatura), recursivo em dicts/listas."""
+    if isinstance(valor, bool):
+        return valor
+    if isinstance(valor, (int, float)):
+        return float(valor)
+    if isinstance(valor, dict):
+        return {k: normalizar(v) for k, v in valor.items()}
+    if isinstance(valor, (list, tuple)):
+        return [normalizar(v) for v in valor]
+    return valor
+
+
+# ==========================================
+# GRAFO
+# ==========================================
+
+class GrafoCalculo:
+    """
+    Grafo de cálculo com cache por assinatura.
+
+    Args:
+        cache (CacheLRU, optional): Onde guardar os valores dos nós (pode ser
+            compartilhado com outros usos; as chaves não colidem).
+        nome (str): Prefixo das chaves no cache.
+    """
+
+    def __init__(self, cache=None, nome="grafo"):
+        self.cache = cache if cache is not None else CacheLRU()
+        self.nome = nome
+        self._nos = {}          # nome -> (funcao, entradas, por_valor, armazenar), em ordem topológica
+        self._externas = set()
+        self._lock = threading.Lock()
+        self._acumulado = {}    # nome -> [execucoes, acertos, tempo_s]
+
+    def no(self, nome, funcao, entradas=(), por_valor=False, armazenar=True):
+        """
+        Declara um nó. As entradas que não são nós já declarados são externas.
+
+        Args:
+            nome (str): Nome do nó.
+            funcao (callable): Recebe os valores das entradas, na ordem declarada.
+            entradas (tuple): Nomes das entradas.
+            por_valor (bool): Assinar pelo resultado (corte antecipado).
+            armazenar (bool): Guardar o valor no cache (False para nós triviais).
+
+        Raises:
+            ValueError: Nome repetido ou já usado como entrada externa.
+        """
+        if nome in self._nos or nome in self._externas:
+            raise ValueError(f"Nó '{nome}' já declarado ou usado como entrada externa.")
+        entradas = tuple(entradas)
+        self._externas.update(e for e in entradas if e not in self._nos)
+        self._nos[nome] = (funcao, entradas, por_valor, armazenar)
+        return self
+
+    def _necessarios(self, alvos):
+        """Nós e entradas externas de que os alvos dependem, em ordem topológica."""
+        marcados = set()
+        pilha = list(alvos)
+        while pilha:
+            nome = pilha.pop()
+            if nome in marcados:
+                continue
+            if nome not in self._nos and nome not in self._externas:
+                raise KeyError(f"Nó desconhecido: '{nome}'.")
+            marcados.add(nome)
+            if nome in self._nos:
+                pilha.extend(self._nos[nome][1])
+        externas = [n for n in marcados if n in self._externas]
+        return externas, [n for n in self._nos if n in marcados]
+
+    def avaliar(self, alvos, entradas, assinaturas=None):
+        """
+        Calcula os alvos, executando apenas os nós sujos.
+
+        Args:
+            alvos (iterable): Nomes dos nós desejados.
+            entradas (dict): Valores das entradas externas necessárias.
+            assinaturas (dict, optional): Assinaturas prontas de entradas
+                externas (ex.: hash de um arquivo), no lugar do hash do valor.
+
+        Returns:
+            tuple: (valores, registros) — valores de todos os nós avaliados e,
+                por nó, {"no", "acerto", "tempo_ms"}.
+
+        Raises:
+            KeyError: Alvo desconhecido ou entrada externa ausente.
+        """
+        assinaturas = assinaturas or {}
+        externas, nos = self._necessarios(alvos)
+        valores = {}
+        assinatura = {}
+        for nome in externas:
+            if nome not in entradas:
+                raise KeyError(f"Entrada externa ausente: '{nome}'.")
+            valores[nome] = entradas[nome]
+            assinatura[nome] = assinaturas.get(nome) or hash_conteudo(normalizar(entradas[nome]))
+
+        registros = []
+        for nome in nos:
+            funcao, deps, por_valor, armazenar = self._nos[nome]
+            chave = hash_conteudo(self.nome, nome, [assinatura[d] for d in deps])
+            executou = []
+
+            def gerar():
+                executou.append(True)
+                valor = funcao(*(valores[d] for d in deps))
+                return valor, (hash_conteudo(normalizar(valor)) if por_valor else chave)
+
+            inicio = time.perf_counter()
+            if armazenar:
+                valores[nome], assinatura[nome] = self.cache.obter(chave, gerar)
+            else:
+                valores[nome], assinatura[nome] = gerar()
+            tempo = time.perf_counter() - inicio
+
+            acerto = not executou
+            registros.append({"no": nome, "acerto": acerto, "tempo_ms": tempo * 1000})
+            with self._lock:
+                acumulado = self._acumulado.setdefault(nome, [0, 0, 0.0])
+                acumulado[0] += 1
+                acumulado[1] += acerto
+                acumulado[2] += tempo
+        return valores, registros
+
+    def estatisticas(self):
+        """
+        Returns:
+            pd.DataFrame: Por nó, avaliações, acertos de cache, execuções e
+                tempo total (ms), na ordem do grafo.
+        """
+        with self._lock:
+            linhas = [
+                {"no": nome, "avaliacoes": n, "acertos": acertos,
+                 "execucoes": n - acertos, "tempo_total_ms": tempo * 1000}
+                for nome in self._nos if nome in self._acumulado
+                for n, acertos, tempo in [self._acumulado[nome]]
+            ]
+        return pd.DataFrame(linhas, columns=["no", "avaliacoes", "acertos", "execucoes", "tempo_total_ms"])
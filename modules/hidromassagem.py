@@ -1,12 +1,14 @@
 # modules/hidromassagem.py
 import math
 import streamlit as st
+import pandas as pd
 import plotly.graph_objects as go
-import numpy as np
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any
 from tracking import track_access
-from modules.data import BANCO_BOMBAS
-from modules.calc_utils import ajustar_curva_pchip
+from modules.catalogo_bombas import (CATALOGO_BOMBAS, INDICES_SELECAO, selecionar_bomba,
+                                     selecionar_bombas_curva)
+from modules.associacao_bombas import exibir_sugestoes_associacao
+from modules.curvas_bombas import obter_curva_bomba, pontos_da_bomba
 
 @track_access("hidromassagem")  # ← Decorador aplicado
 def run() -> None:
@@ -77,16 +79,33 @@ def run() -> None:
                 st.rerun()
 
             # Input pressão
-            pressao_selecionada: int = st.number_input(
-                "Pressão de dimensionamento (m.c.a):",
-                min_value=4,
-                max_value=18,
-                value=8,
-                step=2,
-                format="%d"
+            selecao_curva: bool = st.checkbox(
+                "Selecionar pela curva (qualquer pressão, catálogo completo)",
+                key="hidro_selecao_curva",
+                help="Avalia a curva de todas as motobombas do catálogo na pressão informada, "
+                     "em vez de usar apenas os valores tabelados de 2 em 2 m.c.a."
             )
+            if selecao_curva:
+                pressao_selecionada: float = st.number_input(
+                    "Pressão de dimensionamento (m.c.a):",
+                    min_value=float(CATALOGO_BOMBAS.pressoes[0]),
+                    max_value=float(CATALOGO_BOMBAS.pressoes[-1]),
+                    value=8.0,
+                    step=0.5,
+                    format="%.1f"
+                )
+            else:
+                pressao_selecionada: int = st.number_input(
+                    "Pressão de dimensionamento (m.c.a):",
+                    min_value=4,
+                    max_value=18,
+                    value=8,
+                    step=2,
+                    format="%d"
+                )
 
     bomba_selecionada: Optional[Dict[str, Any]] = None
+    vazao_bomba: Optional[float] = None
 
     # Cálculos
     if st.button("Calcular", type="primary"):
@@ -96,14 +115,16 @@ def run() -> None:
             vazao_necessaria: float = quantidade * vazao_por_dispositivo
 
             # 5. Seleção da motobomba
-            bomba_selecionada = None
-            for bomba in sorted(BANCO_BOMBAS, key=lambda x: x['potencia_cv']):
-                chave_vazao = f'vazao_{pressao_selecionada}_mca'
-                vazao_bomba = bomba.get(chave_vazao)
-
-                if vazao_bomba and vazao_bomba >= vazao_necessaria:
-                    bomba_selecionada = bomba
-                    break
+            if selecao_curva:
+                candidatos = selecionar_bombas_curva(vazao_necessaria, pressao_selecionada)
+                vazoes_candidatos = CATALOGO_BOMBAS.vazoes_na_pressao(pressao_selecionada)[candidatos, 0]
+                if candidatos.size:
+                    bomba_selecionada = CATALOGO_BOMBAS.registro(candidatos[0])
+                    vazao_bomba = float(vazoes_candidatos[0])
+            else:
+                bomba_selecionada = selecionar_bomba(vazao_necessaria, pressao_selecionada)
+                if bomba_selecionada:
+                    vazao_bomba = bomba_selecionada[f'vazao_{pressao_selecionada}_mca']
 
             # Exibição dos resultados
             st.success("**Resultados do Dimensionamento**")
@@ -111,7 +132,7 @@ def run() -> None:
             cols = st.columns(2)
             with cols[0]:
                 st.metric("Vazão Total Necessária", f"{vazao_necessaria:.1f} m³/h")
-                st.metric("Pressão Selecionada", f"{pressao_selecionada} m.c.a")
+                st.metric("Pressão Selecionada", f"{pressao_selecionada:g} m.c.a")
 
             with cols[1]:
                 if bomba_selecionada:
@@ -119,6 +140,13 @@ def run() -> None:
                     st.metric("Modelo", bomba_selecionada['modelo'])
                     st.metric("Potência", f"{bomba_selecionada['potencia_cv']} CV")
 
+                    if selecao_curva:
+                        st.write(f"**Motobombas que atendem ({candidatos.size}):**")
+                        st.dataframe(pd.DataFrame({
+                            "Modelo": CATALOGO_BOMBAS.modelos[candidatos],
+                            "Potência (cv)": CATALOGO_BOMBAS.potencias[candidatos],
+                            f"Vazão em {pressao_selecionada:g} m.c.a (m³/h)": vazoes_candidatos.round(2),
+                        }), hide_index=True, use_container_width=True)
 
                 else:
                     st.error("Nenhuma motobomba adequada encontrada!")
@@ -130,6 +158,8 @@ def run() -> None:
                     linha de sucção e verificar velocidade de fluxo ≤1,80 m/s.
                     - Verifique modelos com maior capacidade
                     """)
+                    exibir_sugestoes_associacao(vazao_necessaria, pressao_selecionada,
+                                                None if selecao_curva else INDICES_SELECAO)
 
             st.markdown("---")
 
@@ -138,30 +168,20 @@ def run() -> None:
             st.write(f"**Especificações Técnicas:**")
             st.write(f"- Modelo: {bomba_selecionada['modelo']}")
             st.write(f"- Potência: {bomba_selecionada['potencia_cv']} CV")
-            st.write(
-                f"- Vazão em {pressao_selecionada} m.c.a: {bomba_selecionada[f'vazao_{pressao_selecionada}_mca']} m³/h")
+            st.write(f"- Vazão em {pressao_selecionada:g} m.c.a: {vazao_bomba:.2f} m³/h")
             st.write("**Curva da Motobomba:**")
 
-            # Preparar dados para o gráfico
-            pressoes: List[int] = []
-            vazoes: List[float] = []
-            possible_pressures = list(range(2, 19, 2))  # De 2 a 18 mca
-            for press in possible_pressures:
-                key = f'vazao_{press}_mca'
-                if bomba_selecionada.get(key) is not None:
-                    pressoes.append(press)
-                    vazoes.append(bomba_selecionada[key])
+            # Preparar dados para o gráfico (no modo por curva, todos os pontos do catálogo)
+            possible_pressures = None if selecao_curva else list(range(2, 19, 2))  # De 2 a 18 mca
+            vazoes, pressoes = pontos_da_bomba(bomba_selecionada, possible_pressures)
 
             # Criar gráfico com Plotly
             if len(pressoes) >= 2 and len(vazoes) >= 2:
                 try:
-                    # Ordenar os dados por vazão
-                    sorted_pairs = sorted(zip(vazoes, pressoes), key=lambda x: x[0])
-                    x_sorted = np.array([p[0] for p in sorted_pairs])
-                    y_sorted = np.array([p[1] for p in sorted_pairs])
-
-                    # Criar interpolação PCHIP
-                    x_smooth, y_smooth, _ = ajustar_curva_pchip(x_sorted, y_sorted)
+                    # Curva PCHIP pré-compilada (compartilhada entre sessões)
+                    curva = obter_curva_bomba(bomba_selecionada, possible_pressures)
+                    x_sorted, y_sorted = curva.vazoes, curva.pressoes
+                    x_smooth, y_smooth = curva.x_interp, curva.y_interp
 
                     # Configurar gráfico
                     fig = go.Figure()
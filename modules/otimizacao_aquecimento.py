@@ -0,0 +1,232 @@
+# modules/otimizacao_aquecimento.py
+"""
+Comparação de todos os modelos de bomba de calor por custo total de propriedade.
+
+Para uma piscina, avalia de uma vez todos os modelos de MODELOS_CATALOGO
+(`calcular_dimensionamento_lote` com broadcasting sobre os modelos) e combina:
+
+    capex       = preço de compra (tabela informada pelo usuário)
+    opex anual  = custo médio mensal de energia × 12 + horas/ano × manutenção por hora
+    custo total = capex + opex anual × fator de valor presente (horizonte em anos)
+
+Pelas fórmulas da planilha, o custo de energia é o mesmo para todo modelo que
+atende (consumo = capacidade / COP × horas, e as horas caem na mesma proporção
+em que a capacidade sobe); a diferença operacional entre tamanhos vem das horas
+de funcionamento, valoradas pelo custo de manutenção por hora.
+"""
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+from modules.aquecimento import ENTRADAS_LOTE, ORDEM_MODELOS, calcular_dimensionamento_lote
+
+# ==========================================
+# CONSTANTES
+# ==========================================
+
+ANOS_PADRAO = 10
+
+# Modelos que atendem, a partir do menor, exibidos para preenchimento de preço
+NUM_CANDIDATOS = 8
+
+_MODELOS = np.array(ORDEM_MODELOS, dtype=object)
+
+
+# ==========================================
+# CÁLCULO
+# ==========================================
+
+def fator_valor_presente(anos, taxa_desconto=0.0):
+    """
+    Soma dos fatores de desconto de `anos` parcelas anuais.
+
+    Args:
+        anos (int): Horizonte em anos.
+        taxa_desconto (float): Taxa anual (fração, ex.: 0.08). 0 = sem desconto.
+
+    Returns:
+        float: Multiplicador do custo anual.
+    """
+    if taxa_desconto == 0:
+        return float(anos)
+    return (1.0 - (1.0 + taxa_desconto) ** -anos) / taxa_desconto
+
+
+def fronteira_pareto(capex, opex):
+    """
+    Pontos não dominados (menor capex e menor opex), vetorizado.
+
+    Pontos repetidos recebem a mesma marcação; entradas NaN nunca estão na fronteira.
+
+    Args:
+        capex (array-like): Custo de aquisição por ponto.
+        opex (array-like): Custo operacional por ponto.
+
+    Returns:
+        np.ndarray: Máscara booleana dos pontos na fronteira.
+    """
+    capex = np.asarray(capex, dtype=np.float64)
+    opex = np.asarray(opex, dtype=np.float64)
+    mascara = np.zeros(capex.shape, dtype=bool)
+    finitos = np.flatnonzero(np.isfinite(capex) & np.isfinite(opex))
+    if finitos.size == 0:
+        return mascara
+
+    # Sem repetições, em ordem de (capex, opex): está na fronteira quem tem opex
+    # estritamente menor que todos os anteriores
+    pontos, inverso = np.unique(np.column_stack([capex[finitos], opex[finitos]]),
+                                axis=0, return_inverse=True)
+    anterior = np.concatenate([[np.inf], np.minimum.accumulate(pontos[:, 1])[:-1]])
+    mascara[finitos] = (pontos[:, 1] < anterior)[inverso.ravel()]
+    return mascara
+
+
+def avaliar_modelos(inputs, precos=None, anos=ANOS_PADRAO, custo_manutencao_hora=0.0,
+                    taxa_desconto=0.0):
+    """
+    Avalia todos os modelos do catálogo para uma piscina.
+
+    Args:
+        inputs (dict): Entradas de `aquecimento.calcular_dimensionamento`
+            ("modo"/"modelo_manual" são ignorados).
+        precos (dict, optional): {modelo: preço (R$)}. Modelos sem preço ficam
+            com capex e custo total NaN e fora da fronteira de Pareto.
+        anos (int): Horizonte do custo total.
+        custo_manutencao_hora (float): R$ por hora de funcionamento.
+        taxa_desconto (float): Taxa anual para valor presente (fração).
+
+    Returns:
+        pd.DataFrame: Uma linha por modelo, ordenada por custo total (modelos
+            que atendem primeiro; sem preço por último), com as colunas
+            ordem, modelo, capacidade_btu_h, horas_inverno, horas_verao,
+            horas_ano, atende, selecao_automatica, custo_energia_anual,
+            custo_manutencao_anual, opex_anual, capex, custo_total e pareto.
+    """
+    precos = precos or {}
+    lote = calcular_dimensionamento_lote(**{k: inputs[k] for k in ENTRADAS_LOTE},
+                                         modelo_manual=_MODELOS)
+
+    atende = lote["equipamento_atende"].to_numpy(dtype=bool)
+    h_inv = lote["horas_inverno"].to_numpy(dtype=np.float64)
+    h_ver = lote["horas_verao"].to_numpy(dtype=np.float64)
+    # Mesmo mês de 31 dias das fórmulas de custo da planilha
+    horas_ano = (h_inv + h_ver) / 2 * 31 * 12
+    energia_anual = lote["custo_medio_mensal"].to_numpy(dtype=np.float64) * 12
+    manutencao_anual = horas_ano * custo_manutencao_hora
+    opex = energia_anual + manutencao_anual
+    capex = np.array([precos.get(m, np.nan) for m in ORDEM_MODELOS], dtype=np.float64)
+    capex[~atende] = np.nan
+    custo_total = capex + opex * fator_valor_presente(anos, taxa_desconto)
+
+    automatica = np.zeros(len(ORDEM_MODELOS), dtype=bool)
+    if atende.any():
+        automatica[np.argmax(atende)] = True
+
+    df = pd.DataFrame({
+        "ordem":                  np.arange(len(ORDEM_MODELOS)),
+        "modelo":                 _MODELOS,
+        "capacidade_btu_h":       lote["capacidade_btu_h"].to_numpy(),
+        "horas_inverno":          h_inv,
+        "horas_verao":            h_ver,
+        "horas_ano":              horas_ano,
+        "atende":                 atende,
+        "selecao_automatica":     automatica,
+        "custo_energia_anual":    energia_anual,
+        "custo_manutencao_anual": manutencao_anual,
+        "opex_anual":             opex,
+        "capex":                  capex,
+        "custo_total":            custo_total,
+        "pareto":                 fronteira_pareto(capex, opex),
+    })
+    ordem = np.lexsort((df["ordem"], df["custo_total"].isna(), df["custo_total"], ~atende))
+    return df.iloc[ordem].reset_index(drop=True)
+
+
+# ==========================================
+# INTERFACE
+# ==========================================
+
+def exibir_otimizacao_modelos(res, inputs):
+    """
+    Expander que compara o modelo dimensionado com os tamanhos acima pelo
+    custo total de propriedade.
+
+    Args:
+        res (dict): Resultado de `calcular_dimensionamento` (sem erro).
+        inputs (dict): Entradas usadas no dimensionamento.
+    """
+    with st.expander("Comparar modelos (custo total de propriedade)"):
+        c1, c2, c3 = st.columns(3)
+        anos = c1.number_input("Horizonte (anos)", min_value=1, max_value=30,
+                               value=ANOS_PADRAO, step=1, key="aq_tco_anos")
+        manutencao = c2.number_input("Manutencao (R$/h de funcionamento)", min_value=0.0,
+                                     max_value=100.0, value=0.0, step=0.1, format="%.2f",
+                                     key="aq_tco_manutencao")
+        taxa = c3.number_input("Taxa de desconto (% a.a.)", min_value=0.0, max_value=50.0,
+                               value=0.0, step=0.5, key="aq_tco_taxa")
+
+        # Precos informados ficam na sessao e valem para as proximas piscinas
+        precos = st.session_state.setdefault("aq_precos_modelos", {})
+        base = avaliar_modelos(inputs, precos, anos, manutencao, taxa / 100)
+        candidatos = base[base["atende"]].sort_values("ordem")
+        atual = np.flatnonzero(candidatos["modelo"].to_numpy() == res["modelo"])
+        inicio = int(atual[0]) if atual.size else 0
+        candidatos = candidatos.iloc[inicio:inicio + NUM_CANDIDATOS]
+
+        editado = st.data_editor(
+            pd.DataFrame({
+                "Modelo": candidatos["modelo"].to_numpy(),
+                "Horas/dia (inverno)": candidatos["horas_inverno"].round(1).to_numpy(),
+                "Preco (R$)": [precos.get(m, np.nan) for m in candidatos["modelo"]],
+            }),
+            disabled=["Modelo", "Horas/dia (inverno)"],
+            hide_index=True,
+            use_container_width=True,
+            key="aq_tco_precos",
+        )
+        for modelo, preco in zip(editado["Modelo"], editado["Preco (R$)"]):
+            if pd.notna(preco):
+                precos[modelo] = float(preco)
+            else:
+                precos.pop(modelo, None)
+
+        df = avaliar_modelos(inputs, precos, anos, manutencao, taxa / 100)
+        df = df[df["atende"] & df["custo_total"].notna()]
+        if df.empty:
+            st.info("Informe o preco de ao menos um modelo para calcular o custo total.")
+            return
+
+        referencia = df.loc[df["modelo"] == res["modelo"], "custo_total"]
+        tabela = pd.DataFrame({
+            "Modelo": df["modelo"],
+            "Preco (R$)": df["capex"].round(2),
+            "Operacao anual (R$)": df["opex_anual"].round(2),
+            "Horas/ano": df["horas_ano"].round(0),
+            f"Custo total {anos} anos (R$)": df["custo_total"].round(2),
+            "Pareto": df["pareto"].map({True: "sim", False: ""}),
+        })
+        if not referencia.empty:
+            tabela[f"Dif. vs {res['modelo']} (R$)"] = (df["custo_total"] - referencia.iloc[0]).round(2)
+        st.dataframe(tabela, hide_index=True, use_container_width=True)
+
+        frente = df[df["pareto"]].sort_values("capex")
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(
+            x=df["capex"], y=df["opex_anual"], mode="markers+text", text=df["modelo"],
+            textposition="top center", name="Modelos",
+        ))
+        fig.add_trace(go.Scatter(
+            x=frente["capex"], y=frente["opex_anual"], mode="lines",
+            name="Fronteira de Pareto", line=dict(dash="dash"),
+        ))
+        fig.update_layout(
+            xaxis_title="Preco (R$)", yaxis_title="Custo operacional anual (R$)", height=380,
+            margin=dict(l=10, r=10, t=30, b=10), legend=dict(orientation="h"),
+        )
+        st.plotly_chart(fig, use_container_width=True)
+        st.caption(
+            "Pelas formulas da planilha o custo de energia e o mesmo para todo modelo que "
+            "atende; modelos maiores diferem nas horas de funcionamento (manutencao)."
+        )
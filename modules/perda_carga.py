@@ -1,10 +1,13 @@
 # modules/perda_carga.py
 import math
+from collections.abc import Sequence
+import numpy as np
+import pandas as pd
 import streamlit as st
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 from tracking import track_access
 from modules.data import DIAMETROS_TUBULACAO as DIAMETROS, CONEXOES_EQUIV
-from modules.calc_utils import calcular_fator_atrito
+from modules.calc_utils import calcular_fator_atrito, calcular_fator_atrito_vetorizado, CurvaSistema
 
 # Constantes de projeto
 VISCOSIDADE_AGUA = 0.896e-6      # m²/s (água a 20°C)
@@ -13,6 +16,14 @@ G = 9.81                          # m/s²
 LIMITE_VEL_SUCCAO = 1.8           # m/s (ABNT NBR 10.339)
 LIMITE_VEL_RECALQUE = 3.0          # m/s
 
+# Ordem fixa de diâmetros e conexões usada pelas APIs em lote
+ORDEM_DIAMETROS = np.array(sorted(DIAMETROS))
+ORDEM_CONEXOES = list(CONEXOES_EQUIV.keys())
+D_INT_LOTE = np.array([DIAMETROS[d] for d in ORDEM_DIAMETROS]) / 1000.0   # m
+# Comprimento equivalente (m) por diâmetro × conexão; conexão sem valor tabelado = 0
+MATRIZ_L_EQ = np.array([[CONEXOES_EQUIV[c].get(d, 0) for c in ORDEM_CONEXOES]
+                        for d in ORDEM_DIAMETROS], dtype=float)
+
 
 def calcular_linha(Q_m3h: float, diam_ext: str, L_real: float, conexoes: Dict[str, int]) -> Dict[str, float]:
     """
@@ -44,6 +55,145 @@ def calcular_linha(Q_m3h: float, diam_ext: str, L_real: float, conexoes: Dict[st
     }
 
 
+def vetor_conexoes(conexoes: Dict[str, int]) -> np.ndarray:
+    """Converte um dicionário de conexões em vetor de quantidades na ordem de ORDEM_CONEXOES."""
+    return np.array([conexoes.get(c, 0) for c in ORDEM_CONEXOES], dtype=float)
+
+
+def indices_diametros(diam_ext) -> np.ndarray:
+    """Índices em ORDEM_DIAMETROS dos diâmetros externos informados (KeyError se inexistente)."""
+    diam_ext = np.asarray(diam_ext)
+    idx = np.clip(np.searchsorted(ORDEM_DIAMETROS, diam_ext), 0, ORDEM_DIAMETROS.size - 1)
+    invalidos = ORDEM_DIAMETROS[idx] != diam_ext
+    if invalidos.any():
+        raise KeyError(f"Diâmetro '{diam_ext[invalidos].ravel()[0]}' não encontrado em DIAMETROS.")
+    return idx
+
+
+def calcular_linhas_lote(Q_m3h, diam_ext, L_real, conexoes: Optional[np.ndarray] = None,
+                         usar_tabela: bool = True) -> Dict[str, np.ndarray]:
+    """
+    Versão em lote de `calcular_linha` para muitos trechos de uma vez.
+
+    Recebe arrays colunares (com broadcast) de vazão (m³/h), diâmetro externo e
+    comprimento real, e uma matriz de quantidades de conexões (n_trechos ×
+    len(ORDEM_CONEXOES)); use `vetor_conexoes` para montar cada linha.
+    Retorna as mesmas chaves de `calcular_linha`, como arrays NumPy.
+    """
+    Q_m3h, diam_ext, L_real = np.broadcast_arrays(np.asarray(Q_m3h, dtype=float),
+                                                  np.asarray(diam_ext),
+                                                  np.asarray(L_real, dtype=float))
+    idx = indices_diametros(diam_ext)
+
+    D_int = D_INT_LOTE[idx]                        # m
+    Q = Q_m3h / 3600.0                             # m³/s
+    A = math.pi * (D_int ** 2) / 4.0
+    V = Q / A
+    Re = V * D_int / VISCOSIDADE_AGUA
+    f = calcular_fator_atrito_vetorizado(Re, D_int, usar_tabela=usar_tabela)
+
+    if conexoes is None:
+        L_eq = np.zeros(Q.shape)
+    else:
+        conexoes = np.broadcast_to(np.asarray(conexoes, dtype=float), Q.shape + (len(ORDEM_CONEXOES),))
+        L_eq = np.einsum('...j,...j->...', conexoes, MATRIZ_L_EQ[idx])
+
+    hf_total = f * ((L_real + L_eq) / D_int) * (V ** 2 / (2.0 * G))
+
+    return {
+        'D_int': D_int * 1000.0,
+        'V': V,
+        'Re': Re,
+        'f': f,
+        'L_eq': L_eq,
+        'hf_total': hf_total
+    }
+
+
+class SegmentosRecalque(Sequence):
+    """
+    Detalhamento por segmento do ramal secundário.
+
+    Guarda apenas os arrays calculados pelo kernel vetorizado; os dicionários
+    por segmento (mesmas chaves de antes) só são montados quando acessados.
+    """
+
+    def __init__(self, ramal: np.ndarray, seg: np.ndarray, Q_m3h: np.ndarray,
+                 V: np.ndarray, hf: np.ndarray):
+        self.ramal = ramal
+        self.seg = seg
+        self.Q_m3h = Q_m3h
+        self.V = V
+        self.hf = hf
+
+    def __len__(self) -> int:
+        return len(self.seg)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        return {
+            'Ram.': str(self.ramal[i]),
+            'Seg.': int(self.seg[i]),
+            'Vazão (m³/h)': float(self.Q_m3h[i]),
+            'Vel. (m/s)': float(self.V[i]),
+            'Perda (mca)': float(self.hf[i])
+        }
+
+    def para_dataframe(self) -> pd.DataFrame:
+        """Tabela de segmentos para exibição (sem montar dicionários por segmento)."""
+        return pd.DataFrame({
+            'Ram.': self.ramal,
+            'Seg.': self.seg,
+            'Vazão (m³/h)': self.Q_m3h,
+            'Vel. (m/s)': self.V,
+            'Perda (mca)': self.hf
+        })
+
+
+def _distribuir_conexoes(conex_s: Dict[str, int], n_left: int, num_retornos: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Distribui as conexões do secundário entre os sub-ramais proporcionalmente ao
+    nº de retornos. Retorna os vetores (esquerdo, direito) na ordem de ORDEM_CONEXOES.
+    """
+    qtd = vetor_conexoes(conex_s)
+    left_q = np.floor(qtd * (n_left / num_retornos))
+    left_q = np.where(qtd > 0, np.clip(left_q, 0, qtd), 0.0)
+    right_q = np.where(qtd > 0, qtd - left_q, 0.0)
+    return left_q, right_q
+
+
+def _kernel_secundario(Q_total: float, D_int_sec: np.ndarray, n_left: int, n_right: int,
+                       L_left_per_seg: np.ndarray, L_right_per_seg: np.ndarray,
+                       usar_tabela: bool = True) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Kernel vetorizado do ramal secundário: calcula todos os segmentos dos dois
+    sub-ramais em uma única passagem de arrays.
+
+    Q_total em m³/s; D_int_sec (m) e comprimentos por segmento com forma (k,),
+    permitindo avaliar k diâmetros candidatos de uma vez.
+    Retorna (Q_seg (n,), V (k, n), hf (k, n)), com os n_left segmentos do
+    sub-ramal esquerdo seguidos dos n_right do direito.
+    """
+    Q_branch = Q_total if n_right == 0 else Q_total / 2.0
+    Q_seg = np.concatenate([
+        Q_branch - np.arange(n_left) * (Q_branch / n_left),
+        Q_branch - np.arange(n_right) * (Q_branch / n_right) if n_right > 0 else np.empty(0)
+    ])
+    L_seg = np.concatenate([
+        np.repeat(np.asarray(L_left_per_seg, dtype=float)[:, None], n_left, axis=1),
+        np.repeat(np.asarray(L_right_per_seg, dtype=float)[:, None], n_right, axis=1)
+    ], axis=1)
+
+    D = np.asarray(D_int_sec, dtype=float)[:, None]
+    A = math.pi * (D ** 2) / 4.0
+    V = Q_seg[None, :] / A
+    Re = V * D / VISCOSIDADE_AGUA
+    f = calcular_fator_atrito_vetorizado(Re, D, usar_tabela=usar_tabela)
+    hf = f * (L_seg / D) * (V ** 2 / (2.0 * G))
+    return Q_seg, V, hf
+
+
 def calcular_recalque_multiplos(Q_m3h: float, diam_prim: str, diam_sec: str,
                                 L_prim: float, L_sec: float, num_retornos: int,
                                 conex_p: Dict[str, int], conex_s: Dict[str, int]) -> Dict[str, Any]:
@@ -55,6 +205,8 @@ def calcular_recalque_multiplos(Q_m3h: float, diam_prim: str, diam_sec: str,
         imediata e 2 sub-ramais (cada sub-ramal recebe Q_total/2 no Tee).
       - retornos são em série dentro de cada sub-ramal; se ímpar, um ramo tem 1 retorno a mais.
     Observação: não adiciona comprimento equivalente por TÊ ou REDUÇÃO (conforme solicitado).
+    Todos os segmentos são calculados de uma vez pelo kernel vetorizado; 'segmentos'
+    é um `SegmentosRecalque`, que só monta o detalhamento quando acessado.
     """
     if num_retornos < 1:
         raise ValueError("num_retornos deve ser >= 1")
@@ -69,124 +221,32 @@ def calcular_recalque_multiplos(Q_m3h: float, diam_prim: str, diam_sec: str,
     prim = calcular_linha(Q_m3h, diam_prim, L_prim, conex_p)
 
     D_int_sec = DIAMETROS[diam_sec] / 1000.0
-    A_sec = math.pi * (D_int_sec ** 2) / 4.0
     Q_total = Q_m3h / 3600.0
 
-    if num_retornos == 1:
-        Q_retorno = Q_total
-        L_eq_sec = sum(qtd * CONEXOES_EQUIV.get(c, {}).get(diam_sec, 0) for c, qtd in conex_s.items())
-        L_seg = (L_sec + L_eq_sec) / 1.0
-
-        hf_sec_total = 0.0
-        segmentos = []
-        velocidades_sec = []
-
-        Q_i = Q_total
-        V_i = Q_i / A_sec if A_sec > 0 else 0.0
-        Re_i = V_i * D_int_sec / VISCOSIDADE_AGUA if D_int_sec > 0 else 0.0
-        f_i = calcular_fator_atrito(Re_i, D_int_sec)
-        hf_i = f_i * (L_seg / D_int_sec) * (V_i ** 2 / (2.0 * G)) if D_int_sec > 0 else 0.0
-
-        hf_sec_total += hf_i
-        velocidades_sec.append(V_i)
-        segmentos.append({
-            'Ram.': '',
-            'Seg.': 1,
-            'Vazão (m³/h)': Q_i * 3600.0,
-            'Vel. (m/s)': V_i,
-            'Perda (mca)': hf_i
-        })
-
-        v_max = max([prim['V']] + velocidades_sec) if velocidades_sec else prim['V']
-
-        return {
-            'D_int_prim': prim['D_int'],
-            'D_int_sec': D_int_sec * 1000.0,
-            'V_max': v_max,
-            'hf_total': prim['hf_total'] + hf_sec_total,
-            'hf_prim': prim['hf_total'],
-            'hf_sec': hf_sec_total,
-            'segmentos': segmentos,
-            'L_eq_total': prim['L_eq'] + L_eq_sec
-        }
-
-    # num_retornos > 1 : subdividir em dois sub-ramais
+    # num_retornos > 1 : subdividir em dois sub-ramais (o esquerdo recebe o retorno ímpar)
     n_left = math.ceil(num_retornos / 2.0)
     n_right = num_retornos - n_left
 
-    Q_branch = Q_total / 2.0
-
-    # Distribuir conexões do secundário entre os sub-ramais proporcionalmente ao nº de retornos
-    conex_left: Dict[str, int] = {}
-    conex_right: Dict[str, int] = {}
-    for c, qtd in conex_s.items():
-        if qtd <= 0:
-            conex_left[c] = 0
-            conex_right[c] = 0
-            continue
-        left_q = int(math.floor(qtd * (n_left / num_retornos)))
-        left_q = max(0, min(left_q, qtd))
-        right_q = qtd - left_q
-        conex_left[c] = left_q
-        conex_right[c] = right_q
-
-    L_eq_left = sum(q * CONEXOES_EQUIV.get(c, {}).get(diam_sec, 0) for c, q in conex_left.items())
-    L_eq_right = sum(q * CONEXOES_EQUIV.get(c, {}).get(diam_sec, 0) for c, q in conex_right.items())
-
-    L_left_per_seg = (L_sec + L_eq_left) / n_left if n_left > 0 else 0.0
+    conex_left, conex_right = _distribuir_conexoes(conex_s, n_left, num_retornos)
+    i_sec = indices_diametros(diam_sec)
+    L_eq_left = float(conex_left @ MATRIZ_L_EQ[i_sec])
+    L_eq_right = float(conex_right @ MATRIZ_L_EQ[i_sec])
+
+    L_left_per_seg = (L_sec + L_eq_left) / n_left
     L_right_per_seg = (L_sec + L_eq_right) / n_right if n_right > 0 else 0.0
 
-    hf_left = 0.0
-    velocidades_left: List[float] = []
-    segmentos_left: List[Dict[str, Any]] = []
-
-    if n_left > 0:
-        Q_retorno_left = Q_branch / n_left
-        for i in range(1, n_left + 1):
-            Q_i = Q_branch - (i - 1) * Q_retorno_left
-            V_i = Q_i / A_sec if A_sec > 0 else 0.0
-            Re_i = V_i * D_int_sec / VISCOSIDADE_AGUA if D_int_sec > 0 else 0.0
-            f_i = calcular_fator_atrito(Re_i, D_int_sec)
-            hf_i = f_i * (L_left_per_seg / D_int_sec) * (V_i ** 2 / (2.0 * G)) if D_int_sec > 0 else 0.0
-
-            hf_left += hf_i
-            velocidades_left.append(V_i)
-            segmentos_left.append({
-                'Ram.': 'L',
-                'Seg.': i,
-                'Vazão (m³/h)': Q_i * 3600.0,
-                'Vel. (m/s)': V_i,
-                'Perda (mca)': hf_i
-            })
-
-    hf_right = 0.0
-    velocidades_right: List[float] = []
-    segmentos_right: List[Dict[str, Any]] = []
-
-    if n_right > 0:
-        Q_retorno_right = Q_branch / n_right
-        for i in range(1, n_right + 1):
-            Q_i = Q_branch - (i - 1) * Q_retorno_right
-            V_i = Q_i / A_sec if A_sec > 0 else 0.0
-            Re_i = V_i * D_int_sec / VISCOSIDADE_AGUA if D_int_sec > 0 else 0.0
-            f_i = calcular_fator_atrito(Re_i, D_int_sec)
-            hf_i = f_i * (L_right_per_seg / D_int_sec) * (V_i ** 2 / (2.0 * G)) if D_int_sec > 0 else 0.0
-
-            hf_right += hf_i
-            velocidades_right.append(V_i)
-            segmentos_right.append({
-                'Ram.': 'R',
-                'Seg.': i,
-                'Vazão (m³/h)': Q_i * 3600.0,
-                'Vel. (m/s)': V_i,
-                'Perda (mca)': hf_i
-            })
-
-    hf_sec_total = hf_left + hf_right
-    all_velocities = [prim['V']] + velocidades_left + velocidades_right
-    v_max = max(all_velocities) if all_velocities else prim['V']
-    segmentos = segmentos_left + segmentos_right
-    L_eq_total = prim['L_eq'] + L_eq_left + L_eq_right
+    Q_seg, V, hf = _kernel_secundario(Q_total, np.array([D_int_sec]), n_left, n_right,
+                                      np.array([L_left_per_seg]), np.array([L_right_per_seg]))
+    V, hf = V[0], hf[0]
+
+    hf_sec_total = float(hf.sum())
+    v_max = max(prim['V'], float(V.max()))
+
+    if num_retornos == 1:
+        ramal = np.array([''])
+    else:
+        ramal = np.repeat(np.array(['L', 'R']), [n_left, n_right])
+    seg = np.concatenate([np.arange(1, n_left + 1), np.arange(1, n_right + 1)])
 
     return {
         'D_int_prim': prim['D_int'],
@@ -195,11 +255,101 @@ def calcular_recalque_multiplos(Q_m3h: float, diam_prim: str, diam_sec: str,
         'hf_total': prim['hf_total'] + hf_sec_total,
         'hf_prim': prim['hf_total'],
         'hf_sec': hf_sec_total,
-        'segmentos': segmentos,
-        'L_eq_total': L_eq_total
+        'segmentos': SegmentosRecalque(ramal, seg, Q_seg * 3600.0, V, hf),
+        'L_eq_total': prim['L_eq'] + L_eq_left + L_eq_right
     }
 
 
+def _indices_nao_dominados(perda: np.ndarray, custo: np.ndarray) -> np.ndarray:
+    """
+    Índices do conjunto de Pareto (minimizar perda e custo), ordenados por custo.
+    Ordena por (custo, perda) e mantém cada ponto que reduz a menor perda já vista.
+    """
+    ordem = np.lexsort((perda, custo))
+    perda_ord = perda[ordem]
+    menor_anterior = np.concatenate([[np.inf], np.minimum.accumulate(perda_ord)[:-1]])
+    return ordem[perda_ord < menor_anterior]
+
+
+def otimizar_diametros(Q_m3h: float, L_suc: float, conex_suc: Dict[str, int],
+                       L_prim: float, conex_prim: Dict[str, int],
+                       L_sec: float, conex_sec: Dict[str, int], num_retornos: int,
+                       custo_por_metro: Optional[Dict[int, float]] = None) -> List[Dict[str, Any]]:
+    """
+    Busca as combinações de diâmetros (sucção, primário, secundário) de
+    DIAMETROS que respeitam os limites de velocidade da NBR 10.339 e retorna o
+    conjunto de Pareto entre perda de carga total e custo da tubulação.
+
+    O custo de cada trecho é comprimento × custo_por_metro[diâmetro]; sem tabela
+    de preços usa o próprio diâmetro externo (mm·m) como índice de tamanho.
+
+    Como perda e custo são somas independentes por trecho, e a velocidade de
+    cada trecho só depende do seu diâmetro, os diâmetros inviáveis e os
+    dominados dentro de cada trecho são descartados antes de combinar: uma
+    combinação que contém um deles é sempre dominada.
+
+    Returns:
+        Lista de dicionários ordenada por custo crescente (perda decrescente).
+    """
+    if num_retornos < 1:
+        raise ValueError("num_retornos deve ser >= 1")
+    if Q_m3h <= 0:
+        raise ValueError("Q_m3h deve ser > 0")
+
+    if custo_por_metro is None:
+        custo_m = ORDEM_DIAMETROS.astype(float)
+    else:
+        custo_m = np.array([custo_por_metro[d] for d in ORDEM_DIAMETROS], dtype=float)
+
+    # Sucção e primário: uma linha por diâmetro candidato
+    suc = calcular_linhas_lote(Q_m3h, ORDEM_DIAMETROS, L_suc, vetor_conexoes(conex_suc))
+    prim = calcular_linhas_lote(Q_m3h, ORDEM_DIAMETROS, L_prim, vetor_conexoes(conex_prim))
+
+    # Secundário: todos os diâmetros candidatos em uma chamada do kernel
+    n_left = math.ceil(num_retornos / 2.0)
+    n_right = num_retornos - n_left
+    conex_left, conex_right = _distribuir_conexoes(conex_sec, n_left, num_retornos)
+    L_left_per_seg = (L_sec + MATRIZ_L_EQ @ conex_left) / n_left
+    L_right_per_seg = ((L_sec + MATRIZ_L_EQ @ conex_right) / n_right if n_right > 0
+                       else np.zeros(ORDEM_DIAMETROS.size))
+    _, V_sec, hf_sec = _kernel_secundario(Q_m3h / 3600.0, D_INT_LOTE, n_left, n_right,
+                                          L_left_per_seg, L_right_per_seg)
+
+    trechos = [
+        (suc['V'], suc['hf_total'], custo_m * L_suc, LIMITE_VEL_SUCCAO),
+        (prim['V'], prim['hf_total'], custo_m * L_prim, LIMITE_VEL_RECALQUE),
+        (V_sec.max(axis=1), hf_sec.sum(axis=1), custo_m * L_sec, LIMITE_VEL_RECALQUE),
+    ]
+
+    # Poda por trecho: velocidade acima do limite ou opção dominada
+    candidatos = []
+    for V, hf, custo, limite in trechos:
+        viaveis = np.flatnonzero(V <= limite)
+        if viaveis.size == 0:
+            return []
+        candidatos.append(viaveis[_indices_nao_dominados(hf[viaveis], custo[viaveis])])
+
+    # Combinação das opções restantes (broadcast) e fronteira de Pareto global
+    i_s, i_p, i_r = (c.ravel() for c in np.meshgrid(*candidatos, indexing='ij'))
+    hf_total = trechos[0][1][i_s] + trechos[1][1][i_p] + trechos[2][1][i_r]
+    custo_total = trechos[0][2][i_s] + trechos[1][2][i_p] + trechos[2][2][i_r]
+    frente = _indices_nao_dominados(hf_total, custo_total)
+
+    return [
+        {
+            'diam_suc': int(ORDEM_DIAMETROS[i_s[k]]),
+            'diam_prim': int(ORDEM_DIAMETROS[i_p[k]]),
+            'diam_sec': int(ORDEM_DIAMETROS[i_r[k]]),
+            'V_suc': float(trechos[0][0][i_s[k]]),
+            'V_max_rec': float(max(trechos[1][0][i_p[k]], trechos[2][0][i_r[k]])),
+            'hf_total': float(hf_total[k]),
+            'perda_total': float(hf_total[k] * MARGEM_SEGURANCA),
+            'custo': float(custo_total[k])
+        }
+        for k in frente
+    ]
+
+
 def interface_conexoes(label: str) -> Dict[str, int]:
     """Gera interface para entrada de quantidades de conexões."""
     with st.expander(f"Conexões - {label}"):
@@ -288,12 +438,17 @@ def main() -> None:
         with col_center2:
             num_retornos = st.slider(
                 "Nº Retornos:",
-                min_value=1, max_value=20, value=4, step=1,
+                min_value=1, max_value=300, value=4, step=1,
                 key='nret'
             )
 
         conex_sec = interface_conexoes("Ramal Secundário")
 
+        sugerir = st.checkbox(
+            "Sugerir combinações de diâmetros (respeitando os limites de velocidade)",
+            key='otimizar_diam'
+        )
+
         btn = st.form_submit_button("Calcular Perda de Carga", type="primary", use_container_width=True)
 
     if btn:
@@ -309,6 +464,13 @@ def main() -> None:
 
             total_perda = (res_suc['hf_total'] + res_rec['hf_total']) * MARGEM_SEGURANCA
 
+            # Curva do sistema reaproveitada pela verificação do ponto de funcionamento
+            curva = CurvaSistema.de_perda_carga(
+                total_perda, Q_m3h,
+                descricao=f"Perda de carga: {total_perda:.2f} mca @ {Q_m3h:.2f} m³/h"
+            )
+            st.session_state["curva_sistema"] = curva
+
             st.markdown("---")
             st.subheader("Resultados do Dimensionamento")
 
@@ -358,12 +520,38 @@ def main() -> None:
                     """)
 
                 st.write("**Detalhamento do ramal secundário (segmentos):**")
-                st.dataframe(res_rec['segmentos'], use_container_width=True)
+                st.dataframe(res_rec['segmentos'].para_dataframe(), use_container_width=True)
 
-                K = total_perda / (Q_m3h ** 2) if Q_m3h != 0 else 0.0
                 st.markdown("**Função da curva do sistema (H = K·Q²):**")
-                st.latex(f"H_{{sistema}}(Q) = {K:.6f} \\cdot Q^2")
-                st.code(f"def curva_instalacao(Q):\n    return {K:.6f} * Q**2", language="python")
+                st.latex(f"H_{{sistema}}(Q) = {curva.A:.6f} \\cdot Q^2")
+                st.caption("Curva salva na sessão: disponível na verificação do ponto de "
+                           "funcionamento em Database equipamentos.")
+
+            if sugerir:
+                st.subheader("Combinações de diâmetros sugeridas")
+                frente = otimizar_diametros(
+                    Q_m3h, L_suc, conexoes_suc, L_prim, conex_prim,
+                    L_sec, conex_sec, num_retornos
+                )
+                if not frente:
+                    st.warning("Nenhuma combinação de diâmetros respeita os limites de velocidade para esta vazão.")
+                else:
+                    st.caption("Conjunto de Pareto: cada linha reduz a perda de carga em troca de "
+                               "tubulação maior (índice de tamanho = Σ diâmetro externo × comprimento).")
+                    st.dataframe(
+                        pd.DataFrame(frente).rename(columns={
+                            'diam_suc': 'Ø Sucção (mm)',
+                            'diam_prim': 'Ø Primário (mm)',
+                            'diam_sec': 'Ø Secundário (mm)',
+                            'V_suc': 'Vel. Sucção (m/s)',
+                            'V_max_rec': 'Vel. Máx. Recalque (m/s)',
+                            'hf_total': 'Perda s/ margem (mca)',
+                            'perda_total': 'Perda Total (mca)',
+                            'custo': 'Índice de tamanho (mm·m)'
+                        }),
+                        hide_index=True,
+                        use_container_width=True
+                    )
 
         except Exception as e:
             st.error(f"Erro no cálculo: {str(e)}")
@@ -0,0 +1,206 @@
+# modules/relatorio_pdf.py
+"""
+Motor de relatórios PDF compartilhado (ReportLab).
+
+Estilos de parágrafo e de tabela são construídos uma vez por processo. Um
+relatório é descrito como cabeçalho + seções de tabelas + rodapé e só é
+renderizado quando o usuário clica em baixar. Os bytes gerados ficam num
+cache LRU indexado pelo hash do conteúdo (resultados + entradas + data de
+geração), de modo que baixar de novo o mesmo relatório não refaz o layout.
+"""
+
+import io
+from datetime import datetime
+from functools import lru_cache
+
+import streamlit as st
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.lib.units import cm
+from reportlab.platypus import (
+    HRFlowable,
+    Paragraph,
+    SimpleDocTemplate,
+    Spacer,
+    Table,
+    TableStyle,
+)
+
+from modules.cache_conteudo import CacheLRU, hash_conteudo
+
+# ==========================================
+# CONSTANTES
+# ==========================================
+
+AZUL = colors.HexColor("#1a4e8a")
+CINZA = colors.HexColor("#f2f4f7")
+MARGEM = 2 * cm
+
+
+# ==========================================
+# ESTILOS (uma vez por processo)
+# ==========================================
+
+@lru_cache(maxsize=None)
+def estilos():
+    """
+    Estilos de parágrafo compartilhados.
+
+    Returns:
+        dict: ParagraphStyle por nome ("titulo", "sub", "normal", "small").
+    """
+    base = getSampleStyleSheet()
+    return {
+        "titulo": ParagraphStyle("titulo", parent=base["Title"],
+                                 textColor=AZUL, fontSize=15, spaceAfter=4),
+        "sub":    ParagraphStyle("sub", parent=base["Heading2"],
+                                 textColor=AZUL, fontSize=10, spaceBefore=10, spaceAfter=4),
+        "normal": ParagraphStyle("normal", parent=base["Normal"], fontSize=9),
+        "small":  ParagraphStyle("small", parent=base["Normal"], fontSize=8,
+                                 textColor=colors.grey),
+    }
+
+
+@lru_cache(maxsize=None)
+def estilo_tabela():
+    """TableStyle das tabelas de relatório (cabeçalho azul, linhas zebradas)."""
+    return TableStyle([
+        ("BACKGROUND",    (0, 0), (-1, 0),  AZUL),
+        ("TEXTCOLOR",     (0, 0), (-1, 0),  colors.white),
+        ("FONTNAME",      (0, 0), (-1, 0),  "Helvetica-Bold"),
+        ("FONTSIZE",      (0, 0), (-1, -1), 9),
+        ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, CINZA]),
+        ("GRID",          (0, 0), (-1, -1), 0.4, colors.lightgrey),
+        ("LEFTPADDING",   (0, 0), (-1, -1), 6),
+        ("RIGHTPADDING",  (0, 0), (-1, -1), 6),
+        ("TOPPADDING",    (0, 0), (-1, -1), 4),
+        ("BOTTOMPADDING", (0, 0), (-1, -1), 4),
+    ])
+
+
+# ==========================================
+# MONTAGEM
+# ==========================================
+
+def tabela(linhas, larguras_cm=None):
+    """
+    Tabela no estilo padrão.
+
+    Args:
+        linhas (list): Linhas da tabela; a primeira é o cabeçalho.
+        larguras_cm (iterable, optional): Largura de cada coluna em cm.
+
+    Returns:
+        Table: Flowable pronto para o documento.
+    """
+    larguras = [w * cm for w in larguras_cm] if larguras_cm else None
+    t = Table(linhas, colWidths=larguras, hAlign="LEFT")
+    t.setStyle(estilo_tabela())
+    return t
+
+
+def montar_relatorio(titulo, subtitulo, secoes, status=None, rodape=None, pagesize=A4):
+    """
+    Renderiza um relatório de seções de tabelas.
+
+    Args:
+        titulo (str): Título do relatório.
+        subtitulo (str): Linha sob o título (aceita marcação <b>).
+        secoes (list): Tuplas (titulo_secao, linhas, larguras_cm).
+        status (str, optional): Parágrafo de destaque antes das seções.
+        rodape (str, optional): Nota final, após um separador.
+        pagesize (tuple): Tamanho da página.
+
+    Returns:
+        bytes: Conteúdo do PDF.
+    """
+    s = estilos()
+    story = [
+        Paragraph(titulo, s["titulo"]),
+        Paragraph(subtitulo, s["small"]),
+        HRFlowable(width="100%", thickness=1.5, color=AZUL, spaceAfter=8),
+    ]
+    if status:
+        story += [Paragraph(status, s["normal"]), Spacer(1, 8)]
+
+    for i, (titulo_secao, linhas, larguras_cm) in enumerate(secoes):
+        if i:
+            story.append(Spacer(1, 6))
+        story += [Paragraph(titulo_secao, s["sub"]), tabela(linhas, larguras_cm)]
+
+    if rodape:
+        story += [
+            Spacer(1, 14),
+            HRFlowable(width="100%", thickness=0.5, color=colors.lightgrey),
+            Paragraph(rodape, s["small"]),
+        ]
+
+    buf = io.BytesIO()
+    doc = SimpleDocTemplate(
+        buf, pagesize=pagesize,
+        leftMargin=MARGEM, rightMargin=MARGEM, topMargin=MARGEM, bottomMargin=MARGEM,
+    )
+    doc.build(story)
+    return buf.getvalue()
+
+
+# ==========================================
+# CACHE DE BYTES
+# ==========================================
+
+# LRU por hash do conteúdo; o tamanho de cada entrada é o dos próprios bytes
+CACHE_PDF = CacheLRU(max_itens=64, max_bytes=32 * 2 ** 20, medir=len)
+
+
+def pdf_cacheado(gerar, *args):
+    """
+    Bytes de `gerar(*args)`, reaproveitados enquanto o conteúdo não mudar.
+
+    A chave inclui o nome qualificado do gerador, então relatórios diferentes
+    (aquecimento, filtragem, ...) com os mesmos dados não colidem. Tudo o que
+    aparece no PDF deve estar em `args`. Por isso a data de geração faz parte
+    da chave (no aquecimento, com a precisão de minuto impressa no relatório).
+    Um download em outro minuto gera um PDF novo com a data correta; só
+    downloads no mesmo minuto reaproveitam os bytes.
+    """
+    chave = hash_conteudo(f"{gerar.__module__}.{gerar.__qualname__}", *args)
+    return CACHE_PDF.obter(chave, lambda: gerar(*args))
+
+
+def botao_download_pdf(label, gerar, *args, file_name, container=st, key=None,
+                       formato_data=None):
+    """
+    Botão de download que só gera o PDF quando clicado.
+
+    Requer Streamlit >= 1.52 (`data` chamável com `on_click="ignore"`).
+
+    Args:
+        label (str): Texto do botão.
+        gerar (callable): Função que recebe `*args` e devolve os bytes do PDF.
+        *args: Dados do relatório (também compõem a chave do cache).
+        file_name (str): Nome do arquivo baixado.
+        container: Onde desenhar o botão (st ou uma coluna).
+        key (str, optional): Chave do widget.
+        formato_data (str, optional): Se informado, a data/hora do clique,
+            formatada com `strftime(formato_data)`, é passada a `gerar` como
+            último argumento (e entra na chave do cache).
+
+    Returns:
+        bool: True no rerun em que o botão foi clicado.
+    """
+    def gerar_no_clique():
+        dados = args
+        if formato_data is not None:
+            dados += (datetime.now().strftime(formato_data),)
+        return pdf_cacheado(gerar, *dados)
+
+    return container.download_button(
+        label=label,
+        data=gerar_no_clique,
+        file_name=file_name,
+        mime="application/pdf",
+        on_click="ignore",
+        key=key,
+        use_container_width=True,
+    )
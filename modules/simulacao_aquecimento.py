@@ -0,0 +1,227 @@
+# modules/simulacao_aquecimento.py
+"""
+Simulação horária anual (8760 h) do aquecimento de piscinas por bomba de calor.
+
+A planilha Sodramar considera cada mês com 31 dias a perda constante e estima o
+verão por um fator fixo (0,4375). Aqui o balanço térmico é integrado hora a
+hora, com a temperatura ambiente variando ao longo do ano e do dia:
+
+    perda(h)   = U × (T_agua − T_amb(h))        [BTU/h]
+    U          = energia_dissipada / (T_agua − t_inverno)   (calibrado na planilha)
+    deficit(h) = max(0, deficit(h−1) + perda(h) − capacidade)   (recursão de Lindley)
+
+O deficit é o calor que a bomba não conseguiu repor; a temperatura da água fica
+abaixo do setpoint em deficit / (volume × 3,97) °C. Como a perda é tomada no
+setpoint (conservador), a temperatura informada é limitada pelo equilíbrio com
+a bomba a plena carga, T_amb + capacidade / U, que a água não ultrapassa para
+baixo. A recursão é resolvida sem laço no tempo (soma acumulada menos o seu
+mínimo acumulado), vetorizada também entre piscinas.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+from modules.aquecimento import REGIOES, calcular_dimensionamento_lote
+
+# ==========================================
+# CONSTANTES
+# ==========================================
+
+HORAS_ANO = 8760
+DIAS_MES = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+NOMES_MESES = ("Jan", "Fev", "Mar", "Abr", "Mai", "Jun",
+               "Jul", "Ago", "Set", "Out", "Nov", "Dez")
+
+# Dia do ano (0 = 1º de janeiro) com a menor temperatura média: meados de julho
+DIA_MAIS_FRIO = 195
+
+# Variação diária da temperatura ambiente (°C, meia amplitude), mínimo às 3 h
+AMPLITUDE_DIARIA = 4.0
+
+# Queda abaixo do setpoint a partir da qual a hora conta como "abaixo" (°C)
+TOLERANCIA_TEMPERATURA = 0.5
+
+# Piscinas simuladas por bloco (limita a memória dos arrays piscinas × 8760)
+_BLOCO_PISCINAS = 256
+
+_INICIO_MESES = np.concatenate([[0], np.cumsum(DIAS_MES)[:-1]]) * 24
+
+
+# ==========================================
+# PERFIL CLIMÁTICO
+# ==========================================
+
+@lru_cache(maxsize=None)
+def perfil_temperatura_ambiente(regiao, amplitude_diaria=AMPLITUDE_DIARIA):
+    """
+    Temperatura ambiente hora a hora ao longo de um ano típico.
+
+    A média diária oscila em cosseno entre `t_inverno` (meados de julho) e
+    `t_verao` (meados de janeiro) de REGIOES; sobre ela, uma senoide diária
+    com mínimo às 3 h e máximo às 15 h.
+
+    Args:
+        regiao (int): Código da região (1, 2 ou 3).
+        amplitude_diaria (float): Meia amplitude da variação diária (°C).
+
+    Returns:
+        np.ndarray: Array (8760,) somente leitura, em °C.
+    """
+    _, _, _, t_inv, t_ver = REGIOES[regiao]
+    horas = np.arange(HORAS_ANO)
+    dia = horas // 24 + 0.5
+    media = (t_inv + t_ver) / 2 - (t_ver - t_inv) / 2 * np.cos(2 * np.pi * (dia - DIA_MAIS_FRIO) / 365)
+    perfil = media + amplitude_diaria * np.sin(2 * np.pi * (horas % 24 - 9) / 24)
+    perfil.setflags(write=False)
+    return perfil
+
+
+# ==========================================
+# SIMULAÇÃO
+# ==========================================
+
+def _deficit_lindley(x):
+    """
+    Resolve w[t] = max(0, w[t−1] + x[t]), w[−1] = 0, ao longo do eixo 1.
+
+    Forma fechada: w = S − min(0, mínimo acumulado de S), com S = cumsum(x).
+    """
+    s = np.cumsum(x, axis=1)
+    return s - np.minimum(np.minimum.accumulate(s, axis=1), 0.0)
+
+
+def _simular_bloco(u, capacidade, temp_agua, cop, capacidade_termica, perfis):
+    """Integra um bloco de piscinas; retorna as somas/mínimos mensais (piscinas × 12)."""
+    demanda = u[:, None] * (temp_agua[:, None] - perfis)
+    deficit = _deficit_lindley(demanda - capacidade[:, None])
+    anterior = np.concatenate([np.zeros((deficit.shape[0], 1)), deficit[:, :-1]], axis=1)
+
+    # Calor reposto na hora: limitado à capacidade; ganhos do ambiente não geram consumo
+    entregue = np.clip(anterior + demanda - deficit, 0.0, capacidade[:, None])
+
+    # Temperatura da água: setpoint menos o deficit, limitada pelo menor
+    # equilíbrio a plena carga já ocorrido (a água relaxa em direção a ele)
+    equilibrio = np.minimum.accumulate(perfis + (capacidade / u)[:, None], axis=1)
+    piso = np.minimum(temp_agua[:, None], equilibrio)
+    queda = np.minimum(deficit / capacidade_termica[:, None], temp_agua[:, None] - piso)
+
+    def por_mes(a):
+        return np.add.reduceat(a, _INICIO_MESES, axis=1)
+
+    return {
+        "demanda_btu":           por_mes(np.maximum(demanda, 0.0)),
+        "energia_entregue_btu":  por_mes(entregue),
+        "horas_funcionamento":   por_mes(entregue / capacidade[:, None]),
+        # Mesma conversão da planilha: kW = BTU/h / 3,97 / 860; consumo = kW / COP
+        "consumo_kwh":           por_mes(entregue) / 3.97 / 860 / cop[:, None],
+        "temp_agua_min":         temp_agua[:, None] - np.maximum.reduceat(queda, _INICIO_MESES, axis=1),
+        "horas_abaixo_setpoint": por_mes((queda > TOLERANCIA_TEMPERATURA).astype(np.float64)),
+    }
+
+
+def simular_ano(amplitude_diaria=AMPLITUDE_DIARIA, **entradas):
+    """
+    Simula um ano hora a hora para uma ou muitas piscinas.
+
+    Args:
+        amplitude_diaria (float): Meia amplitude da variação diária (°C).
+        **entradas: Mesmos argumentos de `aquecimento.calcular_dimensionamento_lote`
+            (escalares ou arrays); o modelo e o COP vêm desse dimensionamento.
+
+    Returns:
+        pd.DataFrame: Uma linha por piscina e mês, com as colunas "piscina",
+            "mes" (1-12), "modelo", demanda e energia entregue (BTU), horas de
+            funcionamento, consumo (kWh), custo (R$), temperatura mínima da água
+            (°C) e horas abaixo do setpoint. Piscinas sem modelo vêm com NaN.
+    """
+    lote = calcular_dimensionamento_lote(**entradas)
+    n = len(lote)
+
+    temp_agua = lote["temp_agua"].to_numpy(dtype=np.float64)
+    regiao = lote["regiao"].to_numpy()
+    capacidade = lote["capacidade_btu_h"].to_numpy(dtype=np.float64)
+    cop = lote["cop"].to_numpy(dtype=np.float64)
+    # Coeficiente global calibrado para reproduzir a energia da planilha em t_inverno
+    delta_projeto = np.maximum(temp_agua - lote["t_inverno_c"].to_numpy(dtype=np.float64), 1.0)
+    u = lote["energia_btu_h"].to_numpy(dtype=np.float64) / delta_projeto
+    capacidade_termica = lote["volume_litros"].to_numpy(dtype=np.float64) * 3.97
+
+    colunas = ("demanda_btu", "energia_entregue_btu", "horas_funcionamento",
+               "consumo_kwh", "temp_agua_min", "horas_abaixo_setpoint")
+    mensal = {c: np.full((n, 12), np.nan) for c in colunas}
+
+    validas = np.flatnonzero(np.isfinite(capacidade) & (capacidade > 0)
+                             & (capacidade_termica > 0) & (u > 0))
+    perfis_regiao = {r: perfil_temperatura_ambiente(r, amplitude_diaria) for r in np.unique(regiao[validas])}
+    for inicio in range(0, validas.size, _BLOCO_PISCINAS):
+        idx = validas[inicio:inicio + _BLOCO_PISCINAS]
+        perfis = np.stack([perfis_regiao[r] for r in regiao[idx]])
+        bloco = _simular_bloco(u[idx], capacidade[idx], temp_agua[idx], cop[idx],
+                               capacidade_termica[idx], perfis)
+        for c in colunas:
+            mensal[c][idx] = bloco[c]
+
+    df = pd.DataFrame({c: v.ravel() for c, v in mensal.items()})
+    df.insert(0, "piscina", np.repeat(np.arange(n), 12))
+    df.insert(1, "mes", np.tile(np.arange(1, 13), n))
+    df.insert(2, "modelo", np.repeat(lote["modelo"].to_numpy(dtype=object), 12))
+    df["custo"] = df["consumo_kwh"] * np.repeat(lote["custo_kwh"].to_numpy(dtype=np.float64), 12)
+    return df
+
+
+# ==========================================
+# INTERFACE
+# ==========================================
+
+def exibir_simulacao_anual(res, inputs):
+    """
+    Expander com a simulação horária anual da piscina dimensionada.
+
+    Args:
+        res (dict): Resultado de `calcular_dimensionamento` (sem erro).
+        inputs (dict): Entradas usadas no dimensionamento.
+    """
+    with st.expander("Simulacao horaria anual (8760 h)"):
+        entradas = {k: inputs[k] for k in (
+            "largura", "comprimento", "profundidade", "temp_agua", "regiao", "ambiente",
+            "incidencia_solar", "velocidade_vento", "horas_capa", "custo_kwh", "custo_gn_m3",
+        )}
+        df = simular_ano(**entradas, modelo_manual=res["modelo"])
+        meses = [NOMES_MESES[m - 1] for m in df["mes"]]
+
+        c1, c2, c3 = st.columns(3)
+        c1.metric("Custo anual simulado", f"R$ {df['custo'].sum():,.2f}")
+        c2.metric("Consumo anual", f"{df['consumo_kwh'].sum():,.0f} kWh")
+        c3.metric("Temperatura minima da agua", f"{df['temp_agua_min'].min():.1f} C")
+
+        fig = go.Figure()
+        fig.add_trace(go.Bar(x=meses, y=df["custo"], name="Simulacao horaria"))
+        fig.add_trace(go.Scatter(
+            x=meses, y=[res["custo_medio_mensal"]] * 12, mode="lines",
+            name="Media mensal (planilha)", line=dict(dash="dash"),
+        ))
+        fig.update_layout(
+            yaxis_title="Custo mensal (R$)", height=350,
+            margin=dict(l=10, r=10, t=30, b=10), legend=dict(orientation="h"),
+        )
+        st.plotly_chart(fig, use_container_width=True)
+
+        tabela = pd.DataFrame({
+            "Mes": meses,
+            "Horas de funcionamento": df["horas_funcionamento"].round(0),
+            "Horas/dia": (df["horas_funcionamento"] / np.array(DIAS_MES)).round(1),
+            "Consumo (kWh)": df["consumo_kwh"].round(0),
+            "Custo (R$)": df["custo"].round(2),
+            "Temp. min. agua (C)": df["temp_agua_min"].round(1),
+            "Horas abaixo do setpoint": df["horas_abaixo_setpoint"].astype(int),
+        })
+        st.dataframe(tabela, hide_index=True, use_container_width=True)
+        st.caption(
+            "Perdas calibradas na energia dissipada da planilha (temperatura de inverno da "
+            "regiao) e proporcionais a diferenca entre agua e ambiente, hora a hora. "
+            f"Variacao diaria do ambiente: +/- {AMPLITUDE_DIARIA:.0f} C."
+        )
@@ -1,12 +1,14 @@
 # transbordo.py
 import math
 import streamlit as st
+import pandas as pd
 import plotly.graph_objects as go
-import numpy as np
 from typing import Optional, Dict, Any, List
 from tracking import track_access
-from modules.data import BANCO_BOMBAS
-from modules.calc_utils import ajustar_curva_pchip
+from modules.catalogo_bombas import (CATALOGO_BOMBAS, INDICES_SELECAO, selecionar_bomba,
+                                     selecionar_bombas_curva)
+from modules.associacao_bombas import exibir_sugestoes_associacao
+from modules.curvas_bombas import obter_curva_bomba, pontos_da_bomba
 
 @track_access("transbordo")
 def run() -> None:
@@ -49,11 +51,27 @@ def run() -> None:
         with col2:
             # Seleção de pressão
             possible_pressures: List[int] = sorted({2,4,6,8,10,12,14,16,18})
-            pressao_mca: int = st.selectbox(
-                "Pressão dimensionada (m.c.a)",
-                options=possible_pressures,
-                index=2  # Valor padrão 6 m.c.a
+            selecao_curva: bool = st.checkbox(
+                "Selecionar pela curva (qualquer pressão, catálogo completo)",
+                key="transbordo_selecao_curva",
+                help="Avalia a curva de todas as motobombas do catálogo na pressão informada, "
+                     "em vez de usar apenas os valores tabelados de 2 em 2 m.c.a."
             )
+            if selecao_curva:
+                pressao_mca: float = st.number_input(
+                    "Pressão dimensionada (m.c.a)",
+                    min_value=float(CATALOGO_BOMBAS.pressoes[0]),
+                    max_value=float(CATALOGO_BOMBAS.pressoes[-1]),
+                    value=6.0,
+                    step=0.5,
+                    format="%.1f"
+                )
+            else:
+                pressao_mca: int = st.selectbox(
+                    "Pressão dimensionada (m.c.a)",
+                    options=possible_pressures,
+                    index=2  # Valor padrão 6 m.c.a
+                )
     
     # Cálculos e resultados
     if st.button("Calcular", type="primary"):
@@ -64,14 +82,15 @@ def run() -> None:
             vazao_necessaria: float = (1608 * (altura_lamina_mm / 1000) * comprimento_borda_m) * math.sqrt(2 * 9.81 * (altura_lamina_mm / 1000))
             
             # Seleção da bomba
-            selected_pump: Optional[Dict[str, Any]] = None
-            for bomba in BANCO_BOMBAS:
-                key = f"vazao_{pressao_mca}_mca"
-                vazao_pump = bomba.get(key)
-                
-                if vazao_pump is not None and vazao_pump >= vazao_necessaria:
-                    selected_pump = bomba
-                    break
+            if selecao_curva:
+                candidatos = selecionar_bombas_curva(vazao_necessaria, pressao_mca)
+                vazoes_candidatos = CATALOGO_BOMBAS.vazoes_na_pressao(pressao_mca)[candidatos, 0]
+                selected_pump: Optional[Dict[str, Any]] = (
+                    CATALOGO_BOMBAS.registro(candidatos[0]) if candidatos.size else None)
+                vazao_bomba = float(vazoes_candidatos[0]) if candidatos.size else None
+            else:
+                selected_pump: Optional[Dict[str, Any]] = selecionar_bomba(vazao_necessaria, pressao_mca)
+                vazao_bomba = selected_pump[f'vazao_{pressao_mca}_mca'] if selected_pump else None
             
             # Exibe resultados
             st.success("**Resultados do Dimensionamento**")
@@ -89,6 +108,14 @@ def run() -> None:
                     st.metric("Potência", f"{selected_pump['potencia_cv']} CV")
                 else:
                     st.error("Nenhuma motobomba adequada encontrada!")
+
+                if selecao_curva and candidatos.size:
+                    st.write(f"**Motobombas que atendem ({candidatos.size}):**")
+                    st.dataframe(pd.DataFrame({
+                        "Modelo": CATALOGO_BOMBAS.modelos[candidatos],
+                        "Potência (cv)": CATALOGO_BOMBAS.potencias[candidatos],
+                        f"Vazão em {pressao_mca:g} m.c.a (m³/h)": vazoes_candidatos.round(2),
+                    }), hide_index=True, use_container_width=True)
                 
             with res_col2:
                 if selected_pump:
@@ -96,30 +123,20 @@ def run() -> None:
                         st.write(f"**Especificações Técnicas:**")
                         st.write(f"- Modelo: {selected_pump['modelo']}")
                         st.write(f"- Potência: {selected_pump['potencia_cv']} CV")
-                        st.write(f"- Vazão em {pressao_mca} m.c.a: {selected_pump[f'vazao_{pressao_mca}_mca']} m³/h")
+                        st.write(f"- Vazão em {pressao_mca:g} m.c.a: {vazao_bomba:.2f} m³/h")
 
                         st.write("**Curva da Motobomba:**")
-                        # Preparar dados para o gráfico
-                        pressoes: List[int] = []
-                        vazoes: List[float] = []
-                        for press in possible_pressures:
-                            key = f'vazao_{press}_mca'
-                            if selected_pump.get(key) is not None:
-                                pressoes.append(press)
-                                vazoes.append(selected_pump[key])
+                        # Preparar dados para o gráfico (no modo por curva, todos os pontos do catálogo)
+                        pressoes_curva = None if selecao_curva else possible_pressures
+                        vazoes, pressoes = pontos_da_bomba(selected_pump, pressoes_curva)
 
                         # Criar gráfico com Plotly
-                        if pressoes and vazoes:
+                        if pressoes.size and vazoes.size:
                             try:
-                                # Converte para arrays numpy e ordena
-                                x = np.array(vazoes)
-                                y = np.array(pressoes)
-                                sort_idx = np.argsort(x)
-                                x_sorted = x[sort_idx]
-                                y_sorted = y[sort_idx]
-
-                                # Criar interpolação PCHIP
-                                x_smooth, y_smooth, _ = ajustar_curva_pchip(x_sorted, y_sorted)
+                                # Curva PCHIP pré-compilada (compartilhada entre sessões)
+                                curva = obter_curva_bomba(selected_pump, pressoes_curva)
+                                x_sorted, y_sorted = curva.vazoes, curva.pressoes
+                                x_smooth, y_smooth = curva.x_interp, curva.y_interp
 
                                 # Criar figura com Plotly
                                 fig = go.Figure()
@@ -164,6 +181,8 @@ def run() -> None:
                     - Considerar associação de múltiplas bombas para atingir a vazão necessária
                     - Consultar outros modelos de motobombas (linha BMS por exemplo)
                     """)
+                    exibir_sugestoes_associacao(vazao_necessaria, pressao_mca,
+                                                None if selecao_curva else INDICES_SELECAO)
             
             st.markdown("---")
     